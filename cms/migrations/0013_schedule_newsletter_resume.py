@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def schedule_resume(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name='resume_newsletter_dispatches',
+        defaults={
+            'func': 'cms.tasks.resume_newsletter_dispatches',
+            'schedule_type': 'I',
+            'minutes': 5,
+            'repeats': -1,
+        },
+    )
+
+
+def unschedule_resume(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='resume_newsletter_dispatches').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0012_newsletter_dispatch'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_resume, unschedule_resume),
+    ]
@@ -0,0 +1,53 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+# GIN trigram indexes on UPPER(column) for icontains search, and a
+# tsvector index for full-text blog search; the vector must match
+# utils.search.search_vector over BlogViewSet.search_vector_fields.
+# PostgreSQL only; pg_trgm comes from user 0009.
+TRIGRAM_INDEXES = [
+    ("Blog", "title", "blog_title_trgm"),
+    ("NowKnowIt", "common_nepali_english", "nowknowit_common_trgm"),
+    ("NowKnowIt", "natural_english", "nowknowit_natural_trgm"),
+    ("NowKnowIt", "reason", "nowknowit_reason_trgm"),
+    ("ExpandVocab", "word", "expandvocab_word_trgm"),
+]
+
+
+def search_indexes():
+    for model_name, field, name in TRIGRAM_INDEXES:
+        yield model_name, GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+    yield "Blog", GinIndex(
+        SearchVector("title", "sub_title", "description", config="english"),
+        name="blog_search_vector",
+    )
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in search_indexes():
+        schema_editor.add_index(apps.get_model("cms", model_name), index, concurrently=True)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in search_indexes():
+        schema_editor.remove_index(apps.get_model("cms", model_name), index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('cms', '0014_blogcategory_updated_at'),
+        ('user', '0009_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -8,6 +8,7 @@ from django.utils import timezone
 class BlogCategory(models.Model):
     name = models.CharField(max_length=100, unique=True, help_text="Name of the blog category")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
     is_active=models.BooleanField(default=True)
 
     def __str__(self):
@@ -79,6 +80,72 @@ class Newsletters(models.Model):
   
 
 
+class NewsletterDispatch(models.Model):
+    """
+    One delivery run of a newsletter or a blog post (see
+    cms.newsletter_dispatch). The email is rendered once into ``subject``
+    and ``body``; each recipient gets a NewsletterDelivery row, so a run
+    that stops half way resumes with the recipients still pending.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("completed", "Completed"),
+    ]
+
+    newsletter = models.ForeignKey(Newsletters, on_delete=models.CASCADE, null=True, blank=True, related_name="dispatches")
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, null=True, blank=True, related_name="dispatches")
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    recipients_loaded = models.BooleanField(default=False)
+
+    total_recipients = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched after every batch; a sending run that goes quiet has crashed
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.subject} dispatch #{self.pk} ({self.status})"
+
+
+class NewsletterDelivery(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    dispatch = models.ForeignKey(NewsletterDispatch, on_delete=models.CASCADE, related_name="deliveries")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    email = models.EmailField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dispatch", "email"], name="unique_newsletter_delivery"),
+        ]
+        indexes = [
+            models.Index(fields=["dispatch", "status", "id"], name="newsletter_delivery_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({self.status})"
+
+
+
 
 class NowKnowIt(models.Model):
     common_nepali_english=models.CharField(max_length=255)
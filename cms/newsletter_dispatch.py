@@ -0,0 +1,238 @@
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from cms.models import NewsletterDispatch, NewsletterDelivery
+from user.models import User
+
+
+# ==============================
+# Newsletter dispatch
+# A dispatch renders its email once, then a django-q task loads the
+# recipients into NewsletterDelivery rows (streamed, a chunk per INSERT)
+# and sends the pending ones in batches over one SMTP connection. A run
+# stops after DISPATCH_TIME_BUDGET seconds (below Q_CLUSTER's timeout)
+# and queues itself again; runs that died or raised (SMTP server down)
+# are picked up again by resume_stalled_dispatches once their heartbeat
+# is STALL_AFTER old.
+#
+# Only a refused recipient marks a delivery failed. Any other error
+# (the SMTP server going away, bad credentials) ends the run with the
+# delivery still pending, so the whole dispatch is retried rather than
+# written off. Deliveries are recorded after each batch, or as soon as
+# the batch is cut short; a crash before that can send a batch's emails
+# twice, never skip them.
+# ==============================
+DISPATCH_BATCH_SIZE = 100
+RECIPIENT_CHUNK_SIZE = 2000
+DISPATCH_TIME_BUDGET = 40
+STALL_AFTER = timedelta(minutes=5)
+
+# Errors after which the connection is reopened and the message retried once
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+# Errors about the recipient, not the server: only these fail a delivery
+RECIPIENT_ERRORS = (smtplib.SMTPRecipientsRefused,)
+
+
+def _newsletter_recipients(newsletter):
+    return newsletter.users.filter(is_active=True).exclude(email="")
+
+
+def _blog_recipients(blog):
+    # Everyone with an inbox; student accounts carry generated addresses
+    return (
+        User.objects
+        .filter(is_active=True)
+        .exclude(email="")
+        .exclude(userprofile__user_type="student")
+        .exclude(userprofile__is_disabled=True)
+        .exclude(userprofile__is_deleted=True)
+    )
+
+
+def _recipients(dispatch):
+    if dispatch.newsletter_id:
+        return _newsletter_recipients(dispatch.newsletter)
+    return _blog_recipients(dispatch.blog)
+
+
+def start_dispatch(newsletter=None, blog=None, user=None):
+    """
+    Renders the newsletter (or blog post) and queues its delivery once
+    the current transaction commits. Returns the NewsletterDispatch.
+    """
+    if newsletter is not None:
+        subject = newsletter.subject_header or "Newsletter"
+        body = render_to_string("cms/newsletter_email.html", {"newsletter": newsletter})
+    else:
+        subject = blog.title
+        body = render_to_string("cms/blog_newsletter_email.html", {
+            "blog": blog,
+            "blog_url": blog.get_absolute_url(),
+        })
+
+    dispatch = NewsletterDispatch.objects.create(
+        newsletter=newsletter,
+        blog=blog,
+        subject=subject[:255],
+        body=body,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: async_task("cms.tasks.run_newsletter_dispatch", dispatch.pk))
+    return dispatch
+
+
+def _load_recipients(dispatch):
+    # Safe to repeat after a crash: rows already inserted are skipped
+    recipients = (
+        _recipients(dispatch)
+        .order_by("id")
+        .values_list("id", "email")
+        .iterator(chunk_size=RECIPIENT_CHUNK_SIZE)
+    )
+    chunk = []
+    for user_id, email in recipients:
+        chunk.append(NewsletterDelivery(dispatch=dispatch, user_id=user_id, email=email))
+        if len(chunk) == RECIPIENT_CHUNK_SIZE:
+            NewsletterDelivery.objects.bulk_create(chunk, ignore_conflicts=True)
+            chunk = []
+    if chunk:
+        NewsletterDelivery.objects.bulk_create(chunk, ignore_conflicts=True)
+
+    dispatch.total_recipients = dispatch.deliveries.count()
+    dispatch.recipients_loaded = True
+    dispatch.save(update_fields=["total_recipients", "recipients_loaded"])
+
+
+def _message(dispatch, email, connection):
+    message = EmailMessage(
+        subject=dispatch.subject,
+        body=dispatch.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+        connection=connection,
+    )
+    message.content_subtype = "html"
+    return message
+
+
+def _send(message, connection):
+    try:
+        connection.send_messages([message])
+    except CONNECTION_ERRORS:
+        connection.close()
+        connection.open()
+        connection.send_messages([message])
+
+
+def _record(dispatch, done):
+    sent = sum(1 for delivery in done if delivery.status == "sent")
+    with transaction.atomic():
+        if done:
+            NewsletterDelivery.objects.bulk_update(done, ["status", "error", "sent_at"])
+        NewsletterDispatch.objects.filter(pk=dispatch.pk).update(
+            sent_count=F("sent_count") + sent,
+            failed_count=F("failed_count") + len(done) - sent,
+            heartbeat_at=timezone.now(),
+        )
+
+
+def _send_batch(dispatch, connection):
+    batch = list(
+        dispatch.deliveries
+        .filter(status="pending")
+        .order_by("id")[:DISPATCH_BATCH_SIZE]
+    )
+    if not batch:
+        return False
+
+    now = timezone.now()
+    done = []
+    try:
+        for delivery in batch:
+            try:
+                _send(_message(dispatch, delivery.email, connection), connection)
+            except RECIPIENT_ERRORS as exc:
+                delivery.status = "failed"
+                delivery.error = str(exc)
+            else:
+                delivery.status = "sent"
+                delivery.sent_at = now
+            done.append(delivery)
+    finally:
+        # Also on the way out of an outage: what went out stays sent and
+        # the rest of the batch stays pending
+        _record(dispatch, done)
+    return True
+
+
+def run_dispatch(dispatch_id):
+    """
+    Sends the dispatch until every delivery is done or the time budget
+    runs out, in which case the rest is queued as a new run. Safe to
+    call again on a dispatch that was interrupted.
+    """
+    dispatch = (
+        NewsletterDispatch.objects
+        .filter(pk=dispatch_id, status__in=["pending", "sending"])
+        .first()
+    )
+    if dispatch is None:
+        return
+
+    if dispatch.status == "pending":
+        dispatch.status = "sending"
+        dispatch.started_at = timezone.now()
+    dispatch.heartbeat_at = timezone.now()
+    dispatch.save(update_fields=["status", "started_at", "heartbeat_at"])
+
+    deadline = time.monotonic() + DISPATCH_TIME_BUDGET
+    try:
+        if not dispatch.recipients_loaded:
+            _load_recipients(dispatch)
+
+        # One connection for the whole run, opened lazily by the backend
+        with get_connection(fail_silently=False) as connection:
+            while time.monotonic() < deadline:
+                if not _send_batch(dispatch, connection):
+                    NewsletterDispatch.objects.filter(pk=dispatch.pk).update(
+                        status="completed", error="", finished_at=timezone.now()
+                    )
+                    return
+    except Exception as exc:
+        # Left "sending": resume_stalled_dispatches retries it later
+        NewsletterDispatch.objects.filter(pk=dispatch.pk).update(error=str(exc))
+        raise
+
+    async_task("cms.tasks.run_newsletter_dispatch", dispatch.pk)
+
+
+def resume_stalled_dispatches():
+    """
+    Queues a new run for every dispatch whose worker stopped reporting
+    (crashed or killed by the cluster timeout). Returns how many.
+    """
+    cutoff = timezone.now() - STALL_AFTER
+    stalled = list(
+        NewsletterDispatch.objects
+        .filter(status="sending", heartbeat_at__lt=cutoff)
+        .values_list("pk", flat=True)
+    )
+    # Queued dispatches whose task was lost before it started
+    stalled += list(
+        NewsletterDispatch.objects
+        .filter(status="pending", created_at__lt=cutoff)
+        .values_list("pk", flat=True)
+    )
+    for dispatch_id in stalled:
+        NewsletterDispatch.objects.filter(pk=dispatch_id).update(heartbeat_at=timezone.now())
+        async_task("cms.tasks.run_newsletter_dispatch", dispatch_id)
+    return len(stalled)
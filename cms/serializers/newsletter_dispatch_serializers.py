@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from cms.models import NewsletterDispatch
+
+
+class NewsletterDispatchSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NewsletterDispatch
+        fields = [
+            'id', 'newsletter', 'blog', 'subject', 'status', 'progress',
+            'total_recipients', 'sent_count', 'failed_count',
+            'error', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_progress(self, obj):
+        # Percentage of recipients handled, sent or failed
+        if obj.status == "completed":
+            return 100
+        if not obj.total_recipients:
+            return 0
+        return round((obj.sent_count + obj.failed_count) * 100 / obj.total_recipients)
@@ -0,0 +1,29 @@
+from django.db.models.signals import pre_save, post_save
+
+from cms.models import Blog
+from cms.newsletter_dispatch import start_dispatch
+
+
+# ── Blog posts flagged send_as_newsletter go out once ──
+# Only when the post is created with the flag, or the flag is switched
+# on later; editing an already flagged post sends nothing.
+
+def blog_pre_save(sender, instance, raw=False, **kwargs):
+    instance._was_sent_as_newsletter = (
+        not raw
+        and instance.pk is not None
+        and Blog.objects.filter(pk=instance.pk, send_as_newsletter=True).exists()
+    )
+
+
+def blog_post_save(sender, instance, raw=False, **kwargs):
+    if raw or not (instance.send_as_newsletter and instance.is_active):
+        return
+    if getattr(instance, "_was_sent_as_newsletter", False):
+        return
+    if not instance.dispatches.exists():
+        start_dispatch(blog=instance)
+
+
+pre_save.connect(blog_pre_save, sender=Blog)
+post_save.connect(blog_post_save, sender=Blog)
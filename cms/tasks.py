@@ -0,0 +1,11 @@
+from cms.newsletter_dispatch import run_dispatch, resume_stalled_dispatches
+
+
+def run_newsletter_dispatch(dispatch_id):
+    """django-q task: sends a NewsletterDispatch (see cms.newsletter_dispatch)."""
+    run_dispatch(dispatch_id)
+
+
+def resume_newsletter_dispatches():
+    """Scheduled django-q task: restarts dispatches whose run died."""
+    return resume_stalled_dispatches()
@@ -1,3 +1,164 @@
-from django.test import TestCase
+import smtplib
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from cms import newsletter_dispatch
+from cms.models import Blog, Newsletters, NewsletterDispatch, NewsletterDelivery
+from cms.newsletter_dispatch import run_dispatch, resume_stalled_dispatches, start_dispatch
+from user.models import User
+
+
+class OutageEmailBackend(locmem.EmailBackend):
+    """locmem backend whose server goes away after ``fail_after`` emails."""
+    fail_after = None
+
+    def send_messages(self, messages):
+        if self.fail_after is not None and len(mail.outbox) >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+class RefusingEmailBackend(locmem.EmailBackend):
+    """locmem backend that refuses every address starting with "bounce"."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0].startswith("bounce"):
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class NewsletterDispatchTests(TestCase):
+
+    def setUp(self):
+        self.newsletter = Newsletters.objects.create(subject_header="Weekly words", message="Hello")
+
+    def add_recipients(self, *emails):
+        for email in emails:
+            user = User.objects.create_user(username=email, email=email, password="x")
+            self.newsletter.users.add(user)
+
+    def dispatch(self):
+        return start_dispatch(newsletter=self.newsletter)
+
+    def test_sends_every_recipient_in_batches(self):
+        self.add_recipients(*[f"reader{n}@example.com" for n in range(5)])
+        dispatch = self.dispatch()
+
+        with mock.patch.object(newsletter_dispatch, "DISPATCH_BATCH_SIZE", 2), \
+                mock.patch.object(newsletter_dispatch, "_send_batch", wraps=newsletter_dispatch._send_batch) as send_batch:
+            run_dispatch(dispatch.pk)
+
+        # Three batches of at most two, then one that finds nothing pending
+        self.assertEqual(send_batch.call_count, 4)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            [f"reader{n}@example.com" for n in range(5)]
+        )
+        dispatch.refresh_from_db()
+        self.assertEqual(dispatch.status, "completed")
+        self.assertEqual((dispatch.total_recipients, dispatch.sent_count, dispatch.failed_count), (5, 5, 0))
+
+    def test_resumes_after_a_partial_run(self):
+        self.add_recipients(*[f"reader{n}@example.com" for n in range(5)])
+        dispatch = self.dispatch()
+
+        with override_settings(EMAIL_BACKEND="cms.tests.OutageEmailBackend"), \
+                mock.patch.object(OutageEmailBackend, "fail_after", 3):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                run_dispatch(dispatch.pk)
+        self.assertEqual(len(mail.outbox), 3)
+
+        run_dispatch(dispatch.pk)
+
+        # Each recipient exactly once across both runs
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(len({message.to[0] for message in mail.outbox}), 5)
+        dispatch.refresh_from_db()
+        self.assertEqual(dispatch.status, "completed")
+        self.assertEqual((dispatch.sent_count, dispatch.failed_count), (5, 0))
+
+    def test_skips_duplicate_recipients(self):
+        self.add_recipients("reader@example.com", "other@example.com")
+        dispatch = self.dispatch()
+        # A run that died after loading the recipients but before saying so
+        newsletter_dispatch._load_recipients(dispatch)
+        NewsletterDispatch.objects.filter(pk=dispatch.pk).update(recipients_loaded=False)
+
+        run_dispatch(dispatch.pk)
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ["other@example.com", "reader@example.com"])
+        dispatch.refresh_from_db()
+        self.assertEqual(dispatch.total_recipients, 2)
+        self.assertEqual(dispatch.deliveries.count(), 2)
+
+    @override_settings(EMAIL_BACKEND="cms.tests.OutageEmailBackend")
+    def test_outage_leaves_deliveries_pending(self):
+        self.add_recipients(*[f"reader{n}@example.com" for n in range(3)])
+        dispatch = self.dispatch()
+
+        with mock.patch.object(OutageEmailBackend, "fail_after", 0):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                run_dispatch(dispatch.pk)
+
+        dispatch.refresh_from_db()
+        self.assertEqual(dispatch.status, "sending")
+        self.assertEqual((dispatch.sent_count, dispatch.failed_count), (0, 0))
+        self.assertIn("Connection unexpectedly closed", dispatch.error)
+        self.assertEqual(
+            set(dispatch.deliveries.values_list("status", flat=True)), {"pending"}
+        )
+
+        # Picked up again once its heartbeat is old enough
+        NewsletterDispatch.objects.filter(pk=dispatch.pk).update(
+            heartbeat_at=timezone.now() - newsletter_dispatch.STALL_AFTER - timedelta(minutes=1)
+        )
+        with mock.patch.object(newsletter_dispatch, "async_task") as async_task:
+            self.assertEqual(resume_stalled_dispatches(), 1)
+        async_task.assert_called_once_with("cms.tasks.run_newsletter_dispatch", dispatch.pk)
+
+    @override_settings(EMAIL_BACKEND="cms.tests.RefusingEmailBackend")
+    def test_refused_recipient_fails_only_that_delivery(self):
+        self.add_recipients("reader@example.com", "bounce@example.com")
+        dispatch = self.dispatch()
+
+        run_dispatch(dispatch.pk)
+
+        self.assertEqual([message.to[0] for message in mail.outbox], ["reader@example.com"])
+        refused = NewsletterDelivery.objects.get(dispatch=dispatch, email="bounce@example.com")
+        self.assertEqual(refused.status, "failed")
+        dispatch.refresh_from_db()
+        self.assertEqual(dispatch.status, "completed")
+        self.assertEqual((dispatch.sent_count, dispatch.failed_count), (1, 1))
+
+
+class BlogNewsletterSignalTests(TestCase):
+
+    def test_dispatched_when_created_flagged(self):
+        blog = Blog.objects.create(title="New words", send_as_newsletter=True)
+        self.assertEqual(blog.dispatches.count(), 1)
+
+    def test_dispatched_when_flag_switched_on(self):
+        blog = Blog.objects.create(title="New words")
+        self.assertEqual(blog.dispatches.count(), 0)
+
+        blog.send_as_newsletter = True
+        blog.save()
+        self.assertEqual(blog.dispatches.count(), 1)
+
+    def test_editing_a_flagged_post_sends_nothing(self):
+        blog = Blog.objects.create(title="New words")
+        # Flagged before dispatches existed
+        Blog.objects.filter(pk=blog.pk).update(send_as_newsletter=True)
+        blog.refresh_from_db()
+
+        blog.title = "New words, revised"
+        blog.save()
+        self.assertEqual(blog.dispatches.count(), 0)
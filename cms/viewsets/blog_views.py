@@ -1,15 +1,20 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from cms.models import Blog
+from cms.models import Blog, BlogCategory
 from cms.serializers.blog_serializers import BlogCreateSerializer, BlogListSerializer
 from utils.paginator import CustomPageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
+from utils.search import search_queryset
 
 class BlogViewSet(viewsets.ViewSet):
     lookup_field = 'slug'
+    # ?search= on list; the full-text fields match the cms search index
+    search_fields = ['title']
+    search_vector_fields = ['title', 'sub_title', 'description']
 
     # Helper to choose serializer
     def get_serializer_class(self, action):
@@ -24,11 +29,25 @@ class BlogViewSet(viewsets.ViewSet):
     # ---------------- LIST ----------------
     @has_permission("can_read_blog")
     @swagger_auto_schema(
-        operation_description="List all blogs with pagination (latest first)",
+        operation_description="List all blogs with pagination (latest first, or best match first when searching)",
+        manual_parameters=[
+            openapi.Parameter(
+                'search',
+                openapi.IN_QUERY,
+                description="Search titles and full text",
+                type=openapi.TYPE_STRING
+            )
+        ],
         responses={200: BlogListSerializer(many=True)}
     )
+    @conditional_get(Blog, BlogCategory)
     def list(self, request):
-        queryset = self.get_queryset()
+        queryset = search_queryset(
+            self.get_queryset(),
+            request.query_params.get('search'),
+            self.search_fields,
+            self.search_vector_fields
+        )
 
         paginator = CustomPageNumberPagination()
         paginated_queryset = paginator.paginate_queryset(queryset, request)
@@ -61,6 +80,7 @@ class BlogViewSet(viewsets.ViewSet):
             404: "Not Found"
         }
     )
+    @conditional_get(Blog, BlogCategory)
     def retrieve(self, request, slug=None):
         blog = get_object_or_404(self.get_queryset(), slug=slug)
         serializer_class = self.get_serializer_class('retrieve')
@@ -10,6 +10,7 @@ from utils.paginator import CustomPageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.decorators import action
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
 class BlogCategoryViewSet(viewsets.ViewSet):
 
@@ -22,6 +23,7 @@ class BlogCategoryViewSet(viewsets.ViewSet):
         operation_description="List all blog categories with pagination (latest first)",
         responses={200: BlogCategoryListSerializer(many=True)}
     )
+    @conditional_get(BlogCategory)
     def list(self, request):
         queryset = self.get_queryset()
 
@@ -59,6 +61,7 @@ class BlogCategoryViewSet(viewsets.ViewSet):
             404: "Not Found"
         }
     )
+    @conditional_get(BlogCategory)
     def retrieve(self, request, pk=None):
         category = get_object_or_404(self.get_queryset(), pk=pk)
         serializer = BlogCategoryListSerializer(category)
@@ -189,6 +192,7 @@ class BlogCategoryViewSet(viewsets.ViewSet):
         responses={200: "OK"}
     )
     @action(detail=False, methods=["get"], url_path="dropdown")
+    @conditional_get(BlogCategory)
     def dropdown(self, request):
         queryset = (
             self.get_queryset()
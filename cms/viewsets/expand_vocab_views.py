@@ -1,7 +1,7 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 
 from cms.models import ExpandVocab
 
@@ -11,7 +11,9 @@ from rest_framework.permissions import AllowAny
 from cms.serializers.expand_vocab_serializers import ExpandVocabSerializer
 from utils.paginator import CustomPageNumberPagination
 from rest_framework.decorators import action
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
+from utils.search import RankedSearchFilter
 class ExpandVocabViewSet(ModelViewSet):
     
     queryset = ExpandVocab.objects.all().order_by('word')
@@ -20,7 +22,7 @@ class ExpandVocabViewSet(ModelViewSet):
     pagination_class = CustomPageNumberPagination
 
     # Search + Filter + Ordering
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, OrderingFilter]
 
     # 🔍 Search by keyword
     search_fields = [
@@ -48,6 +50,7 @@ class ExpandVocabViewSet(ModelViewSet):
         operation_summary="List Expand Vocabulary",
         operation_description="Paginated list of expand vocabulary with search and filters"
     )
+    @conditional_get(ExpandVocab)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
@@ -67,6 +70,7 @@ class ExpandVocabViewSet(ModelViewSet):
         operation_summary="Retrieve Expand Vocabulary",
         operation_description="Retrieve a single expand vocabulary entry by ID"
     )
+    @conditional_get(ExpandVocab)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
     
@@ -141,6 +145,7 @@ class ExpandVocabDropdownViewSet(viewsets.ViewSet):
         ],
         responses={200: ExpandVocabSerializer(many=True)}
     )
+    @conditional_get(ExpandVocab)
     def list(self, request):
        
         start_date_str = request.query_params.get("start_date")
@@ -7,12 +7,14 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.decorators import action
 from django.utils.dateparse import parse_date  
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
+from utils.search import RankedSearchFilter
 class NowKnowItViewSet(viewsets.ModelViewSet):
     
     queryset = NowKnowIt.objects.all().order_by("-created_at")
@@ -21,7 +23,7 @@ class NowKnowItViewSet(viewsets.ModelViewSet):
     pagination_class = CustomPageNumberPagination
 
     
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter, OrderingFilter]
 
     
     search_fields = ['common_nepali_english', 'natural_english', 'reason']
@@ -38,6 +40,7 @@ class NowKnowItViewSet(viewsets.ModelViewSet):
         operation_description="List all NowKnowIt items with pagination",
         responses={200: NowKnowItSerializer(many=True)}
     )
+    @conditional_get(NowKnowIt)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -59,6 +62,7 @@ class NowKnowItViewSet(viewsets.ModelViewSet):
             404: "Not Found"
         }
     )
+    @conditional_get(NowKnowIt)
     def retrieve(self, request, pk=None):
         try:
             instance = NowKnowIt.objects.get(pk=pk)
@@ -247,6 +251,7 @@ class NowKnowItDropdownViewSet(viewsets.ViewSet):
         ],
         responses={200: NowKnowItSerializer(many=True)}
     )
+    @conditional_get(NowKnowIt)
     def list(self, request):
        
         start_date_str = request.query_params.get("start_date")
@@ -1,7 +1,10 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from cms.models import Newsletters
+from cms.newsletter_dispatch import start_dispatch
+from cms.serializers.newsletter_dispatch_serializers import NewsletterDispatchSerializer
 from cms.serializers.newsletter_serializers import (
     NewsletterCreateSerializer,
     NewsletterListSerializer
@@ -182,3 +185,53 @@ class NewsletterViewSet(viewsets.ViewSet):
             {"message": "Newsletter deleted successfully"},
             status=status.HTTP_204_NO_CONTENT
         )
+
+    # ---------------- SEND ----------------
+    @has_permission("can_write_newsletter")
+    @swagger_auto_schema(
+        operation_description=(
+            "Send a newsletter to its users. Delivery runs in the background; "
+            "poll the dispatches endpoint for progress."
+        ),
+        request_body=openapi.Schema(type=openapi.TYPE_OBJECT, properties={}),
+        responses={
+            202: NewsletterDispatchSerializer(),
+            400: "Newsletter is inactive or already being sent",
+            404: "Not Found"
+        }
+    )
+    @action(detail=True, methods=["post"])
+    def send(self, request, pk=None):
+        newsletter = get_object_or_404(self.get_queryset(), pk=pk)
+
+        if not newsletter.is_active:
+            return Response(
+                {"error": "Inactive newsletters can't be sent"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if newsletter.dispatches.filter(status__in=["pending", "sending"]).exists():
+            return Response(
+                {"error": "This newsletter is already being sent"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        dispatch = start_dispatch(newsletter=newsletter, user=request.user)
+        return Response({
+            "message": "Newsletter queued for sending",
+            "data": NewsletterDispatchSerializer(dispatch).data
+        }, status=status.HTTP_202_ACCEPTED)
+
+    # ---------------- DISPATCHES ----------------
+    @has_permission("can_read_newsletter")
+    @swagger_auto_schema(
+        operation_description="Delivery runs of a newsletter, latest first, with their progress",
+        responses={200: NewsletterDispatchSerializer(many=True)}
+    )
+    @action(detail=True, methods=["get"])
+    def dispatches(self, request, pk=None):
+        newsletter = get_object_or_404(self.get_queryset(), pk=pk)
+        serializer = NewsletterDispatchSerializer(newsletter.dispatches.all(), many=True)
+        return Response({
+            "message": "Newsletter dispatches fetched successfully",
+            "data": serializer.data
+        })
@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404
 from cms.models import Videos
 from cms.serializers.video_serializers import VideoCreateSerializer, VideoListSerializer
 from utils.paginator import CustomPageNumberPagination
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
 
 class VideoViewSet(viewsets.ViewSet):
@@ -13,6 +14,7 @@ class VideoViewSet(viewsets.ViewSet):
 
     # GET /videos/
     @has_permission("can_read_video")
+    @conditional_get(Videos)
     def list(self, request):
         queryset = Videos.objects.all().order_by('-created_at')
 
@@ -47,7 +49,7 @@ class VideoViewSet(viewsets.ViewSet):
 
     # GET /videos/{id}/
     @has_permission("can_read_video")
-    
+    @conditional_get(Videos)
     def retrieve(self, request, pk=None):
         video = get_object_or_404(Videos, pk=pk)
         serializer = VideoListSerializer(video, context={'request': request})
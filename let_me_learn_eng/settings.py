@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'drf_yasg',
     'rest_framework',
     'rest_framework_simplejwt.token_blacklist',
@@ -64,6 +65,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    'utils.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -156,7 +159,7 @@ SITE_ID = 1
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.UserContextJWTAuthentication",
     ),
 
     "DEFAULT_RENDERER_CLASSES": [
@@ -239,7 +242,8 @@ DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@samishayonhg
 
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # django-redis, counting hits and misses for utils.metrics
+        "BACKEND": "utils.metrics.InstrumentedRedisCache",
         "LOCATION": "redis://redis:6379/1",  # redis = service name in docker-compose
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -247,6 +251,14 @@ CACHES = {
     }
 }
 
+# Bearer token Prometheus must send to scrape /metrics. Unset, /metrics
+# is only served with DEBUG on.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Reading/listening submit-answer only queues answers on a Redis stream
+# and a django-q task writes them in batches (see tasks.answer_queue)
+ANSWER_WRITE_BEHIND = os.getenv("ANSWER_WRITE_BEHIND", "False") == "True"
+
 
 Q_CLUSTER = {
     'name': 'DjangoQ',
@@ -260,8 +272,15 @@ Q_CLUSTER = {
 }  
 
 
+# Google sign-in: OAuth client ids whose ID tokens are accepted, and an
+# optional dotted path to a key source factory (see user.google_auth)
+GOOGLE_CLIENT_IDS = [client_id for client_id in os.getenv("GOOGLE_CLIENT_IDS", "").split(",") if client_id]
+GOOGLE_CERTS_SOURCE = os.getenv("GOOGLE_CERTS_SOURCE") or None
+
 FRONTEND_VERIFY_REDIRECT_URL="https://baserasolutions.com/login/"
 DOMAIN_NAME = "http://localhost:8002"  
+# Base of the absolute links in emails (Blog.get_absolute_url)
+SITE_URL = os.getenv("SITE_URL", DOMAIN_NAME)
 
 # Celery (Redis as broker)
 # CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MasterSettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'master_settings'
+
+    def ready(self):
+        import master_settings.signals  # noqa: F401
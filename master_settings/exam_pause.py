@@ -0,0 +1,129 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from master_settings.models import ExamPause
+from user.authentication import get_student_school_id, get_user_profile
+
+
+# -----------------------------
+# Exam pause resolver
+# Active and upcoming ExamPause windows are indexed by (school, grade)
+# in each process; a window with no school applies to every school and
+# one marked mark_all_grade to every grade. The list of windows is
+# shared through the cache and dropped on any ExamPause change (see
+# master_settings.signals); a process compares its copy against the
+# shared one at most every LOCAL_CHECK_INTERVAL seconds, so a lookup is
+# a few dict probes with no database or cache round trip.
+# -----------------------------
+EXAM_PAUSE_CACHE_KEY = "exam_pause_windows"
+EXAM_PAUSE_CACHE_TIMEOUT = 60 * 60
+LOCAL_CHECK_INTERVAL = 5
+
+
+def _grade_key(grade):
+    return str(grade).strip().lower() if grade not in (None, "") else None
+
+
+def _load_windows():
+    now = timezone.now()
+    return [
+        (school_id, None if mark_all_grade else _grade_key(grade), start_date, end_date)
+        for school_id, grade, mark_all_grade, start_date, end_date in (
+            ExamPause.objects
+            .filter(is_active=True, end_date__gt=now)
+            .values_list("school_id", "grade", "mark_all_grade", "start_date", "end_date")
+        )
+        # A pause for one grade that names no grade pauses nothing
+        if mark_all_grade or _grade_key(grade) is not None
+    ]
+
+
+def _shared_windows():
+    shared = cache.get(EXAM_PAUSE_CACHE_KEY)
+    if shared is None:
+        shared = {"version": time.time_ns(), "windows": _load_windows()}
+        # add: a concurrent rebuild that got there first wins
+        if not cache.add(EXAM_PAUSE_CACHE_KEY, shared, EXAM_PAUSE_CACHE_TIMEOUT):
+            shared = cache.get(EXAM_PAUSE_CACHE_KEY) or shared
+    return shared
+
+
+class ExamPauseIndex:
+
+    def __init__(self):
+        self._index = {}
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        with self._lock:
+            if time.monotonic() - self._checked_at < LOCAL_CHECK_INTERVAL:
+                return
+            shared = _shared_windows()
+            if shared["version"] != self._version:
+                index = {}
+                for school_id, grade, start_date, end_date in shared["windows"]:
+                    index.setdefault((school_id, grade), []).append((start_date, end_date))
+                self._index, self._version = index, shared["version"]
+            self._checked_at = time.monotonic()
+
+    def paused_until(self, school_id, grade, now=None):
+        """
+        End of the pause covering ``school_id`` / ``grade`` right now,
+        or None. Either may be None (student without a school or grade);
+        only the windows that don't need it can match then.
+        """
+        if time.monotonic() - self._checked_at >= LOCAL_CHECK_INTERVAL:
+            self._refresh()
+
+        now = now or timezone.now()
+        grade = _grade_key(grade)
+        index = self._index
+        until = None
+        for key in ((school_id, grade), (school_id, None), (None, grade), (None, None)):
+            for start_date, end_date in index.get(key, ()):
+                if start_date <= now < end_date and (until is None or end_date > until):
+                    until = end_date
+        return until
+
+    def clear(self):
+        self._checked_at = 0
+
+
+exam_pauses = ExamPauseIndex()
+
+
+def invalidate_exam_pauses():
+    def drop():
+        cache.delete(EXAM_PAUSE_CACHE_KEY)
+        exam_pauses.clear()
+    transaction.on_commit(drop)
+
+
+def exam_pause_response(user):
+    """
+    A 403 Response if ``user`` is a student whose school and grade are in
+    an exam pause, else None. With the user loaded by
+    UserContextJWTAuthentication this makes no query.
+    """
+    profile = get_user_profile(user)
+    if profile is None or profile.user_type != "student":
+        return None
+
+    until = exam_pauses.paused_until(get_student_school_id(user), profile.grade)
+    if until is None:
+        return None
+    return Response(
+        {
+            "detail": "Activities are paused during exams.",
+            "paused_until": until,
+        },
+        status=status.HTTP_403_FORBIDDEN
+    )
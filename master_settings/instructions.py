@@ -0,0 +1,21 @@
+from master_settings.models import InstructionTemplate
+from master_settings.serializers.instruction_template_serializers import InstructionTemplateSerializer
+from utils.reference_cache import get_reference
+
+
+# -----------------------------
+# Default activity instructions
+# The singleton InstructionTemplate, served from utils.reference_cache;
+# master_settings.signals drops it whenever the template changes.
+# -----------------------------
+INSTRUCTION_TEMPLATE = "instruction_template"
+
+
+def _load_instruction_template():
+    instance = InstructionTemplate.objects.first()
+    return dict(InstructionTemplateSerializer(instance).data) if instance else {}
+
+
+def get_instruction_template():
+    """The instruction template as serialized data, or {} if none is set."""
+    return get_reference(INSTRUCTION_TEMPLATE, "default", _load_instruction_template)
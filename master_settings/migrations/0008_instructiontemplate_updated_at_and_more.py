@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master_settings', '0007_termsandconditions_effective_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='instructiontemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='privacypolicy',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
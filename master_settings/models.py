@@ -6,6 +6,7 @@ class InstructionTemplate(models.Model):
     listening_instruction=models.TextField(blank=False, null=False)
     writing_instruction=models.TextField(blank=False, null=False)
     reading_instruction=models.TextField(blank=False, null=False)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
        
     def __str__(self):
         return self.speaking_instruction
@@ -17,7 +18,8 @@ class PrivacyPolicy(models.Model):
     effective_date = models.DateTimeField()
     description = models.TextField(blank=True)
     created_at=models.DateTimeField(auto_now_add=True)
-   
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
 
     def __str__(self):
         return self.topic
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+
+from master_settings.exam_pause import invalidate_exam_pauses
+from master_settings.instructions import INSTRUCTION_TEMPLATE
+from master_settings.models import ExamPause, InstructionTemplate
+from utils.reference_cache import invalidate_reference
+
+
+def exam_pause_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_exam_pauses()
+
+
+post_save.connect(exam_pause_changed, sender=ExamPause)
+post_delete.connect(exam_pause_changed, sender=ExamPause)
+
+
+def instruction_template_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_reference(INSTRUCTION_TEMPLATE)
+
+
+post_save.connect(instruction_template_changed, sender=InstructionTemplate)
+post_delete.connect(instruction_template_changed, sender=InstructionTemplate)
@@ -5,9 +5,11 @@ from rest_framework.permissions import IsAuthenticated
 
 from drf_yasg.utils import swagger_auto_schema
 
+from master_settings.instructions import get_instruction_template
 from master_settings.models import InstructionTemplate
 from master_settings.serializers.instruction_template_serializers import InstructionTemplateSerializer
 
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
 
 class InstructionTemplateViewSet(ViewSet):
@@ -21,13 +23,9 @@ class InstructionTemplateViewSet(ViewSet):
         operation_summary="Get Instruction Template",
         operation_description="Fetch the single instruction template configuration"
     )
+    @conditional_get(InstructionTemplate)
     def list(self, request):
-        instance = InstructionTemplate.objects.first()
-        if not instance:
-            return Response({}, status=status.HTTP_200_OK)
-
-        serializer = InstructionTemplateSerializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(get_instruction_template(), status=status.HTTP_200_OK)
     @has_permission("can_write_instructions")
     @swagger_auto_schema(
         tags=['admin.instructiontemplate'],
@@ -10,6 +10,7 @@ from drf_yasg.utils import swagger_auto_schema
 from master_settings.models import PrivacyPolicy
 from master_settings.serializers.privacy_policy_serializers import PrivacyPolicySerializer
 from utils.permissions import IsAdminUserType
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
 class PrivacyPolicyViewSet(ViewSet):
    
@@ -20,6 +21,7 @@ class PrivacyPolicyViewSet(ViewSet):
         operation_summary="Get Privacy Policy",
         operation_description="Fetch the single privacy policy configuration"
     )
+    @conditional_get(PrivacyPolicy)
     def list(self, request):
       
         policy = PrivacyPolicy.objects.first()
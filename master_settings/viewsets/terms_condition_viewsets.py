@@ -8,6 +8,7 @@ from drf_yasg.utils import swagger_auto_schema
 from master_settings.models import TermsandConditions
 from master_settings.serializers.terms_condition_serializers import TermsandConditionsSerializer
 from utils.permissions import IsAdminUserType
+from utils.conditional import conditional_get
 from utils.decorators import has_permission
 class TermsandConditionsViewSet(ViewSet):
     """
@@ -20,6 +21,7 @@ class TermsandConditionsViewSet(ViewSet):
         operation_summary="Get Terms and Conditions",
         operation_description="Fetch the single terms and conditions configuration"
     )
+    @conditional_get(TermsandConditions)
     def list(self, request):
         """
         GET /terms-conditions/
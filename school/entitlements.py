@@ -0,0 +1,118 @@
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from school.models import Subscription
+from user.authentication import get_student_school_id, get_user_profile
+
+
+# -----------------------------
+# Subscription entitlements
+# What a school's subscription currently allows, cached per school id:
+#   {"state": "none" | "pending" | "trial" | "active" | "deactivated",
+#    "end_date": date or None}
+# Entries are rewritten whenever a Subscription is saved (which
+# update_subscription always does) or deleted, and expire at the end of
+# the subscription's last day, so a lapse is seen the day it happens.
+# "Expired" is not stored: it is derived from end_date when read.
+# -----------------------------
+ENTITLEMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# States whose students may keep working until end_date
+ENTITLED_STATES = ("trial", "active")
+
+
+def _entitlement_key(school_id):
+    return f"school_entitlement:{school_id}"
+
+
+def _state(status_value, on_trial):
+    if status_value == "deactivate":
+        return "deactivated"
+    if on_trial:
+        return "trial"
+    if status_value == "active":
+        return "active"
+    return "pending"
+
+
+def _timeout(end_date):
+    # Until the end of end_date, capped; at least a minute
+    if end_date is None:
+        return ENTITLEMENT_CACHE_TIMEOUT
+    expires_at = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+    remaining = (expires_at - timezone.now()).total_seconds()
+    return int(min(max(remaining, 60), ENTITLEMENT_CACHE_TIMEOUT))
+
+
+def _load_entitlement(school_id):
+    row = (
+        Subscription.objects
+        .filter(school_id=school_id)
+        .values("status", "on_trial", "end_date")
+        .first()
+    )
+    if row is None:
+        return {"state": "none", "end_date": None}
+    return {"state": _state(row["status"], row["on_trial"]), "end_date": row["end_date"]}
+
+
+def refresh_school_entitlement(school_id):
+    entitlement = _load_entitlement(school_id)
+    cache.set(_entitlement_key(school_id), entitlement, _timeout(entitlement["end_date"]))
+    return entitlement
+
+
+def schedule_entitlement_refresh(*school_ids):
+    school_ids = {school_id for school_id in school_ids if school_id}
+
+    def refresh():
+        for school_id in school_ids:
+            refresh_school_entitlement(school_id)
+    transaction.on_commit(refresh)
+
+
+def get_school_entitlement(school_id):
+    entitlement = cache.get(_entitlement_key(school_id))
+    if entitlement is None:
+        entitlement = refresh_school_entitlement(school_id)
+    return entitlement
+
+
+def entitlement_status(entitlement, today=None):
+    """The entitlement's state, with "expired" once end_date has passed."""
+    today = today or timezone.localdate()
+    end_date = entitlement["end_date"]
+    if entitlement["state"] in ENTITLED_STATES and end_date and end_date < today:
+        return "expired"
+    return entitlement["state"]
+
+
+def subscription_gate_response(user):
+    """
+    A 403 Response if ``user`` is a student of a school whose
+    subscription has lapsed (expired or deactivated), else None. Schools
+    that never had a subscription, or whose first one is pending, are
+    not blocked. One cache read; no query for JWT-authenticated users.
+    """
+    profile = get_user_profile(user)
+    if profile is None or profile.user_type != "student":
+        return None
+
+    school_id = get_student_school_id(user)
+    if school_id is None:
+        return None
+
+    state = entitlement_status(get_school_entitlement(school_id))
+    if state not in ("expired", "deactivated"):
+        return None
+    return Response(
+        {
+            "detail": "Your school's subscription has lapsed.",
+            "subscription_status": state,
+        },
+        status=status.HTTP_403_FORBIDDEN
+    )
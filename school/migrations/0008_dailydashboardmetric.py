@@ -0,0 +1,75 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:17
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_metrics(apps, schema_editor):
+    Subscription = apps.get_model('school', 'Subscription')
+    School = apps.get_model('user', 'School')
+    UserProfile = apps.get_model('user', 'UserProfile')
+    DailyDashboardMetric = apps.get_model('school', 'DailyDashboardMetric')
+
+    sources = {
+        'revenue': Subscription.objects.filter(status='active')
+            .values(day=models.F('start_date')).annotate(total=models.Sum('amount')),
+        'schools_onboarded': School.objects.filter(is_deleted=False, is_disabled=False)
+            .values(day=TruncDate('created_at')).annotate(total=models.Count('id')),
+        'students_joined': UserProfile.objects.filter(user_type='student', is_deleted=False, is_disabled=False)
+            .values(day=TruncDate('user__date_joined')).annotate(total=models.Count('id')),
+    }
+    buckets = {}
+    for field, qs in sources.items():
+        for row in qs:
+            if row['total']:
+                buckets.setdefault(row['day'], {})[field] = row['total']
+
+    DailyDashboardMetric.objects.bulk_create(
+        [DailyDashboardMetric(date=day, **values) for day, values in buckets.items()],
+        batch_size=1000,
+    )
+
+
+def schedule_rollup(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name='rollup_dashboard_metrics',
+        defaults={
+            'func': 'school.tasks.rollup_dashboard_metrics',
+            'schedule_type': 'D',
+            'repeats': -1,
+        },
+    )
+
+
+def unschedule_rollup(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='rollup_dashboard_metrics').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0007_alter_subscription_status'),
+        ('user', '0007_schoolstudentcounter'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyDashboardMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('revenue', models.PositiveBigIntegerField(default=0)),
+                ('schools_onboarded', models.PositiveIntegerField(default=0)),
+                ('students_joined', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.RunPython(backfill_metrics, migrations.RunPython.noop),
+        migrations.RunPython(schedule_rollup, unschedule_rollup),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import TruncDate
 from django.contrib.auth import get_user_model
-from user.models import School
+from user.models import School, UserProfile
 
 User = get_user_model()
 
@@ -124,4 +125,82 @@ class SubscriptionLog(models.Model):
         ordering = ["-created_at"]
 
     def __str__(self):
-        return f"Log #{self.pk} for {self.subscription} at {self.created_at}"
\ No newline at end of file
+        return f"Log #{self.pk} for {self.subscription} at {self.created_at}"
+
+class DailyDashboardMetric(models.Model):
+    """
+    One row per calendar day (in TIME_ZONE) with the admin dashboard
+    figures for that day. Kept current by school.signals and rebuilt
+    nightly by school.tasks.rollup_dashboard_metrics; days with nothing
+    to report have no row.
+    """
+    METRIC_FIELDS = ("revenue", "schools_onboarded", "students_joined")
+
+    date = models.DateField(unique=True)
+    revenue = models.PositiveBigIntegerField(default=0)
+    schools_onboarded = models.PositiveIntegerField(default=0)
+    students_joined = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"Dashboard metrics for {self.date}"
+
+    @staticmethod
+    def daily_sources():
+        """Raw per-day totals for each metric, as ``day``/``total`` rows."""
+        return {
+            "revenue": (
+                Subscription.objects
+                .filter(status="active")
+                .values(day=models.F("start_date"))
+                .annotate(total=models.Sum("amount"))
+            ),
+            "schools_onboarded": (
+                School.objects
+                .filter(is_deleted=False, is_disabled=False)
+                .values(day=TruncDate("created_at"))
+                .annotate(total=models.Count("id"))
+            ),
+            "students_joined": (
+                UserProfile.objects
+                .filter(user_type="student", is_deleted=False, is_disabled=False)
+                .values(day=TruncDate("user__date_joined"))
+                .annotate(total=models.Count("id"))
+            ),
+        }
+
+    @classmethod
+    def rollup(cls, days=None):
+        """
+        Recomputes the given days from the raw tables, or every day
+        when ``days`` is None.
+        """
+        if days is not None:
+            days = set(days)
+            if not days:
+                return
+
+        buckets = {}
+        for field, qs in cls.daily_sources().items():
+            if days is not None:
+                qs = qs.filter(day__in=days)
+            for row in qs:
+                if row["total"]:
+                    buckets.setdefault(row["day"], dict.fromkeys(cls.METRIC_FIELDS, 0))[field] = row["total"]
+
+        stale = cls.objects.exclude(date__in=buckets)
+        if days is not None:
+            stale = stale.filter(date__in=days)
+
+        with transaction.atomic():
+            stale.delete()
+            cls.objects.bulk_create(
+                [cls(date=day, **values) for day, values in buckets.items()],
+                update_conflicts=True,
+                unique_fields=["date"],
+                update_fields=[*cls.METRIC_FIELDS, "updated_at"],
+                batch_size=1000,
+            )
@@ -0,0 +1,131 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.utils import timezone
+
+from school.entitlements import schedule_entitlement_refresh
+from school.models import Subscription, DailyDashboardMetric
+from user.models import School, UserProfile
+from utils.transactions import defer_on_commit
+
+User = get_user_model()
+
+
+# ------------------------------
+# DailyDashboardMetric maintenance
+# Days touched inside a transaction are recomputed once, on commit.
+# Queryset .update() calls bypass these; the nightly rollup in
+# school.tasks catches those.
+# ------------------------------
+
+def schedule_dashboard_refresh(*days):
+    defer_on_commit("dashboard_days", days, DailyDashboardMetric.rollup)
+
+
+# ── Subscription: revenue lands on start_date ──
+
+def subscription_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = (
+        Subscription.objects
+        .filter(pk=instance.pk)
+        .values_list("start_date", "school_id")
+        .first()
+    )
+    if previous is None:
+        return
+    previous_start, previous_school_id = previous
+    if previous_start != instance.start_date:
+        schedule_dashboard_refresh(previous_start)
+    if previous_school_id != instance.school_id:
+        schedule_entitlement_refresh(previous_school_id)
+
+
+def subscription_post_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_dashboard_refresh(instance.start_date)
+        schedule_entitlement_refresh(instance.school_id)
+
+
+def subscription_post_delete(sender, instance, **kwargs):
+    schedule_dashboard_refresh(instance.start_date)
+    schedule_entitlement_refresh(instance.school_id)
+
+
+# ── School: onboarding lands on created_at ──
+
+def school_post_save(sender, instance, raw=False, **kwargs):
+    if not raw and instance.created_at:
+        schedule_dashboard_refresh(timezone.localdate(instance.created_at))
+
+
+def school_post_delete(sender, instance, **kwargs):
+    if instance.created_at:
+        schedule_dashboard_refresh(timezone.localdate(instance.created_at))
+
+
+# ── Student profiles: joins land on user.date_joined ──
+# Only these fields decide whether a profile is counted, so other saves
+# (grade, avatar, ...) leave the dashboard alone.
+PROFILE_COUNTED_FIELDS = ("user_type", "is_deleted", "is_disabled")
+
+
+def _schedule_student_day(profile):
+    # Looked up by id: on a cascade delete the user row may already be
+    # gone from the profile's point of view.
+    date_joined = (
+        User.objects
+        .filter(pk=profile.user_id)
+        .values_list("date_joined", flat=True)
+        .first()
+    )
+    if date_joined:
+        schedule_dashboard_refresh(timezone.localdate(date_joined))
+
+
+def profile_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._dashboard_previous = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(PROFILE_COUNTED_FIELDS):
+        return
+    instance._dashboard_previous = (
+        UserProfile.objects
+        .filter(pk=instance.pk)
+        .values_list(*PROFILE_COUNTED_FIELDS, "user__date_joined")
+        .first()
+    )
+
+
+def profile_post_save(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if created:
+        if instance.user_type == "student":
+            _schedule_student_day(instance)
+        return
+
+    previous = getattr(instance, "_dashboard_previous", None)
+    if previous is None:
+        return
+    *previous_state, date_joined = previous
+    current_state = [getattr(instance, field) for field in PROFILE_COUNTED_FIELDS]
+    if previous_state == current_state:
+        return
+    if "student" in (previous_state[0], current_state[0]) and date_joined:
+        schedule_dashboard_refresh(timezone.localdate(date_joined))
+
+
+def profile_pre_delete(sender, instance, **kwargs):
+    if instance.user_type == "student":
+        _schedule_student_day(instance)
+
+
+pre_save.connect(subscription_pre_save, sender=Subscription)
+post_save.connect(subscription_post_save, sender=Subscription)
+post_delete.connect(subscription_post_delete, sender=Subscription)
+post_save.connect(school_post_save, sender=School)
+post_delete.connect(school_post_delete, sender=School)
+pre_save.connect(profile_pre_save, sender=UserProfile)
+post_save.connect(profile_post_save, sender=UserProfile)
+pre_delete.connect(profile_pre_delete, sender=UserProfile)
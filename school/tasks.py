@@ -0,0 +1,10 @@
+from school.models import DailyDashboardMetric
+
+
+def rollup_dashboard_metrics():
+    """
+    Scheduled django-q task: rebuilds every DailyDashboardMetric row from
+    the raw tables, picking up changes the signals can't see (bulk
+    updates, soft deletes done with .update()).
+    """
+    DailyDashboardMetric.rollup()
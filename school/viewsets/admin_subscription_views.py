@@ -8,7 +8,6 @@ from rest_framework.response import Response
 from django.db.models import Q, Count
 
 from school.models import Subscription, SubscriptionLog
-from user.models import School
 from school.serializers.subscriptions_serializers import (
     SubscriptionHistoryCreateSerializer,
     SubscriptionHistoryListSerializer,
@@ -148,12 +147,12 @@ class AdminSubscriptionHistoryViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         qs = self.get_queryset()
 
-        counts = {
-            "paid": Subscription.objects.filter(status="paid").count(),
-            "pending": Subscription.objects.filter(status="pending").count(),
-            "inactive": Subscription.objects.filter(status="inactive").count(),
-            "on_trial": Subscription.objects.filter(on_trial=True).count(),
-        }
+        counts = Subscription.objects.aggregate(
+            paid=Count("id", filter=Q(status="paid")),
+            pending=Count("id", filter=Q(status="pending")),
+            inactive=Count("id", filter=Q(status="inactive")),
+            on_trial=Count("id", filter=Q(on_trial=True)),
+        )
 
         page = self.paginate_queryset(qs)
         if page is not None:
@@ -229,12 +228,11 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from django.db.models import Sum
-from django.db.models.functions import TruncDay, TruncMonth
+from django.db.models.functions import ExtractMonth
 from django.utils import timezone
 import datetime
 
-from user.models import UserProfile, School
-from school.models import Subscription
+from school.models import Subscription, DailyDashboardMetric
 
 
 # ═══════════════════════════════════════════════════════
@@ -291,102 +289,86 @@ def build_summary(data: list) -> dict:
     }
 
 
-def revenue_by_week() -> list:
-    """Last 7 days individually. Label: MON, TUE ... (actual weekday of each day)."""
-    today = timezone.now().date()
-
-    qs = (
-        Subscription.objects
-        .filter(
-            status="active",
-            start_date__gte=today - datetime.timedelta(days=6),
-            start_date__lte=today,
-        )
-        .annotate(day=TruncDay("start_date"))
-        .values("day")
-        .annotate(revenue=Sum("amount"))
-        .order_by("day")
+# ── Charts read DailyDashboardMetric buckets, not the raw tables ──
+
+def daily_metric(field, start, end) -> dict:
+    """{date: value} for the days in [start, end] that have a bucket."""
+    return dict(
+        DailyDashboardMetric.objects
+        .filter(date__gte=start, date__lte=end)
+        .values_list("date", field)
+    )
+
+
+def monthly_metric(field, year) -> dict:
+    """{month number: total} for ``year``."""
+    return dict(
+        DailyDashboardMetric.objects
+        .filter(date__year=year)
+        .annotate(month=ExtractMonth("date"))
+        .values("month")
+        .annotate(total=Sum(field))
+        .order_by()
+        .values_list("month", "total")
     )
 
-    lookup = {
-        (row["day"].date() if hasattr(row["day"], "date") else row["day"]): row["revenue"]
-        for row in qs
-    }
+
+def week_series(field, key) -> list:
+    """Last 7 days individually. Label: MON, TUE ... (actual weekday of each day)."""
+    today  = timezone.localdate()
+    start  = today - datetime.timedelta(days=6)
+    lookup = daily_metric(field, start, today)
 
     result = []
     for i in range(6, -1, -1):
         day = today - datetime.timedelta(days=i)
         result.append({
-            "label":   day.strftime("%a").upper(),
-            "revenue": lookup.get(day, 0),
+            "label": day.strftime("%a").upper(),
+            key:     lookup.get(day, 0),
         })
     return result
 
 
-def revenue_by_month() -> list:
+def month_series(field, key) -> list:
     """Every day of the current month. Label: 1, 2 ... 31."""
-    today       = timezone.now().date()
+    today       = timezone.localdate()
     month_start = today.replace(day=1)
-
-    qs = (
-        Subscription.objects
-        .filter(
-            status="active",
-            start_date__gte=month_start,
-            start_date__lte=today,
-        )
-        .annotate(day=TruncDay("start_date"))
-        .values("day")
-        .annotate(revenue=Sum("amount"))
-        .order_by("day")
-    )
-
-    lookup = {
-        (row["day"].date() if hasattr(row["day"], "date") else row["day"]): row["revenue"]
-        for row in qs
-    }
+    lookup      = daily_metric(field, month_start, today)
 
     result  = []
     current = month_start
     while current <= today:
         result.append({
-            "label":   str(current.day),
-            "revenue": lookup.get(current, 0),
+            "label": str(current.day),
+            key:     lookup.get(current, 0),
         })
         current += datetime.timedelta(days=1)
     return result
 
 
-def revenue_by_year() -> list:
+def year_series(field, key) -> list:
     """Jan → current month of this year. Label: JAN, FEB ..."""
-    today      = timezone.now().date()
-    year_start = today.replace(month=1, day=1)
-
-    qs = (
-        Subscription.objects
-        .filter(
-            status="active",
-            start_date__gte=year_start,
-            start_date__year=today.year,
-        )
-        .annotate(month=TruncMonth("start_date"))
-        .values("month")
-        .annotate(revenue=Sum("amount"))
-        .order_by("month")
-    )
-
-    lookup = {}
-    for row in qs:
-        m         = row["month"]
-        month_num = m.month if hasattr(m, "month") else m.date().month
-        lookup[month_num] = row["revenue"]
+    today  = timezone.localdate()
+    lookup = monthly_metric(field, today.year)
 
     return [
-        {"label": MONTH_LABELS[m], "revenue": lookup.get(m, 0)}
+        {"label": MONTH_LABELS[m], key: lookup.get(m, 0)}
         for m in range(1, today.month + 1)
     ]
 
 
+def revenue_by_week() -> list:
+    return week_series("revenue", "revenue")
+
+
+def revenue_by_month() -> list:
+    return month_series("revenue", "revenue")
+
+
+def revenue_by_year() -> list:
+    return year_series("revenue", "revenue")
+
+
 # ═══════════════════════════════════════════════════════
 # Swagger Schemas
 # ═══════════════════════════════════════════════════════
@@ -496,7 +478,7 @@ class DashboardSummaryAPIView(APIView):
     )
     def get(self, request):
         try:
-            now        = timezone.now()
+            now        = timezone.localtime()
             this_year  = now.year
             this_month = now.month
 
@@ -505,45 +487,19 @@ class DashboardSummaryAPIView(APIView):
             this_start, this_end = get_month_range(this_year, this_month)
             last_start, last_end = get_month_range(last_year, last_month)
 
-            # ── Revenue ──────────────────────────────
-            revenue_this_month = (
-                Subscription.objects
-                .filter(status="active", start_date__gte=this_start.date(), start_date__lt=this_end.date())
-                .aggregate(total=Sum("amount"))["total"] or 0
-            )
-            revenue_last_month = (
-                Subscription.objects
-                .filter(status="active", start_date__gte=last_start.date(), start_date__lt=last_end.date())
-                .aggregate(total=Sum("amount"))["total"] or 0
-            )
-
-            # ── Students ─────────────────────────────
-            students_this_month = (
-                UserProfile.objects
-                .filter(
-                    user_type="student", is_deleted=False, is_disabled=False,
-                    user__date_joined__gte=this_start, user__date_joined__lt=this_end,
-                ).count()
-            )
-            students_last_month = (
-                UserProfile.objects
-                .filter(
-                    user_type="student", is_deleted=False, is_disabled=False,
-                    user__date_joined__gte=last_start, user__date_joined__lt=last_end,
-                ).count()
-            )
-
-            # ── Schools ──────────────────────────────
-            schools_this_month = (
-                School.objects
-                .filter(is_deleted=False, is_disabled=False, created_at__gte=this_start, created_at__lt=this_end)
-                .count()
-            )
-            schools_last_month = (
-                School.objects
-                .filter(is_deleted=False, is_disabled=False, created_at__gte=last_start, created_at__lt=last_end)
-                .count()
+            # ── Revenue / Students / Schools ─────────
+            # Both months in one pass over the daily buckets
+            this_month_q = Q(date__gte=this_start.date(), date__lt=this_end.date())
+            last_month_q = Q(date__gte=last_start.date(), date__lt=last_end.date())
+            totals = DailyDashboardMetric.objects.aggregate(
+                revenue_this_month=Sum("revenue", filter=this_month_q),
+                revenue_last_month=Sum("revenue", filter=last_month_q),
+                students_this_month=Sum("students_joined", filter=this_month_q),
+                students_last_month=Sum("students_joined", filter=last_month_q),
+                schools_this_month=Sum("schools_onboarded", filter=this_month_q),
+                schools_last_month=Sum("schools_onboarded", filter=last_month_q),
             )
+            totals = {key: value or 0 for key, value in totals.items()}
 
             # ── Courses (plug in your model) ──────────
             courses_this_month = 0  # ← swap with real query
@@ -551,9 +507,9 @@ class DashboardSummaryAPIView(APIView):
 
             return Response(
                 {
-                    "total_revenue":  build_card(revenue_this_month,  revenue_last_month),
-                    "total_students": build_card(students_this_month, students_last_month),
-                    "total_schools":  build_card(schools_this_month,  schools_last_month),
+                    "total_revenue":  build_card(totals["revenue_this_month"],  totals["revenue_last_month"]),
+                    "total_students": build_card(totals["students_this_month"], totals["students_last_month"]),
+                    "total_schools":  build_card(totals["schools_this_month"],  totals["schools_last_month"]),
                     "total_courses":  build_card(courses_this_month,  courses_last_month),
                 },
                 status=status.HTTP_200_OK,
@@ -838,102 +794,15 @@ class SubscriptionExpiringSoonAPIView(APIView):
 # ═══════════════════════════════════════════════════════
 
 def onboarding_by_week() -> list:
-    """Last 7 days individually. Label: MON, TUE ... (actual weekday of each day)."""
-    today = timezone.now().date()
-
-    qs = (
-        School.objects
-        .filter(
-            is_deleted=False,
-            is_disabled=False,
-            created_at__date__gte=today - datetime.timedelta(days=6),
-            created_at__date__lte=today,
-        )
-        .annotate(day=TruncDay("created_at"))
-        .values("day")
-        .annotate(count=Count("id"))
-        .order_by("day")
-    )
-
-    lookup = {
-        (row["day"].date() if hasattr(row["day"], "date") else row["day"]): row["count"]
-        for row in qs
-    }
-
-    result = []
-    for i in range(6, -1, -1):
-        day = today - datetime.timedelta(days=i)
-        result.append({
-            "label": day.strftime("%a").upper(),
-            "count": lookup.get(day, 0),
-        })
-    return result
+    return week_series("schools_onboarded", "count")
 
 
 def onboarding_by_month() -> list:
-    """Every day of the current month. Label: 1, 2 ... 31."""
-    today       = timezone.now().date()
-    month_start = today.replace(day=1)
-
-    qs = (
-        School.objects
-        .filter(
-            is_deleted=False,
-            is_disabled=False,
-            created_at__date__gte=month_start,
-            created_at__date__lte=today,
-        )
-        .annotate(day=TruncDay("created_at"))
-        .values("day")
-        .annotate(count=Count("id"))
-        .order_by("day")
-    )
-
-    lookup = {
-        (row["day"].date() if hasattr(row["day"], "date") else row["day"]): row["count"]
-        for row in qs
-    }
-
-    result  = []
-    current = month_start
-    while current <= today:
-        result.append({
-            "label": str(current.day),
-            "count": lookup.get(current, 0),
-        })
-        current += datetime.timedelta(days=1)
-    return result
+    return month_series("schools_onboarded", "count")
 
 
 def onboarding_by_year() -> list:
-    """Jan → current month of this year. Label: JAN, FEB ..."""
-    today      = timezone.now().date()
-    year_start = today.replace(month=1, day=1)
-
-    qs = (
-        School.objects
-        .filter(
-            is_deleted=False,
-            is_disabled=False,
-            created_at__date__gte=year_start,
-            created_at__year=today.year,
-        )
-        .annotate(month=TruncMonth("created_at"))
-        .values("month")
-        .annotate(count=Count("id"))
-        .order_by("month")
-    )
-
-    lookup = {}
-    for row in qs:
-        m         = row["month"]
-        month_num = m.month if hasattr(m, "month") else m.date().month
-        lookup[month_num] = row["count"]
-
-    return [
-        {"label": MONTH_LABELS[m], "count": lookup.get(m, 0)}
-        for m in range(1, today.month + 1)
-    ]
+    return year_series("schools_onboarded", "count")
 
 
 def build_onboarding_summary(data: list) -> dict:
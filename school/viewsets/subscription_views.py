@@ -9,6 +9,7 @@ from rest_framework.decorators import action
 
 from school.models import Subscription, SubscriptionLog
 from user.models import School
+from user.authentication import get_user_school
 from school.serializers.subscriptions_serializers import (
     SubscriptionHistoryCreateSerializer,
     SubscriptionHistoryListSerializer,
@@ -60,7 +61,7 @@ class SubscriptionHistoryViewSet(viewsets.ViewSet):
         responses={201: SubscriptionHistoryListSerializer(), 400: "Bad Request"}
     )
     def create(self, request):
-        school = School.objects.filter(user=request.user).first()
+        school = get_user_school(request.user)
         if not school:
             return Response({"detail": "School not found for user."}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -0,0 +1,208 @@
+from collections import defaultdict
+
+from django.db.models import F
+
+from user.models import User
+from tasks.models import (
+    StudentSpeakingAttempt,
+    StudentReadingAttempt,
+    StudentListeningAttempt,
+    StudentWritingAttempt,
+    UserTaskProgress,
+)
+from utils.csv_export import EXPORT_CHUNK_SIZE, iter_chunks
+
+
+# -------------------------
+# Attempt sources
+# (payload key, model, activity FK, extra per-attempt fields)
+# -------------------------
+ATTEMPT_SOURCES = [
+    ("speaking_attempts",  StudentSpeakingAttempt,  "speaking_activity",  ["score", "feedback"]),
+    ("reading_attempts",   StudentReadingAttempt,   "reading_activity",   ["total_questions", "correct_answers", "score"]),
+    ("listening_attempts", StudentListeningAttempt, "listening_activity", ["total_questions", "correct_answers", "score"]),
+    ("writing_attempts",   StudentWritingAttempt,   "writing_activity",   ["score", "feedback"]),
+]
+
+
+def safe_avg(attempts):
+    scores = [a["score"] for a in attempts if a["score"] is not None]
+    return round(sum(scores) / len(scores), 2) if scores else None
+
+
+class SchoolExamReport:
+    """
+    Builds the per-student exam payload for a school with a fixed number of
+    grouped queries (one per attempt type plus one for task progress),
+    no matter how many students are on the page.
+    """
+
+    def __init__(self, school, grade=None, task_id=None, is_completed=None):
+        self.school = school
+        self.grade = grade
+        self.task_id = task_id
+        self.is_completed = is_completed
+
+    def students(self):
+        """
+        Distinct students linked to the school via SchoolStudentParent,
+        ordered by id so pages are stable.
+        """
+        qs = (
+            User.objects
+            .filter(student_school_relations__school=self.school)
+            .select_related("userprofile")
+            .distinct()
+            .order_by("id")
+        )
+        if self.grade:
+            qs = qs.filter(userprofile__grade=self.grade)
+        return qs
+
+    # -------------------------
+    # Grouped fetches
+    # -------------------------
+    def _attempts_by_student(self, model, activity_field, fields, student_ids):
+        qs = model.objects.filter(student_id__in=student_ids)
+
+        if self.task_id:
+            qs = qs.filter(**{f"{activity_field}__task_id": self.task_id})
+        if self.is_completed is not None:
+            qs = qs.filter(is_completed=self.is_completed)
+
+        rows = (
+            qs.order_by("student_id", "id")
+            .annotate(activity_title=F(f"{activity_field}__title"))
+            .values(
+                "id", "student_id", "activity_title", *fields,
+                "is_completed", "started_at", "completed_at",
+            )
+        )
+
+        grouped = defaultdict(list)
+        for row in rows:
+            attempt = {"attempt_id": row["id"], "activity_title": row["activity_title"]}
+            for field in fields:
+                attempt[field] = row[field]
+            attempt["is_completed"] = row["is_completed"]
+            attempt["started_at"] = row["started_at"]
+            attempt["completed_at"] = row["completed_at"]
+            grouped[row["student_id"]].append(attempt)
+        return grouped
+
+    def _progress_by_student(self, student_ids):
+        qs = UserTaskProgress.objects.filter(user_id__in=student_ids)
+        if self.task_id:
+            qs = qs.filter(task_id=self.task_id)
+
+        rows = qs.order_by("user_id", "id").values(
+            "user_id",
+            "task_id",
+            "task__name",
+            "task__grade",
+            "did_completed_speaking_activity",
+            "did_completed_reading_activity",
+            "did_completed_listening_activity",
+            "did_completed_writing_activity",
+            "last_updated",
+        )
+
+        grouped = defaultdict(list)
+        for p in rows:
+            grouped[p["user_id"]].append({
+                "task_id":             p["task_id"],
+                "task_name":           p["task__name"],
+                "task_grade":          p["task__grade"],
+                "completed_speaking":  p["did_completed_speaking_activity"],
+                "completed_reading":   p["did_completed_reading_activity"],
+                "completed_listening": p["did_completed_listening_activity"],
+                "completed_writing":   p["did_completed_writing_activity"],
+                "last_updated":        p["last_updated"],
+            })
+        return grouped
+
+    # -------------------------
+    # Payload
+    # -------------------------
+    def build(self, students):
+        """
+        Returns the exam payload for the given (already paginated) students.
+        """
+        students = list(students)
+        student_ids = [s.id for s in students]
+        if not student_ids:
+            return []
+
+        attempts = {
+            key: self._attempts_by_student(model, activity_field, fields, student_ids)
+            for key, model, activity_field, fields in ATTEMPT_SOURCES
+        }
+        progress = self._progress_by_student(student_ids)
+
+        students_data = []
+        for student_user in students:
+            profile = getattr(student_user, "userprofile", None)
+
+            speaking_attempts  = attempts["speaking_attempts"].get(student_user.id, [])
+            reading_attempts   = attempts["reading_attempts"].get(student_user.id, [])
+            listening_attempts = attempts["listening_attempts"].get(student_user.id, [])
+            writing_attempts   = attempts["writing_attempts"].get(student_user.id, [])
+
+            all_attempts = speaking_attempts + reading_attempts + listening_attempts + writing_attempts
+
+            students_data.append({
+                "student_id":         student_user.id,
+                "student_name":       student_user.name,
+                "email":              student_user.email,
+                "grade":              profile.grade    if profile else None,
+                "section":            profile.section  if profile else None,
+                "task_progress":      progress.get(student_user.id, []),
+                "speaking_attempts":  speaking_attempts,
+                "reading_attempts":   reading_attempts,
+                "listening_attempts": listening_attempts,
+                "writing_attempts":   writing_attempts,
+                "summary": {
+                    "avg_speaking_score":  safe_avg(speaking_attempts),
+                    "avg_reading_score":   safe_avg(reading_attempts),
+                    "avg_listening_score": safe_avg(listening_attempts),
+                    "avg_writing_score":   safe_avg(writing_attempts),
+                    "total_attempts":      len(all_attempts),
+                    "completed_attempts":  sum(1 for a in all_attempts if a["is_completed"]),
+                },
+            })
+
+        return students_data
+
+    # -------------------------
+    # Export
+    # -------------------------
+    EXPORT_HEADER = [
+        "student_id", "student_name", "email", "grade", "section",
+        "avg_speaking_score", "avg_reading_score", "avg_listening_score", "avg_writing_score",
+        "total_attempts", "completed_attempts", "tasks_started", "tasks_fully_completed",
+    ]
+
+    def export_rows(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        One CSV row per student. Students are read through a server-side
+        cursor and built ``chunk_size`` at a time, so memory stays flat
+        however large the school is.
+        """
+        students = self.students().iterator(chunk_size=chunk_size)
+        for chunk in iter_chunks(students, chunk_size):
+            for data in self.build(chunk):
+                summary = data["summary"]
+                progress = data["task_progress"]
+                yield [
+                    data["student_id"], data["student_name"], data["email"],
+                    data["grade"], data["section"],
+                    summary["avg_speaking_score"], summary["avg_reading_score"],
+                    summary["avg_listening_score"], summary["avg_writing_score"],
+                    summary["total_attempts"], summary["completed_attempts"],
+                    len(progress),
+                    sum(
+                        1 for p in progress
+                        if p["completed_speaking"] and p["completed_reading"]
+                        and p["completed_listening"] and p["completed_writing"]
+                    ),
+                ]
@@ -0,0 +1,91 @@
+from django.db import connections
+from django.db.models import Q, Window
+from django.db.models.functions import RowNumber
+
+from student.models import StudentScoreSummary
+from user.models import SchoolStudentParent
+from utils.search import search_queryset
+
+
+# -------------------------
+# Rank order
+# Highest average first, more completed attempts break ties, then the
+# older account. Matches student_score_rank_idx.
+# -------------------------
+RANK_ORDER = ("-average_score", "-completed_attempts", "student_id")
+
+
+class Leaderboard:
+    """
+    Ranked StudentScoreSummary rows, optionally narrowed to one school
+    and/or grade. Ranks are always relative to that school/grade
+    partition; ``search`` only narrows which ranked rows are listed.
+    """
+
+    def __init__(self, school_id=None, grade=None, search=None):
+        self.school_id = school_id
+        self.grade = grade
+        self.search = search
+
+    def ranked(self):
+        qs = StudentScoreSummary.objects.filter(student__userprofile__user_type="student")
+
+        if self.school_id:
+            # Semi-join: a student has one relation row per parent
+            qs = qs.filter(student_id__in=SchoolStudentParent.objects.filter(
+                school_id=self.school_id
+            ).values("student_id"))
+
+        if self.grade:
+            qs = qs.filter(student__userprofile__grade__iexact=self.grade)
+
+        return qs.order_by(*RANK_ORDER)
+
+    def listing(self):
+        qs = self.ranked().select_related("student__userprofile")
+        if self.search:
+            # Keeps the rank order; the trigram indexes do the matching
+            qs = search_queryset(qs, self.search, ["student__name", "student__email"], rank=False)
+        return qs
+
+    def rank_of(self, summary):
+        ahead = self.ranked().filter(
+            Q(average_score__gt=summary.average_score) |
+            Q(average_score=summary.average_score, completed_attempts__gt=summary.completed_attempts) |
+            Q(
+                average_score=summary.average_score,
+                completed_attempts=summary.completed_attempts,
+                student_id__lt=summary.student_id,
+            )
+        )
+        return ahead.count() + 1
+
+    def ranks_of(self, student_ids):
+        """
+        Rank per student id for ``student_ids``, from one numbering of the
+        whole partition. The ids are filtered outside the numbered
+        subquery, so they don't change the numbers.
+        """
+        student_ids = list(student_ids)
+        if not student_ids:
+            return {}
+        numbered = (
+            self.ranked()
+            .annotate(rank=Window(RowNumber(), order_by=list(RANK_ORDER)))
+            .values("student_id", "rank")
+        )
+        sql, params = numbered.query.sql_with_params()
+        placeholders = ", ".join(["%s"] * len(student_ids))
+        with connections[numbered.db].cursor() as cursor:
+            cursor.execute(
+                f"SELECT student_id, rank FROM ({sql}) ranked WHERE student_id IN ({placeholders})",
+                [*params, *student_ids],
+            )
+            return dict(cursor.fetchall())
+
+    def ranks_for_page(self, summaries, offset):
+        """Rank per student id for one page of ``listing()``."""
+        if not self.search:
+            return {s.student_id: offset + i + 1 for i, s in enumerate(summaries)}
+        # Search leaves gaps in the order: look the page's ranks up
+        return self.ranks_of(s.student_id for s in summaries)
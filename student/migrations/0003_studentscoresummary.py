@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_scores(apps, schema_editor):
+    StudentScoreSummary = apps.get_model('student', 'StudentScoreSummary')
+
+    totals = {}
+    for model_name in ('StudentSpeakingAttempt', 'StudentReadingAttempt',
+                       'StudentListeningAttempt', 'StudentWritingAttempt'):
+        rows = (
+            apps.get_model('tasks', model_name).objects
+            .filter(is_completed=True, score__isnull=False)
+            .values('student_id')
+            .annotate(total=models.Sum('score'), count=models.Count('id'))
+        )
+        for row in rows:
+            total, count = totals.get(row['student_id'], (0.0, 0))
+            totals[row['student_id']] = (total + row['total'], count + row['count'])
+
+    StudentScoreSummary.objects.bulk_create([
+        StudentScoreSummary(
+            student_id=student_id,
+            average_score=round(total / count, 2),
+            total_score=total,
+            completed_attempts=count,
+        )
+        for student_id, (total, count) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0002_alter_studentattempts_activity_type'),
+        ('tasks', '0016_alter_listeningactivityquestion_answer_1_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentScoreSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('average_score', models.FloatField(default=0)),
+                ('total_score', models.FloatField(default=0)),
+                ('completed_attempts', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-average_score', '-completed_attempts', 'student'], name='student_score_rank_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -3,7 +3,13 @@ from django.db import models
 # Create your models here.
 from django.utils import timezone
 from django.conf import settings
-from tasks.models import Task
+from tasks.models import (
+    Task,
+    StudentSpeakingAttempt,
+    StudentReadingAttempt,
+    StudentListeningAttempt,
+    StudentWritingAttempt,
+)
 # Choices for activity_type field
 ACTIVITY_CHOICES = [
     ('speaking_activity', 'Speaking Activity'),
@@ -25,7 +31,62 @@ class StudentAttempts(models.Model):
 
     def __str__(self):
         return f"Attempt by {self.student} on {self.task} - {self.activity_type}"
-    
-    
-    
-    
+
+
+# Attempt models whose completed scores feed the leaderboard
+SCORED_ATTEMPT_MODELS = (
+    StudentSpeakingAttempt,
+    StudentReadingAttempt,
+    StudentListeningAttempt,
+    StudentWritingAttempt,
+)
+
+
+class StudentScoreSummary(models.Model):
+    """
+    Completed-attempt totals per student across the four Student*Attempt
+    models, kept current by student.signals. TopStudentViewSet ranks on
+    this table instead of aggregating attempts per request.
+    """
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="score_summary"
+    )
+    average_score = models.FloatField(default=0)
+    total_score = models.FloatField(default=0)
+    completed_attempts = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-average_score", "-completed_attempts", "student"],
+                name="student_score_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student}: {self.average_score} over {self.completed_attempts} attempts"
+
+    @classmethod
+    def refresh(cls, student_id):
+        """Re-totals one student's completed attempts; drops the row when none are left."""
+        total_score, completed = 0.0, 0
+        for model in SCORED_ATTEMPT_MODELS:
+            row = model.objects.filter(
+                student_id=student_id, is_completed=True, score__isnull=False
+            ).aggregate(total=models.Sum("score"), count=models.Count("id"))
+            total_score += row["total"] or 0
+            completed += row["count"]
+
+        if not completed:
+            cls.objects.filter(student_id=student_id).delete()
+            return
+
+        cls.objects.update_or_create(
+            student_id=student_id,
+            defaults={
+                "average_score": round(total_score / completed, 2),
+                "total_score": total_score,
+                "completed_attempts": completed,
+            },
+        )
@@ -21,3 +21,16 @@ class StudentSerializer(serializers.ModelSerializer):
                 return build_https_url(request,obj.userprofile.profile_picture.url)
             return obj.userprofile.profile_picture.url
         return None
+
+
+class TopStudentSerializer(StudentSerializer):
+    rank = serializers.SerializerMethodField()
+    average_score = serializers.FloatField(source='score_summary.average_score', read_only=True)
+    total_score = serializers.FloatField(source='score_summary.total_score', read_only=True)
+    completed_attempts = serializers.IntegerField(source='score_summary.completed_attempts', read_only=True)
+
+    class Meta(StudentSerializer.Meta):
+        fields = StudentSerializer.Meta.fields + ['rank', 'average_score', 'total_score', 'completed_attempts']
+
+    def get_rank(self, obj):
+        return self.context.get('ranks', {}).get(obj.id)
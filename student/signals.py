@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+
+from student.models import SCORED_ATTEMPT_MODELS, StudentScoreSummary
+from utils.transactions import defer_on_commit
+
+
+# ------------------------------
+# StudentScoreSummary maintenance
+# Students whose attempts changed inside a transaction are re-totalled
+# once, on commit.
+# ------------------------------
+
+def _refresh_scores(student_ids):
+    for student_id in student_ids:
+        StudentScoreSummary.refresh(student_id)
+
+
+def schedule_score_refresh(*student_ids):
+    defer_on_commit("student_scores", student_ids, _refresh_scores)
+
+
+def attempt_post_save(sender, instance, raw=False, **kwargs):
+    # In-progress attempts don't count; every save of a completed one
+    # may carry a new score (grading, regrading).
+    if not raw and instance.is_completed:
+        schedule_score_refresh(instance.student_id)
+
+
+def attempt_post_delete(sender, instance, **kwargs):
+    if instance.is_completed:
+        schedule_score_refresh(instance.student_id)
+
+
+for model in SCORED_ATTEMPT_MODELS:
+    post_save.connect(attempt_post_save, sender=model)
+    post_delete.connect(attempt_post_delete, sender=model)
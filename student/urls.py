@@ -2,7 +2,7 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 from student.viewsets.studentattempts_views import StudentAttemptsViewSet
 from student.viewsets.adminschoolviews import SchoolBasicViewSet
-from student.viewsets.adminstudent_views import SchoolStudentExamDataAPIView
+from student.viewsets.adminstudent_views import SchoolStudentExamDataAPIView, SchoolStudentExamDataExportAPIView
 from student.viewsets.admintopstudent_views import TopStudentViewSet
 
 router = DefaultRouter()
@@ -12,6 +12,7 @@ router.register(r'top-students', TopStudentViewSet, basename='topstudent')
 
 urlpatterns = [
     path("admin/school/exam-data/", SchoolStudentExamDataAPIView.as_view(), name="school-exam-data"),
+    path("admin/school/exam-data/export/", SchoolStudentExamDataExportAPIView.as_view(), name="school-exam-data-export"),
 ]
 
 urlpatterns += router.urls
\ No newline at end of file
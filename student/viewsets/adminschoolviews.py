@@ -3,10 +3,10 @@ from rest_framework.response import Response
 from utils.permissions import IsAdminUserType
 from user.models import School
 from user.serializers.school_serializers import SchoolBasicSerializer
-from django.db.models import Q  
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from utils.decorators import has_permission
+from utils.search import search_queryset
 class SchoolBasicViewSet(viewsets.ViewSet):
     permission_classes = [IsAdminUserType]
     search_param = openapi.Parameter(
@@ -24,13 +24,10 @@ class SchoolBasicViewSet(viewsets.ViewSet):
         search_query = request.query_params.get('search', '').strip()
 
         if search_query:
-            schools = schools = School.objects.select_related('district','province','country')(
-                Q(name__icontains=search_query) |
-                Q(district__name__icontains=search_query) |
-                Q(country__name__icontains=search_query) |
-                Q(province__name__icontains=search_query) |
-                Q(address__icontains=search_query) |
-                Q(city__icontains=search_query)
+            schools = search_queryset(
+                School.objects.select_related('district','province','country'),
+                search_query,
+                ["name", "district__name", "country__name", "province__name", "address", "city"]
             )
         else:
             schools = School.objects.all()
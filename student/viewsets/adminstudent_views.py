@@ -1,18 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from user.models import UserProfile, School, SchoolStudentParent
-from tasks.models import (
-    StudentSpeakingAttempt,
-    StudentReadingAttempt,
-    StudentListeningAttempt,
-    StudentWritingAttempt,
-    UserTaskProgress,
-)
+from user.models import School
+from student.exam_report import SchoolExamReport
+from utils.paginator import CustomPageNumberPagination
+from utils.permissions import IsAdminUserType
+from utils.csv_export import streaming_csv_response
 
 
 # -------------------------
@@ -26,6 +24,16 @@ school_exam_data_response = openapi.Response(
             "school_id": openapi.Schema(type=openapi.TYPE_INTEGER, example=3),
             "school_name": openapi.Schema(type=openapi.TYPE_STRING, example="Springfield High"),
             "total_students": openapi.Schema(type=openapi.TYPE_INTEGER, example=42),
+            "links": openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "next": openapi.Schema(type=openapi.TYPE_STRING),
+                    "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                },
+            ),
+            "page_size": openapi.Schema(type=openapi.TYPE_INTEGER, example=16),
+            "total_pages": openapi.Schema(type=openapi.TYPE_INTEGER, example=3),
+            "current_page": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
             "students": openapi.Schema(
                 type=openapi.TYPE_ARRAY,
                 items=openapi.Schema(
@@ -133,7 +141,65 @@ school_exam_data_response = openapi.Response(
 )
 
 
+# -------------------------
+# Shared query-param handling
+# -------------------------
+def exam_report_from_request(request):
+    """
+    Validates school_id / grade / task_id / is_completed and returns a
+    SchoolExamReport, or an error Response.
+    """
+    school_id = request.query_params.get("school_id")
+    if not school_id:
+        return Response(
+            {"error": "school_id is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        school_id = int(school_id)
+    except ValueError:
+        return Response(
+            {"error": "school_id must be a valid integer"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    grade_filter        = request.query_params.get("grade")
+    task_id_filter      = request.query_params.get("task_id")
+    is_completed_filter = request.query_params.get("is_completed")
+
+    # -------------------------
+    # Validate School
+    # -------------------------
+    school = School.objects.filter(id=school_id, is_deleted=False, is_disabled=False).first()
+    if not school:
+        return Response(
+            {"error": "School not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    # -------------------------
+    # Build completed filter flag
+    # -------------------------
+    completed_flag = None
+    if is_completed_filter is not None:
+        completed_flag = is_completed_filter.lower() == "true"
+
+    # -------------------------
+    # Students are resolved via SchoolStudentParent; attempts and
+    # progress are loaded with one grouped query per source.
+    # -------------------------
+    return SchoolExamReport(
+        school,
+        grade=grade_filter,
+        task_id=task_id_filter,
+        is_completed=completed_flag,
+    )
+
+
 class SchoolStudentExamDataAPIView(APIView):
+    # The response is built from the page number paginator
+    allow_cursor_pagination = False
 
     @swagger_auto_schema(
         operation_id="get_school_student_exam_data",
@@ -147,7 +213,8 @@ class SchoolStudentExamDataAPIView(APIView):
             "- **Writing** — score, feedback, completion status\n\n"
             "Also includes each student's **task progress flags** and a **summary** of averages.\n\n"
             "**Note:** Students are resolved via the `SchoolStudentParent` junction table "
-            "using the provided `school_id`."
+            "using the provided `school_id`; results are paginated over students "
+            "(`page`, `page_size`)."
         ),
         tags=["School Exam Data"],
         manual_parameters=[
@@ -183,6 +250,22 @@ class SchoolStudentExamDataAPIView(APIView):
                 description="Filter attempts by completion status (true / false)",
                 example=True,
             ),
+            openapi.Parameter(
+                name="page",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Page number over students",
+                example=1,
+            ),
+            openapi.Parameter(
+                name="page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Students per page (max 100)",
+                example=16,
+            ),
         ],
         responses={
             200: school_exam_data_response,
@@ -213,242 +296,60 @@ class SchoolStudentExamDataAPIView(APIView):
         },
     )
     def get(self, request):
+        report = exam_report_from_request(request)
+        if isinstance(report, Response):
+            return report
+        school = report.school
 
-        # -------------------------
-        # Validate Params
-        # -------------------------
-        school_id = request.query_params.get("school_id")
-        if not school_id:
-            return Response(
-                {"error": "school_id is required"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            school_id = int(school_id)
-        except ValueError:
-            return Response(
-                {"error": "school_id must be a valid integer"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        grade_filter        = request.query_params.get("grade")
-        task_id_filter      = request.query_params.get("task_id")
-        is_completed_filter = request.query_params.get("is_completed")
-
-        # -------------------------
-        # Validate School
-        # -------------------------
-        school = School.objects.filter(id=school_id, is_deleted=False, is_disabled=False).first()
-        if not school:
-            return Response(
-                {"error": "School not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # -------------------------
-        # Resolve Students via SchoolStudentParent
-        # SchoolStudentParent is the real junction table linking
-        # students → school. We get distinct student User objects from it.
-        # -------------------------
-        school_student_relations = (
-            SchoolStudentParent.objects
-            .filter(school=school)
-            .select_related(
-                "student",                  # the User object
-                "student__userprofile",     # their profile (grade, section, etc.)
-            )
-            .distinct("student")            # one row per student regardless of parent count
-        )
-
-        # Apply grade filter through the related UserProfile
-        if grade_filter:
-            school_student_relations = school_student_relations.filter(
-                student__userprofile__grade=grade_filter
-            )
-
-        # -------------------------
-        # Build completed filter flag
-        # -------------------------
-        completed_flag = None
-        if is_completed_filter is not None:
-            completed_flag = is_completed_filter.lower() == "true"
-
-        # -------------------------
-        # Helper
-        # -------------------------
-        def safe_avg(attempts):
-            scores = [a["score"] for a in attempts if a["score"] is not None]
-            return round(sum(scores) / len(scores), 2) if scores else None
-
-        # -------------------------
-        # Build Per-Student Exam Data
-        # -------------------------
-        students_data = []
-
-        for relation in school_student_relations:
-            student_user = relation.student
-
-            # Safely access profile (guard against missing OneToOne)
-            profile = getattr(student_user, "userprofile", None)
-
-            # --- Speaking Attempts ---
-            speaking_qs = StudentSpeakingAttempt.objects.filter(
-                student=student_user
-            ).select_related("speaking_activity")
-
-            if task_id_filter:
-                speaking_qs = speaking_qs.filter(speaking_activity__task_id=task_id_filter)
-            if completed_flag is not None:
-                speaking_qs = speaking_qs.filter(is_completed=completed_flag)
-
-            speaking_attempts = [
-                {
-                    "attempt_id":     a.id,
-                    "activity_title": a.speaking_activity.title,
-                    "score":          a.score,
-                    "feedback":       a.feedback,
-                    "is_completed":   a.is_completed,
-                    "started_at":     a.started_at,
-                    "completed_at":   a.completed_at,
-                }
-                for a in speaking_qs
-            ]
-
-            # --- Reading Attempts ---
-            reading_qs = StudentReadingAttempt.objects.filter(
-                student=student_user
-            ).select_related("reading_activity")
-
-            if task_id_filter:
-                reading_qs = reading_qs.filter(reading_activity__task_id=task_id_filter)
-            if completed_flag is not None:
-                reading_qs = reading_qs.filter(is_completed=completed_flag)
-
-            reading_attempts = [
-                {
-                    "attempt_id":      a.id,
-                    "activity_title":  a.reading_activity.title,
-                    "total_questions": a.total_questions,
-                    "correct_answers": a.correct_answers,
-                    "score":           a.score,
-                    "is_completed":    a.is_completed,
-                    "started_at":      a.started_at,
-                    "completed_at":    a.completed_at,
-                }
-                for a in reading_qs
-            ]
-
-            # --- Listening Attempts ---
-            listening_qs = StudentListeningAttempt.objects.filter(
-                student=student_user
-            ).select_related("listening_activity")
-
-            if task_id_filter:
-                listening_qs = listening_qs.filter(listening_activity__task_id=task_id_filter)
-            if completed_flag is not None:
-                listening_qs = listening_qs.filter(is_completed=completed_flag)
-
-            listening_attempts = [
-                {
-                    "attempt_id":      a.id,
-                    "activity_title":  a.listening_activity.title,
-                    "total_questions": a.total_questions,
-                    "correct_answers": a.correct_answers,
-                    "score":           a.score,
-                    "is_completed":    a.is_completed,
-                    "started_at":      a.started_at,
-                    "completed_at":    a.completed_at,
-                }
-                for a in listening_qs
-            ]
-
-            # --- Writing Attempts ---
-            writing_qs = StudentWritingAttempt.objects.filter(
-                student=student_user
-            ).select_related("writing_activity")
-
-            if task_id_filter:
-                writing_qs = writing_qs.filter(writing_activity__task_id=task_id_filter)
-            if completed_flag is not None:
-                writing_qs = writing_qs.filter(is_completed=completed_flag)
-
-            writing_attempts = [
-                {
-                    "attempt_id":     a.id,
-                    "activity_title": a.writing_activity.title,
-                    "score":          a.score,
-                    "feedback":       a.feedback,
-                    "is_completed":   a.is_completed,
-                    "started_at":     a.started_at,
-                    "completed_at":   a.completed_at,
-                }
-                for a in writing_qs
-            ]
-
-            # --- Task Progress ---
-            progress_qs = UserTaskProgress.objects.filter(
-                user_id=student_user.id
-            ).select_related("task")
-
-            if task_id_filter:
-                progress_qs = progress_qs.filter(task_id=task_id_filter)
-
-            task_progress = [
-                {
-                    "task_id":             p.task.id,
-                    "task_name":           p.task.name,
-                    "task_grade":          p.task.grade,
-                    "completed_speaking":  p.did_completed_speaking_activity,
-                    "completed_reading":   p.did_completed_reading_activity,
-                    "completed_listening": p.did_completed_listening_activity,
-                    "completed_writing":   p.did_completed_writing_activity,
-                    "last_updated":        p.last_updated,
-                }
-                for p in progress_qs
-            ]
-
-            # --- Summary Aggregates ---
-            all_attempts = (
-                len(speaking_attempts) +
-                len(reading_attempts) +
-                len(listening_attempts) +
-                len(writing_attempts)
-            )
-            completed_attempts = sum([
-                sum(1 for a in speaking_attempts  if a["is_completed"]),
-                sum(1 for a in reading_attempts   if a["is_completed"]),
-                sum(1 for a in listening_attempts if a["is_completed"]),
-                sum(1 for a in writing_attempts   if a["is_completed"]),
-            ])
-
-            students_data.append({
-                "student_id":         student_user.id,
-                "student_name":       student_user.name,
-                "email":              student_user.email,
-                "grade":              profile.grade    if profile else None,
-                "section":            profile.section  if profile else None,
-                "task_progress":      task_progress,
-                "speaking_attempts":  speaking_attempts,
-                "reading_attempts":   reading_attempts,
-                "listening_attempts": listening_attempts,
-                "writing_attempts":   writing_attempts,
-                "summary": {
-                    "avg_speaking_score":  safe_avg(speaking_attempts),
-                    "avg_reading_score":   safe_avg(reading_attempts),
-                    "avg_listening_score": safe_avg(listening_attempts),
-                    "avg_writing_score":   safe_avg(writing_attempts),
-                    "total_attempts":      all_attempts,
-                    "completed_attempts":  completed_attempts,
-                },
-            })
+        paginator = CustomPageNumberPagination()
+        page = paginator.paginate_queryset(report.students(), request, view=self)
+        students_data = report.build(page)
 
         return Response(
             {
                 "school_id":      school.id,
                 "school_name":    school.name,
-                "total_students": len(students_data),
+                "total_students": paginator.page.paginator.count,
+                "links": {
+                    "next":     paginator._force_https(paginator.get_next_link()),
+                    "previous": paginator._force_https(paginator.get_previous_link()),
+                },
+                "page_size":      paginator.get_page_size(request),
+                "total_pages":    paginator.page.paginator.num_pages,
+                "current_page":   paginator.page.number,
                 "students":       students_data,
             },
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+
+class SchoolStudentExamDataExportAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserType]
+
+    @swagger_auto_schema(
+        operation_id="export_school_student_exam_data",
+        operation_summary="Export School Student Exam Data (CSV)",
+        operation_description=(
+            "Streams one CSV row per student of the school with their average "
+            "score per activity type, attempt counts and task completion.\n\n"
+            "Takes the same filters as the exam data endpoint, without pagination."
+        ),
+        tags=["School Exam Data"],
+        manual_parameters=[
+            openapi.Parameter("school_id", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=True),
+            openapi.Parameter("grade", openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter("task_id", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter("is_completed", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, required=False),
+        ],
+        responses={200: "text/csv", 400: "Missing or invalid school_id", 404: "School not found"},
+    )
+    def get(self, request):
+        report = exam_report_from_request(request)
+        if isinstance(report, Response):
+            return report
+
+        return streaming_csv_response(
+            f"school-{report.school.id}-exam-data.csv",
+            SchoolExamReport.EXPORT_HEADER,
+            report.export_rows(),
+        )
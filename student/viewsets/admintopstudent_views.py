@@ -1,15 +1,19 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-from user.models import User
-from student.serializers.admin_student_serializers import StudentSerializer
+from student.leaderboard import Leaderboard
+from student.models import StudentScoreSummary
+from student.serializers.admin_student_serializers import TopStudentSerializer
+from utils.paginator import CustomPageNumberPagination
 from utils.permissions import IsAdminUserType
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from utils.decorators import has_permission
 class TopStudentViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated, IsAdminUserType]
+    # Ranks are computed from the page number
+    allow_cursor_pagination = False
     school_param = openapi.Parameter(
         'school_id', openapi.IN_QUERY,
         description="Filter top students by school ID",
@@ -25,42 +29,69 @@ class TopStudentViewSet(viewsets.ViewSet):
         description="Search top students by name or email",
         type=openapi.TYPE_STRING
     )
+    page_param = openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER)
+    page_size_param = openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER)
+
+    def get_leaderboard(self, request, with_search=True):
+        return Leaderboard(
+            school_id=request.query_params.get('school_id'),
+            grade=request.query_params.get('grade'),
+            search=request.query_params.get('search', '').strip() if with_search else None,
+        )
+
     @has_permission("can_read_topstudent")
     @swagger_auto_schema(
-        manual_parameters=[school_param, grade_param, search_param],
-        responses={200: StudentSerializer(many=True)}
+        operation_description=(
+            "Students with at least one completed attempt, best average score first. "
+            "`rank` is the position within the school/grade filter."
+        ),
+        manual_parameters=[school_param, grade_param, search_param, page_param, page_size_param],
+        responses={200: TopStudentSerializer(many=True)}
     )
 
     def list(self, request):
-        school_id = request.query_params.get('school_id')
-        grade = request.query_params.get('grade')
-        search_query = request.query_params.get('search', '').strip()
+        leaderboard = self.get_leaderboard(request)
 
-        students_qs = (
-            User.objects
-            .filter(userprofile__user_type='student')
-            .select_related('userprofile')
-            .prefetch_related('student_school_relations__school')
-            .distinct()
-        )
+        paginator = CustomPageNumberPagination()
+        page = paginator.paginate_queryset(leaderboard.listing(), request, view=self)
+        offset = (paginator.page.number - 1) * paginator.page.paginator.per_page
 
-        if school_id:
-            students_qs = students_qs.filter(
-                student_school_relations__school_id=school_id
-            )
+        serializer = TopStudentSerializer(
+            [summary.student for summary in page],
+            many=True,
+            context={'request': request, 'ranks': leaderboard.ranks_for_page(page, offset)},
+        )
+        return paginator.get_paginated_response(serializer.data)
 
-        if grade:
-            students_qs = students_qs.filter(
-                userprofile__grade__iexact=grade
+    @has_permission("can_read_topstudent")
+    @swagger_auto_schema(
+        operation_description="Rank of one student within the school/grade filter.",
+        manual_parameters=[school_param, grade_param],
+        responses={200: TopStudentSerializer(), 404: "Student has no completed attempts"}
+    )
+    @action(detail=True, methods=['get'])
+    def rank(self, request, pk=None):
+        summary = (
+            StudentScoreSummary.objects
+            .select_related('student__userprofile')
+            .filter(student_id=pk)
+            .first()
+        )
+        if summary is None:
+            return Response(
+                {"detail": "Student has no completed attempts."},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-        if search_query:
-            students_qs = students_qs.filter(
-                Q(name__icontains=search_query) |
-                Q(email__icontains=search_query)
+        leaderboard = self.get_leaderboard(request, with_search=False)
+        if not leaderboard.ranked().filter(pk=summary.pk).exists():
+            return Response(
+                {"detail": "Student is not ranked for this school/grade."},
+                status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = StudentSerializer(
-            students_qs, many=True, context={'request': request}
+        serializer = TopStudentSerializer(
+            summary.student,
+            context={'request': request, 'ranks': {summary.student_id: leaderboard.rank_of(summary)}},
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
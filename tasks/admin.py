@@ -19,7 +19,8 @@ from .models import (
     StudentListeningAnswer,
     StudentWritingAttempt,
     StudentWritingAnswer,
-    UserTaskProgress
+    UserTaskProgress,
+    RegradeJob
 )
 
 # ----------------------
@@ -219,4 +220,18 @@ class UserTaskProgressAdmin(admin.ModelAdmin):
         'did_completed_writing_activity',
         'task'
     ]
-    search_fields = ['user_id', 'task__name']
\ No newline at end of file
+    search_fields = ['user_id', 'task__name']
+
+# ----------------------
+# Regrade Job Admin
+# ----------------------
+@admin.register(RegradeJob)
+class RegradeJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'kind', 'status',
+        'regraded_answers', 'total_answers',
+        'rescored_attempts', 'total_attempts',
+        'created_at', 'finished_at'
+    ]
+    list_filter = ['kind', 'status']
+    readonly_fields = [field.name for field in RegradeJob._meta.fields]
@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from tasks.models import ReadingAcitivityQuestion, ListeningActivityQuestion, AttemptResultSnapshot
+
+
+# -----------------------------
+# Answer keys
+# Per-activity map of question id -> grading data, built once from the
+# question bank and kept in CACHES['default'] until a question changes.
+# -----------------------------
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+
+def normalise_answer(value):
+    return (value or "").strip().lower()
+
+
+def _cache_key(kind, activity_id):
+    return f"answer_key:{kind}:{activity_id}"
+
+
+def _options(q):
+    return [q.answer_1, q.answer_2, q.answer_3, q.answer_4]
+
+
+def _build_reading_answer_key(reading_activity_id):
+    questions = ReadingAcitivityQuestion.objects.filter(
+        reading_activity_id=reading_activity_id
+    ).order_by("id")
+
+    return {
+        q.id: {
+            "question": q.question,
+            "type": q.type,
+            "instruction": q.instruction,
+            "options": _options(q),
+            "correct_answer": q.is_correct_answer,
+            "answer": normalise_answer(q.is_correct_answer),
+        }
+        for q in questions
+    }
+
+
+def _build_listening_answer_key(listening_activity_id):
+    questions = ListeningActivityQuestion.objects.filter(
+        listening_activity_part__listening_activity_id=listening_activity_id
+    ).select_related("listening_activity_part").order_by("id")
+
+    answer_key = {}
+    for q in questions:
+        part = q.listening_activity_part
+        answer_key[q.id] = {
+            "question": q.question,
+            "type": q.question_type,
+            "bundle_id": str(q.bundle_id),
+            "options": _options(q),
+            "correct_answer": q.is_correct_answer,
+            "answer": normalise_answer(q.is_correct_answer),
+            "part": part.part,
+            "part_audio": part.audio_file.url if part.audio_file else None,
+        }
+    return answer_key
+
+
+def _get_answer_key(kind, activity_id, builder):
+    key = _cache_key(kind, activity_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = builder(activity_id)
+        cache.set(key, answer_key, ANSWER_KEY_TIMEOUT)
+    return answer_key
+
+
+def get_reading_answer_key(reading_activity_id):
+    return _get_answer_key("reading", reading_activity_id, _build_reading_answer_key)
+
+
+def get_listening_answer_key(listening_activity_id):
+    return _get_answer_key("listening", listening_activity_id, _build_listening_answer_key)
+
+
+def _invalidate(kind, *activity_ids):
+    keys = [_cache_key(kind, activity_id) for activity_id in set(activity_ids) if activity_id]
+    if keys:
+        # Drop after commit so a concurrent reader can't re-cache old rows
+        transaction.on_commit(lambda: cache.delete_many(keys))
+        # Result snapshots show the questions and correct answers too
+        AttemptResultSnapshot.invalidate(kind, activity_ids=activity_ids)
+
+
+def invalidate_reading_answer_key(*reading_activity_ids):
+    _invalidate("reading", *reading_activity_ids)
+
+
+def invalidate_listening_answer_key(*listening_activity_ids):
+    _invalidate("listening", *listening_activity_ids)
@@ -0,0 +1,227 @@
+import json
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from django_redis import get_redis_connection
+
+from tasks.answer_keys import get_reading_answer_key, get_listening_answer_key
+from tasks.models import (
+    StudentReadingAttempt, StudentReadingAnswer,
+    StudentListeningAttempt, StudentListeningAnswer,
+)
+from tasks.submissions import save_objective_answer_batch
+
+
+# -----------------------------
+# Write-behind answer queue
+# With settings.ANSWER_WRITE_BEHIND on, reading/listening submit-answer
+# only appends the submission to a Redis stream (on the CACHES['default']
+# server) and answers 202; drain_answer_stream() writes the stream into
+# the answer tables in large batches. Entries are acked and deleted only
+# after their batch commits, so a crashed drain leaves them pending for
+# the next one to claim.
+#
+# Each attempt also has a pending counter, so complete can flush exactly
+# the submissions it is waiting for before scoring.
+#
+# An entry that can't be applied (unreadable, or failing on its own
+# when the batch is retried entry by entry) is moved to DEAD_LETTER_KEY
+# with the error instead of blocking every batch after it. Database
+# outages are not the entry's fault: they fail the drain and the batch
+# is retried as a whole.
+# -----------------------------
+STREAM_KEY = "answer_submissions"
+DEAD_LETTER_KEY = "answer_submissions:dead"
+DEAD_LETTER_MAXLEN = 10000
+GROUP_NAME = "answer_writers"
+BATCH_SIZE = 500
+# Entries a drain read but never acked are taken over after this long
+CLAIM_IDLE_MS = 60 * 1000
+FLUSH_TIMEOUT = 10
+PENDING_TIMEOUT = 60 * 60 * 24
+
+ANSWER_KINDS = {
+    "reading": (
+        StudentReadingAttempt, StudentReadingAnswer,
+        lambda attempt: get_reading_answer_key(attempt.reading_activity_id),
+    ),
+    "listening": (
+        StudentListeningAttempt, StudentListeningAnswer,
+        lambda attempt: get_listening_answer_key(attempt.listening_activity_id),
+    ),
+}
+
+
+def write_behind_enabled():
+    return getattr(settings, "ANSWER_WRITE_BEHIND", False)
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _pending_key(kind, attempt_id):
+    return f"answer_pending:{kind}:{attempt_id}"
+
+
+def _consumer_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ensure_group(client):
+    try:
+        client.xgroup_create(STREAM_KEY, GROUP_NAME, id="0", mkstream=True)
+    except Exception as exc:
+        # Group already exists
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def enqueue_answers(kind, attempt_id, answers):
+    """Appends one submit-answer payload to the stream."""
+    client = _redis()
+    pending_key = _pending_key(kind, attempt_id)
+
+    pipe = client.pipeline()
+    pipe.incr(pending_key)
+    pipe.expire(pending_key, PENDING_TIMEOUT)
+    pipe.xadd(STREAM_KEY, {
+        "kind": kind,
+        "attempt_id": attempt_id,
+        "answers": json.dumps(answers),
+    })
+    pipe.execute()
+
+
+def _decode(fields):
+    fields = {key.decode(): value.decode() for key, value in fields.items()}
+    kind, answers = fields["kind"], json.loads(fields["answers"])
+    if kind not in ANSWER_KINDS or not isinstance(answers, list):
+        raise ValueError(f"Not a {'/'.join(ANSWER_KINDS)} answers entry")
+    return kind, int(fields["attempt_id"]), answers
+
+
+def _read_batch(client, consumer, count):
+    # Entries abandoned by a crashed drain go first, to keep arrival order
+    _, entries, *_ = client.xautoclaim(
+        STREAM_KEY, GROUP_NAME, consumer, CLAIM_IDLE_MS, count=count
+    )
+    if entries:
+        return entries
+
+    response = client.xreadgroup(GROUP_NAME, consumer, {STREAM_KEY: ">"}, count=count)
+    return response[0][1] if response else []
+
+
+def _save(kind, submissions):
+    attempt_model, answer_model, answer_key_for = ANSWER_KINDS[kind]
+    save_objective_answer_batch(attempt_model, answer_model, submissions, answer_key_for)
+
+
+def _save_or_isolate(kind, submissions):
+    """
+    Saves ``submissions``; if the batch fails, saves them one by one.
+    Returns [(stream_id, error)] for the ones that can't be saved.
+    """
+    try:
+        _save(kind, submissions)
+        return []
+    except (OperationalError, InterfaceError):
+        raise
+    except Exception as exc:
+        if len(submissions) == 1:
+            return [(submissions[0][0], exc)]
+
+    failed = []
+    for submission in submissions:
+        try:
+            _save(kind, [submission])
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception as exc:
+            failed.append((submission[0], exc))
+    return failed
+
+
+def drain_batch(client=None, consumer=None, count=BATCH_SIZE):
+    """
+    Writes up to ``count`` queued submissions to the database.
+    Returns how many stream entries were processed.
+    """
+    client = client or _redis()
+    consumer = consumer or _consumer_name()
+    _ensure_group(client)
+
+    entries = [(entry_id, fields) for entry_id, fields in _read_batch(client, consumer, count) if fields]
+    if not entries:
+        return 0
+
+    by_kind = {}
+    pending = {}
+    dead = {}
+    for entry_id, fields in entries:
+        entry_id = entry_id.decode()
+        try:
+            kind, attempt_id, answers = _decode(fields)
+        except (KeyError, ValueError, UnicodeDecodeError) as exc:
+            dead[entry_id] = exc
+            continue
+        by_kind.setdefault(kind, []).append((entry_id, attempt_id, answers))
+        pending_key = _pending_key(kind, attempt_id)
+        pending[pending_key] = pending.get(pending_key, 0) + 1
+
+    for kind, submissions in by_kind.items():
+        for entry_id, exc in _save_or_isolate(kind, submissions):
+            dead[entry_id] = exc
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    pipe = client.pipeline()
+    for entry_id, fields in entries:
+        exc = dead.get(entry_id.decode())
+        if exc is not None:
+            pipe.xadd(
+                DEAD_LETTER_KEY,
+                {**fields, "entry_id": entry_id, "error": f"{type(exc).__name__}: {exc}"},
+                maxlen=DEAD_LETTER_MAXLEN, approximate=True,
+            )
+    pipe.xack(STREAM_KEY, GROUP_NAME, *entry_ids)
+    pipe.xdel(STREAM_KEY, *entry_ids)
+    for pending_key, processed in pending.items():
+        pipe.decrby(pending_key, processed)
+    pipe.execute()
+    return len(entries)
+
+
+def drain_answer_stream(count=BATCH_SIZE):
+    """Drains the stream until it is empty. Returns the entries processed."""
+    client = _redis()
+    consumer = _consumer_name()
+    total = 0
+    while True:
+        processed = drain_batch(client, consumer, count)
+        if not processed:
+            return total
+        total += processed
+
+
+def flush_attempt_answers(kind, attempt_id, timeout=FLUSH_TIMEOUT):
+    """
+    Makes sure every queued submission of the attempt is in the database,
+    draining the stream from this process if needed. Returns False if
+    another drain still holds some of them after ``timeout`` seconds.
+    """
+    client = _redis()
+    consumer = _consumer_name()
+    pending_key = _pending_key(kind, attempt_id)
+    deadline = time.monotonic() + timeout
+
+    while int(client.get(pending_key) or 0) > 0:
+        if time.monotonic() > deadline:
+            return False
+        if not drain_batch(client, consumer):
+            # Ours were read by another drain that hasn't committed yet
+            time.sleep(0.05)
+    return True
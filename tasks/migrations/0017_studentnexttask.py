@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_progress(apps, schema_editor):
+    # Keep the latest row per (user_id, task) before enforcing uniqueness
+    UserTaskProgress = apps.get_model('tasks', 'UserTaskProgress')
+    latest = (
+        UserTaskProgress.objects
+        .values('user_id', 'task_id')
+        .annotate(latest_id=Max('id'))
+        .values_list('latest_id', flat=True)
+    )
+    UserTaskProgress.objects.exclude(id__in=list(latest)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0016_alter_listeningactivityquestion_answer_1_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentNextTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(drop_duplicate_progress, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='usertaskprogress',
+            constraint=models.UniqueConstraint(fields=('user_id', 'task'), name='unique_user_task_progress'),
+        ),
+        migrations.AddField(
+            model_name='studentnexttask',
+            name='progress',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.usertaskprogress'),
+        ),
+        migrations.AddField(
+            model_name='studentnexttask',
+            name='task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.task'),
+        ),
+        migrations.AddField(
+            model_name='studentnexttask',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='next_task', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def schedule_drain(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name='drain_answer_submissions',
+        defaults={
+            'func': 'tasks.tasks.drain_answer_submissions',
+            'schedule_type': 'I',
+            'minutes': 1,
+            'repeats': -1,
+        },
+    )
+
+
+def unschedule_drain(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name='drain_answer_submissions').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_studentnexttask'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_drain, unschedule_drain),
+    ]
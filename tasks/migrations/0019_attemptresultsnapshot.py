@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0018_schedule_answer_drain'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttemptResultSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('reading', 'Reading'), ('listening', 'Listening'), ('speaking', 'Speaking'), ('writing', 'Writing')], max_length=20)),
+                ('attempt_id', models.PositiveIntegerField()),
+                ('activity_id', models.PositiveIntegerField()),
+                ('host', models.CharField(max_length=255)),
+                ('payload', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'activity_id'], name='result_snapshot_activity_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'attempt_id', 'host'), name='unique_attempt_result_snapshot')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+# GIN trigram index on UPPER(name) for icontains task search (see
+# utils.search). PostgreSQL only; pg_trgm comes from user 0009.
+def search_indexes():
+    yield GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="task_name_trgm")
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in search_indexes():
+        schema_editor.add_index(apps.get_model("tasks", "Task"), index, concurrently=True)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in search_indexes():
+        schema_editor.remove_index(apps.get_model("tasks", "Task"), index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0020_regradejob'),
+        ('user', '0009_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
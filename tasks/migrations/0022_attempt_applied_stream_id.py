@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0021_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentlisteningattempt',
+            name='applied_stream_id',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='studentreadingattempt',
+            name='applied_stream_id',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from user.models import User
@@ -134,6 +134,8 @@ class StudentReadingAttempt(models.Model):
     score = models.FloatField(null=True, blank=True)
 
     is_completed = models.BooleanField(default=False)
+    # Last write-behind stream entry applied (see tasks.answer_queue)
+    applied_stream_id = models.CharField(max_length=32, blank=True, default="")
 
     def __str__(self):
         return f"{self.student} - {self.reading_activity}"
@@ -218,6 +220,8 @@ class StudentListeningAttempt(models.Model):
     score = models.FloatField(null=True, blank=True)
 
     is_completed = models.BooleanField(default=False)
+    # Last write-behind stream entry applied (see tasks.answer_queue)
+    applied_stream_id = models.CharField(max_length=32, blank=True, default="")
 
     def __str__(self):
         return f"{self.student} - {self.listening_activity}"
@@ -287,5 +291,116 @@ class UserTaskProgress(models.Model):
     did_completed_writing_activity = models.BooleanField(default=False)
     last_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # Also serves every lookup by user_id
+            models.UniqueConstraint(fields=["user_id", "task"], name="unique_user_task_progress"),
+        ]
+
     def __str__(self):
         return f"User {self.user_id} - Task {self.task.name} - Progress {self.progress}%"
+
+
+class StudentNextTask(models.Model):
+    """
+    Where a student goes next in their grade: their latest unfinished
+    task, otherwise the first task after their latest finished one.
+    Maintained by tasks.progress; ``task`` is null when the grade has
+    nothing left.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="next_task")
+    grade = models.CharField(max_length=255)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    progress = models.ForeignKey(UserTaskProgress, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"User {self.user_id} (grade {self.grade}) -> Task {self.task_id}"
+
+
+class AttemptResultSnapshot(models.Model):
+    """
+    Rendered ``result`` response of a completed attempt, written once and
+    then served as-is (see tasks.results). One row per request host, as
+    file fields render as absolute URLs. Rows are dropped when the attempt
+    is rescored or its activity, the activity's questions or its task
+    change, and rebuilt on the next read.
+    """
+    KIND_CHOICES = [
+        ("reading", "Reading"),
+        ("listening", "Listening"),
+        ("speaking", "Speaking"),
+        ("writing", "Writing"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    attempt_id = models.PositiveIntegerField()
+    activity_id = models.PositiveIntegerField()
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    host = models.CharField(max_length=255)
+    payload = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "attempt_id", "host"], name="unique_attempt_result_snapshot"),
+        ]
+        indexes = [
+            models.Index(fields=["kind", "activity_id"], name="result_snapshot_activity_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} attempt {self.attempt_id} result ({self.host})"
+
+    @classmethod
+    def invalidate(cls, kind, activity_ids=(), attempt_ids=()):
+        """Drops the snapshots of the given activities / attempts once the transaction commits."""
+        activity_ids = {pk for pk in activity_ids if pk}
+        attempt_ids = {pk for pk in attempt_ids if pk}
+        if not activity_ids and not attempt_ids:
+            return
+
+        lookup = models.Q(activity_id__in=activity_ids) | models.Q(attempt_id__in=attempt_ids)
+        transaction.on_commit(lambda: cls.objects.filter(lookup, kind=kind).delete())
+
+
+class RegradeJob(models.Model):
+    """
+    Background regrade of stored answers after questions' correct answers
+    changed (see tasks.regrade). Runs in chunks on django-q; the cursors
+    let a run that hits its time budget resume where it stopped, and the
+    counters are the progress admins poll.
+    """
+    KIND_CHOICES = [
+        ("reading", "Reading"),
+        ("listening", "Listening"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    question_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+
+    total_answers = models.PositiveIntegerField(default=0)
+    regraded_answers = models.PositiveIntegerField(default=0)
+    total_attempts = models.PositiveIntegerField(default=0)
+    rescored_attempts = models.PositiveIntegerField(default=0)
+    answer_cursor = models.BigIntegerField(default=0)
+    attempt_cursor = models.BigIntegerField(default=0)
+
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.kind} regrade #{self.pk} ({self.status})"
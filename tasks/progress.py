@@ -0,0 +1,87 @@
+from tasks.models import (
+    Task, UserTaskProgress, StudentNextTask,
+    SpeakingActivity, ReadingActivity, ListeningActivity, WritingActivity,
+    StudentSpeakingAttempt, StudentReadingAttempt,
+    StudentListeningAttempt, StudentWritingAttempt,
+)
+
+
+# ------------------------------
+# Per attempt model: its activity FK, the activity model and the
+# UserTaskProgress flag it fills.
+# ------------------------------
+ATTEMPT_MODULES = {
+    StudentSpeakingAttempt: ("speaking_activity", SpeakingActivity, "did_completed_speaking_activity"),
+    StudentReadingAttempt: ("reading_activity", ReadingActivity, "did_completed_reading_activity"),
+    StudentListeningAttempt: ("listening_activity", ListeningActivity, "did_completed_listening_activity"),
+    StudentWritingAttempt: ("writing_activity", WritingActivity, "did_completed_writing_activity"),
+}
+
+PROGRESS_FLAGS = [flag for _, _, flag in ATTEMPT_MODULES.values()]
+
+
+def _module_completed(student_id, task_id, attempt_model, activity_field, activity_model):
+    """A module is done once every activity of it in the task has a completed attempt."""
+    completed = (
+        attempt_model.objects
+        .filter(student_id=student_id, is_completed=True)
+        .values(f"{activity_field}_id")
+    )
+    return not (
+        activity_model.objects
+        .filter(task_id=task_id)
+        .exclude(id__in=completed)
+        .exists()
+    )
+
+
+def refresh_next_task(user_id, grade):
+    """
+    Recomputes and stores the student's StudentNextTask for ``grade``:
+    the latest task they left unfinished, otherwise the first task after
+    the latest one they finished, otherwise the first task of the grade.
+    """
+    progress_rows = (
+        UserTaskProgress.objects
+        .filter(user_id=user_id, task__grade=grade)
+        .order_by("-task_id")
+    )
+    incomplete = progress_rows.exclude(**{flag: True for flag in PROGRESS_FLAGS}).first()
+
+    if incomplete:
+        task_id, progress = incomplete.task_id, incomplete
+    else:
+        last_task_id = progress_rows.values_list("task_id", flat=True).first()
+        tasks = Task.objects.filter(grade=grade).order_by("id")
+        if last_task_id:
+            tasks = tasks.filter(id__gt=last_task_id)
+        task_id, progress = tasks.values_list("id", flat=True).first(), None
+
+    pointer, _ = StudentNextTask.objects.update_or_create(
+        user_id=user_id,
+        defaults={"grade": grade, "task_id": task_id, "progress": progress},
+    )
+    return pointer
+
+
+def record_attempt_completion(attempt):
+    """
+    Called whenever an attempt is marked completed: refreshes the
+    student's UserTaskProgress for the attempt's task and their
+    next-task pointer.
+    """
+    activity_field, _, _ = ATTEMPT_MODULES[type(attempt)]
+    task_id = getattr(attempt, activity_field).task_id
+    student_id = attempt.student_id
+
+    flags = {
+        flag: _module_completed(student_id, task_id, attempt_model, field, activity_model)
+        for attempt_model, (field, activity_model, flag) in ATTEMPT_MODULES.items()
+    }
+    UserTaskProgress.objects.update_or_create(
+        user_id=student_id, task_id=task_id, defaults=flags
+    )
+
+    grade = Task.objects.filter(id=task_id).values_list("grade", flat=True).first()
+    if grade:
+        refresh_next_task(student_id, grade)
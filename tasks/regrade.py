@@ -0,0 +1,183 @@
+import time
+
+from django.db import transaction
+from django.db.models import (
+    BooleanField, Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce, Lower, Trim
+from django.db.models.lookups import Exact
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from student.signals import schedule_score_refresh
+from tasks.answer_keys import normalise_answer
+from tasks.models import (
+    RegradeJob, AttemptResultSnapshot,
+    ReadingAcitivityQuestion, StudentReadingAttempt, StudentReadingAnswer,
+    ListeningActivityQuestion, StudentListeningAttempt, StudentListeningAnswer,
+)
+
+
+# ==============================
+# Answer-key regrading
+# When a question's correct answer changes, its stored answers are
+# re-marked and the affected attempts rescored with set-based UPDATEs,
+# a chunk of rows per statement, in a django-q task. A run stops after
+# REGRADE_TIME_BUDGET seconds (below Q_CLUSTER's timeout) and queues
+# itself again to carry on from the job's cursors.
+# ==============================
+REGRADE_CHUNK_SIZE = 5000
+REGRADE_TIME_BUDGET = 40
+
+REGRADE_KINDS = {
+    "reading": (ReadingAcitivityQuestion, StudentReadingAttempt, StudentReadingAnswer),
+    "listening": (ListeningActivityQuestion, StudentListeningAttempt, StudentListeningAnswer),
+}
+
+
+def answer_changed(previous, current):
+    return normalise_answer(previous) != normalise_answer(current)
+
+
+def queue_regrade(kind, question_ids, user=None):
+    """
+    Records a RegradeJob for the questions and starts it once the
+    current transaction commits. Returns the job.
+    """
+    job = RegradeJob.objects.create(
+        kind=kind,
+        question_ids=sorted(set(question_ids)),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: async_task("tasks.tasks.run_regrade_job", job.pk))
+    return job
+
+
+def _is_correct_expression(answer_keys):
+    # Same comparison as grading: trimmed, case-insensitive
+    selected = Lower(Trim("selected_answer"))
+    return Case(
+        *[
+            When(question_id=question_id, then=Exact(selected, Value(answer)))
+            for question_id, answer in answer_keys.items()
+        ],
+        default=F("is_correct"),
+        output_field=BooleanField(),
+    )
+
+
+def _regrade_answer_chunk(job, answer_model, answer_keys):
+    answers = answer_model.objects.filter(question_id__in=answer_keys)
+    chunk = list(
+        answers
+        .filter(id__gt=job.answer_cursor)
+        .order_by("id")
+        .values_list("id", flat=True)[:REGRADE_CHUNK_SIZE]
+    )
+    if not chunk:
+        return False
+
+    answers.filter(id__gte=chunk[0], id__lte=chunk[-1]).update(
+        is_correct=_is_correct_expression(answer_keys)
+    )
+    job.answer_cursor = chunk[-1]
+    job.regraded_answers += len(chunk)
+    job.save(update_fields=["answer_cursor", "regraded_answers"])
+    return True
+
+
+def _rescore_attempt_chunk(job, attempt_model, answer_model, affected):
+    chunk = list(
+        affected
+        .filter(id__gt=job.attempt_cursor)
+        .order_by("id")
+        .values_list("id", "student_id", "is_completed")[:REGRADE_CHUNK_SIZE]
+    )
+    if not chunk:
+        return False
+
+    correct = Coalesce(
+        Subquery(
+            answer_model.objects
+            .filter(attempt=OuterRef("pk"), is_correct=True)
+            .order_by()
+            .values("attempt")
+            .annotate(count=Count("id"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+    attempt_ids = [attempt_id for attempt_id, _, _ in chunk]
+
+    with transaction.atomic():
+        attempt_model.objects.filter(id__in=attempt_ids).update(
+            correct_answers=correct,
+            score=Case(
+                When(total_questions__gt=0, then=Cast(correct, FloatField()) * 100.0 / F("total_questions")),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+        # .update() skips the attempt signals; do their work here
+        schedule_score_refresh(*{student_id for _, student_id, completed in chunk if completed})
+        AttemptResultSnapshot.invalidate(job.kind, attempt_ids=attempt_ids)
+
+        job.attempt_cursor = attempt_ids[-1]
+        job.rescored_attempts += len(chunk)
+        job.save(update_fields=["attempt_cursor", "rescored_attempts"])
+    return True
+
+
+def run_regrade(job_id):
+    """
+    Works on the job until it is done or the time budget runs out, in
+    which case the rest is queued as a new run. Safe to call again on a
+    job that was interrupted: both passes resume from their cursors.
+    """
+    job = RegradeJob.objects.filter(pk=job_id).exclude(status="completed").first()
+    if job is None:
+        return
+
+    question_model, attempt_model, answer_model = REGRADE_KINDS[job.kind]
+    # Read the answers now, not when the job was queued: a later edit
+    # of the same question then can't be undone by an older job.
+    answer_keys = {
+        question_id: normalise_answer(correct_answer)
+        for question_id, correct_answer in (
+            question_model.objects
+            .filter(id__in=job.question_ids)
+            .values_list("id", "is_correct_answer")
+        )
+    }
+    affected = attempt_model.objects.filter(
+        id__in=answer_model.objects.filter(question_id__in=job.question_ids).values("attempt_id")
+    )
+
+    if job.status == "pending":
+        job.status = "running"
+        job.started_at = timezone.now()
+        job.total_answers = answer_model.objects.filter(question_id__in=answer_keys).count()
+        job.total_attempts = affected.count()
+        job.save(update_fields=["status", "started_at", "total_answers", "total_attempts"])
+
+    deadline = time.monotonic() + REGRADE_TIME_BUDGET
+    try:
+        while time.monotonic() < deadline:
+            if _regrade_answer_chunk(job, answer_model, answer_keys):
+                continue
+            if _rescore_attempt_chunk(job, attempt_model, answer_model, affected):
+                continue
+
+            job.status = "completed"
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "finished_at"])
+            return
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        raise
+
+    async_task("tasks.tasks.run_regrade_job", job.pk)
@@ -0,0 +1,252 @@
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from tasks.answer_keys import get_reading_answer_key, get_listening_answer_key
+from tasks.models import (
+    AttemptResultSnapshot,
+    StudentReadingAttempt, StudentListeningAttempt,
+    StudentSpeakingAttempt, StudentWritingAttempt,
+)
+
+
+# ==============================
+# BUILDERS
+# The `result` response of each attempt type.
+# ==============================
+
+def _duration_seconds(attempt):
+    if attempt.completed_at:
+        return int((attempt.completed_at - attempt.started_at).total_seconds())
+    return None
+
+
+def build_reading_result(attempt, request):
+    answers = attempt.answers.order_by("id").values("question_id", "selected_answer", "is_correct")
+    answer_key = get_reading_answer_key(attempt.reading_activity_id)
+
+    def question_details(question_id):
+        q = answer_key.get(question_id, {})
+        qtype = q.get("type")
+        base = {
+            "id": question_id,
+            "question": q.get("question"),
+            "type": qtype,
+            "instruction": q.get("instruction")
+        }
+
+        if qtype == "mcq":
+            # filter out empty/None options
+            base["options"] = [o for o in q["options"] if o]
+        else:
+            # for other types just include the main question text (already present)
+            base["text"] = q.get("question")
+
+        return base
+
+    # include detailed activity info for the frontend
+    activity = attempt.reading_activity
+    activity_detail = {
+        "id": getattr(activity, "id", None),
+        "title": getattr(activity, "title", None),
+        "passage": getattr(activity, "passage", None),
+        "instruction": getattr(activity, "instruction", None),
+        "duration": getattr(activity, "duration", None),
+        "file": request.build_absolute_uri(activity.file.url) if activity.file else None,
+        "task": {
+            "id": getattr(getattr(activity, "task", None), "id", None),
+            "name": getattr(getattr(activity, "task", None), "name", None)
+        }
+    }
+
+    return {
+        "attempt_id": attempt.id,
+        "activity": attempt.reading_activity.title,
+        "activity_detail": activity_detail,
+        "total_questions": attempt.total_questions,
+        "correct_answers": attempt.correct_answers,
+        "score": attempt.score,
+        "is_completed": attempt.is_completed,
+        "duration_seconds": _duration_seconds(attempt),
+        "answers": [
+            {
+                "question": question_details(answer["question_id"]),
+                "selected_answer": answer["selected_answer"],
+                "correct_answer": answer_key.get(answer["question_id"], {}).get("correct_answer"),
+                "is_correct": answer["is_correct"]
+            }
+            for answer in answers
+        ]
+    }
+
+
+def build_listening_result(attempt, request):
+    answers = attempt.answers.order_by("id").values("question_id", "selected_answer", "is_correct")
+    answer_key = get_listening_answer_key(attempt.listening_activity_id)
+
+    activity = attempt.listening_activity
+
+    activity_detail = {
+        "id": activity.id,
+        "title": activity.title,
+        "duration": activity.duration,
+        "instruction": activity.instruction,
+        "audio_file": request.build_absolute_uri(activity.audio_file.url)
+        if activity.audio_file else request.build_absolute_uri("/media/default_audio.mp3")
+    }
+
+    answer_list = []
+    for answer in answers:
+        q = answer_key.get(answer["question_id"], {})
+        part_audio = None
+        if q.get("part_audio"):
+            part_audio = request.build_absolute_uri(q["part_audio"])
+
+        # Include all options and correct answer for all question types
+        options = dict(zip(
+            ["answer_1", "answer_2", "answer_3", "answer_4"],
+            q.get("options", [None, None, None, None])
+        ))
+
+        answer_list.append({
+            "question_id": answer["question_id"],
+            "bundle_id": q.get("bundle_id"),
+            "question": q.get("question"),
+            "question_type": q.get("type"),
+            "selected_answer": answer["selected_answer"],
+            "is_correct": answer["is_correct"],
+            "part": q.get("part"),
+            "part_audio": part_audio,
+            "options": options,
+            "correct_answer": q.get("correct_answer"),
+        })
+
+    return {
+        "attempt_id": attempt.id,
+        "activity": activity.title,
+        "activity_detail": activity_detail,
+        "total_questions": attempt.total_questions,
+        "correct_answers": attempt.correct_answers,
+        "score": attempt.score,
+        "is_completed": attempt.is_completed,
+        "duration_seconds": _duration_seconds(attempt),
+        "answers": answer_list
+    }
+
+
+def build_speaking_result(attempt, request):
+    answers = attempt.answers.select_related("question")
+    return {
+        "attempt_id": attempt.id,
+        "activity": attempt.speaking_activity.title,
+        "is_completed": attempt.is_completed,
+        "score": attempt.score,
+        "feedback": attempt.feedback,
+        "answers": [
+            {
+                "question": answer.question.text_question or answer.question.instruction,
+                "audio_file": request.build_absolute_uri(answer.audio_file.url),
+                "transcript": answer.transcript
+            }
+            for answer in answers
+        ]
+    }
+
+
+def build_writing_result(attempt, request):
+    submissions = attempt.submissions.all()
+    return {
+        "attempt_id": attempt.id,
+        "activity": attempt.writing_activity.title,
+        "is_completed": attempt.is_completed,
+        "score": attempt.score,
+        "feedback": attempt.feedback,
+        "submissions": [
+            {
+                "submission_text": s.submission_text,
+                "file": request.build_absolute_uri(s.file.url) if s.file else None,
+                "created_at": s.created_at
+            }
+            for s in submissions
+        ]
+    }
+
+
+# Per kind: attempt model, its activity FK and the builder
+RESULT_KINDS = {
+    "reading": (StudentReadingAttempt, "reading_activity", build_reading_result),
+    "listening": (StudentListeningAttempt, "listening_activity", build_listening_result),
+    "speaking": (StudentSpeakingAttempt, "speaking_activity", build_speaking_result),
+    "writing": (StudentWritingAttempt, "writing_activity", build_writing_result),
+}
+
+ATTEMPT_KINDS = {attempt_model: kind for kind, (attempt_model, _, _) in RESULT_KINDS.items()}
+ACTIVITY_KINDS = {
+    attempt_model._meta.get_field(activity_field).related_model: kind
+    for kind, (attempt_model, activity_field, _) in RESULT_KINDS.items()
+}
+
+
+# ==============================
+# SNAPSHOTS
+# A completed attempt's result is rendered once and kept in
+# AttemptResultSnapshot; reads are then a single indexed lookup.
+# In-progress attempts are always built live.
+# ==============================
+
+def _host(request):
+    return f"{request.scheme}://{request.get_host()}"
+
+
+def store_result_snapshot(attempt, request):
+    """Renders the completed ``attempt``'s result and stores it. Returns the JSON."""
+    kind = ATTEMPT_KINDS[type(attempt)]
+    _, activity_field, builder = RESULT_KINDS[kind]
+
+    payload = JSONRenderer().render(builder(attempt, request)).decode()
+    if attempt.is_completed:
+        snapshot = AttemptResultSnapshot(
+            kind=kind,
+            attempt_id=attempt.pk,
+            activity_id=getattr(attempt, f"{activity_field}_id"),
+            student_id=attempt.student_id,
+            host=_host(request),
+            payload=payload,
+        )
+        # After commit, so it lands after the drop queued by the save that
+        # completed the attempt; a concurrent reader may have stored it first.
+        transaction.on_commit(lambda: AttemptResultSnapshot.objects.bulk_create(
+            [snapshot], ignore_conflicts=True
+        ))
+    return payload
+
+
+def get_result_payload(kind, attempt_id, request):
+    """
+    The rendered result of the request user's attempt, from its snapshot
+    when there is one. None if the attempt doesn't exist or isn't theirs.
+    """
+    try:
+        attempt_id = int(attempt_id)
+    except (TypeError, ValueError):
+        return None
+
+    payload = (
+        AttemptResultSnapshot.objects
+        .filter(kind=kind, attempt_id=attempt_id, host=_host(request), student=request.user)
+        .values_list("payload", flat=True)
+        .first()
+    )
+    if payload is not None:
+        return payload
+
+    attempt_model, activity_field, _ = RESULT_KINDS[kind]
+    related = f"{activity_field}__task" if kind == "reading" else activity_field
+    attempt = (
+        attempt_model.objects
+        .select_related(related)
+        .filter(id=attempt_id, student=request.user)
+        .first()
+    )
+    if attempt is None:
+        return None
+    return store_result_snapshot(attempt, request)
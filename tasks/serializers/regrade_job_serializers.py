@@ -0,0 +1,24 @@
+# tasks/serializers/regrade_job_serializers.py
+from rest_framework import serializers
+from tasks.models import RegradeJob
+
+
+class RegradeJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RegradeJob
+        fields = [
+            'id', 'kind', 'question_ids', 'status', 'progress',
+            'total_answers', 'regraded_answers', 'total_attempts', 'rescored_attempts',
+            'error', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_progress(self, obj):
+        # Percentage of rows done across both passes
+        total = obj.total_answers + obj.total_attempts
+        if obj.status == "completed":
+            return 100
+        if not total:
+            return 0
+        return round((obj.regraded_answers + obj.rescored_attempts) * 100 / total)
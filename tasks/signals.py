@@ -0,0 +1,140 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from tasks.models import (
+    Task,
+    SpeakingActivity, SpeakingActivityQuestion, speakingActivitySample,
+    ReadingActivity, ReadingAcitivityQuestion,
+    ListeningActivity, ListeningActivityPart, ListeningActivityQuestion,
+    WritingActivity,
+    StudentNextTask,
+    AttemptResultSnapshot,
+)
+from tasks.results import ACTIVITY_KINDS, ATTEMPT_KINDS
+from tasks.task_tree import invalidate_task_tree
+
+
+# ------------------------------
+# Path from each model of the task tree up to its Task id
+# ------------------------------
+TASK_TREE_PATHS = {
+    Task: "id",
+    SpeakingActivity: "task_id",
+    SpeakingActivityQuestion: "speaking_activity__task_id",
+    speakingActivitySample: "speaking_activity__task_id",
+    ReadingActivity: "task_id",
+    ReadingAcitivityQuestion: "reading_activity__task_id",
+    ListeningActivity: "task_id",
+    ListeningActivityPart: "listening_activity__task_id",
+    ListeningActivityQuestion: "listening_activity_part__listening_activity__task_id",
+    WritingActivity: "task_id",
+}
+
+
+def _bump_task_tree(sender, instance):
+    if instance.pk is None:
+        return
+
+    invalidate_task_tree(*(
+        sender.objects
+        .filter(pk=instance.pk)
+        .values_list(TASK_TREE_PATHS[sender], flat=True)
+    ))
+
+
+def task_tree_pre_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _bump_task_tree(sender, instance)
+
+
+def task_tree_post_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _bump_task_tree(sender, instance)
+
+
+def task_tree_pre_delete(sender, instance, **kwargs):
+    _bump_task_tree(sender, instance)
+
+
+# Before a save/delete we catch the task the row belonged to,
+# after a save the task it belongs to now.
+for model in TASK_TREE_PATHS:
+    pre_save.connect(task_tree_pre_save, sender=model)
+    post_save.connect(task_tree_post_save, sender=model)
+    pre_delete.connect(task_tree_pre_delete, sender=model)
+
+
+# ------------------------------
+# StudentNextTask pointers
+# Adding, moving or removing a task can change where any student of its
+# grade goes next; their pointers are dropped and rebuilt on next read.
+# ------------------------------
+
+def _drop_next_task_pointers(*grades):
+    grades = {grade for grade in grades if grade}
+    if grades:
+        StudentNextTask.objects.filter(grade__in=grades).delete()
+
+
+def next_task_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = Task.objects.filter(pk=instance.pk).values_list("grade", flat=True).first()
+    if previous != instance.grade:
+        _drop_next_task_pointers(previous, instance.grade)
+
+
+def next_task_post_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _drop_next_task_pointers(instance.grade)
+
+
+def next_task_post_delete(sender, instance, **kwargs):
+    _drop_next_task_pointers(instance.grade)
+
+
+pre_save.connect(next_task_pre_save, sender=Task)
+post_save.connect(next_task_post_save, sender=Task)
+post_delete.connect(next_task_post_delete, sender=Task)
+
+
+# ------------------------------
+# Result snapshots
+# Rescoring a completed attempt (grading, regrading) or deleting it
+# drops its stored result. Results also show their activity (title,
+# file, ...) and task name, so editing or deleting either drops every
+# result of the activity; a deleted task takes its activities with it.
+# ------------------------------
+
+def result_snapshot_post_save(sender, instance, raw=False, **kwargs):
+    if not raw and instance.is_completed:
+        AttemptResultSnapshot.invalidate(ATTEMPT_KINDS[sender], attempt_ids=[instance.pk])
+
+
+def result_snapshot_post_delete(sender, instance, **kwargs):
+    AttemptResultSnapshot.invalidate(ATTEMPT_KINDS[sender], attempt_ids=[instance.pk])
+
+
+for model in ATTEMPT_KINDS:
+    post_save.connect(result_snapshot_post_save, sender=model)
+    post_delete.connect(result_snapshot_post_delete, sender=model)
+
+
+def result_snapshot_activity_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        AttemptResultSnapshot.invalidate(ACTIVITY_KINDS[sender], activity_ids=[instance.pk])
+
+
+def result_snapshot_task_post_save(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    for activity_model, kind in ACTIVITY_KINDS.items():
+        AttemptResultSnapshot.invalidate(
+            kind,
+            activity_ids=activity_model.objects.filter(task_id=instance.pk).values_list("id", flat=True)
+        )
+
+
+for model in ACTIVITY_KINDS:
+    post_save.connect(result_snapshot_activity_changed, sender=model)
+    post_delete.connect(result_snapshot_activity_changed, sender=model)
+post_save.connect(result_snapshot_task_post_save, sender=Task)
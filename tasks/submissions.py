@@ -0,0 +1,190 @@
+from django.db import transaction
+from django.db.models import Count, Q
+
+from tasks.answer_keys import normalise_answer
+from tasks.progress import record_attempt_completion
+
+
+def answer_items_error(answers):
+    """
+    Why a submit-answer ``answers`` list can't be accepted, or None.
+    Every item must be an object with a non-empty ``selected_answer``
+    string and, if given, an integer ``question_id``.
+    """
+    for item in answers:
+        if not isinstance(item, dict):
+            return "Each answer must be an object"
+        selected_answer = item.get("selected_answer")
+        if not isinstance(selected_answer, str) or not selected_answer:
+            return "Each answer needs a non-empty selected_answer string"
+        question_id = item.get("question_id")
+        if question_id is not None and (isinstance(question_id, bool) or not isinstance(question_id, int)):
+            return "question_id must be an integer"
+    return None
+
+
+def grade_answers(attempt_id, answer_model, answers, answer_key, graded=None):
+    """
+    Grades submitted answers in memory into ``graded``
+    ({question_id: unsaved answer}); the last answer for a question wins.
+    Items without a question_id / selected_answer string, or whose
+    question is not in ``answer_key``, are skipped.
+    """
+    graded = {} if graded is None else graded
+    for item in answers:
+        if not isinstance(item, dict):
+            continue
+        question_id = item.get("question_id")
+        selected_answer = item.get("selected_answer")
+
+        if not isinstance(selected_answer, str) or not selected_answer:
+            continue
+        if isinstance(question_id, bool) or not isinstance(question_id, int) or question_id not in answer_key:
+            continue
+
+        graded[question_id] = answer_model(
+            attempt_id=attempt_id,
+            question_id=question_id,
+            selected_answer=selected_answer,
+            is_correct=normalise_answer(selected_answer) == answer_key[question_id]["answer"],
+        )
+    return graded
+
+
+def _upsert_answers(answer_model, answers):
+    if answers:
+        answer_model.objects.bulk_create(
+            answers,
+            update_conflicts=True,
+            unique_fields=["attempt", "question"],
+            update_fields=["selected_answer", "is_correct"],
+        )
+
+
+def _apply_score(attempt, answered, correct_count):
+    """
+    Sets the attempt's correct_answers / score, auto-completes it once
+    every question is answered and saves it. Returns True when this call
+    completed it.
+    """
+    attempt.correct_answers = correct_count
+    attempt.score = (
+        (correct_count / attempt.total_questions) * 100
+        if attempt.total_questions > 0 else 0
+    )
+
+    # Auto-complete when all answered
+    newly_completed = not attempt.is_completed and answered == attempt.total_questions
+    if newly_completed:
+        attempt.is_completed = True
+
+    attempt.save(update_fields=["correct_answers", "score", "is_completed"])
+    return newly_completed
+
+
+def save_objective_answers(attempt, answer_model, answers, answer_key):
+    """
+    Saves a batch of reading/listening answers for an attempt.
+
+    All answers of the request are upserted with a single
+    INSERT ... ON CONFLICT (attempt, question) statement and the attempt's
+    correct_answers / score / auto-completion are recomputed in memory from
+    the answers already stored plus the ones just graded, all inside one
+    transaction.
+
+    ``answer_key`` is the activity's cached answer key
+    (see tasks.answer_keys); every question_id must be present in it.
+    """
+    graded = grade_answers(attempt.pk, answer_model, answers, answer_key)
+
+    with transaction.atomic():
+        # Serialize concurrent submissions for the same attempt, and decide
+        # completion from the locked row: the caller's copy may be stale,
+        # and only one submission may record the completion
+        locked = type(attempt).objects.select_for_update().only("pk", "is_completed").get(pk=attempt.pk)
+        attempt.is_completed = locked.is_completed
+
+        stored = dict(
+            answer_model.objects
+            .filter(attempt=attempt)
+            .values_list("question_id", "is_correct")
+        )
+
+        _upsert_answers(answer_model, list(graded.values()))
+
+        stored.update({question_id: answer.is_correct for question_id, answer in graded.items()})
+
+        correct_count = sum(1 for is_correct in stored.values() if is_correct)
+
+        if _apply_score(attempt, len(stored), correct_count):
+            record_attempt_completion(attempt)
+
+    return attempt
+
+
+def stream_position(stream_id):
+    """Sortable form of a Redis stream entry id ("<ms>-<seq>"); "" sorts first."""
+    if not stream_id:
+        return (0, 0)
+    milliseconds, _, sequence = stream_id.partition("-")
+    return (int(milliseconds), int(sequence or 0))
+
+
+def save_objective_answer_batch(attempt_model, answer_model, submissions, answer_key_for):
+    """
+    Write-behind counterpart of save_objective_answers: applies many
+    queued submissions, possibly for many attempts, in one transaction.
+
+    ``submissions`` is a list of (stream_id, attempt_id, answers) in
+    arrival order; ``answer_key_for(attempt)`` returns the attempt's
+    cached answer key. Every answer of the batch goes out in one upsert,
+    then each touched attempt's score is recomputed from one grouped
+    count. Submissions for missing or already completed attempts are
+    dropped, as the synchronous path would have rejected them.
+
+    Each attempt remembers the last stream entry applied to it, in the
+    same transaction, so an entry replayed after a crashed drain can't
+    put an older answer back over a newer one.
+    """
+    attempt_ids = {attempt_id for _, attempt_id, _ in submissions}
+
+    with transaction.atomic():
+        attempts = (
+            attempt_model.objects
+            .select_for_update()
+            .in_bulk(attempt_ids)
+        )
+
+        graded = {}
+        applied = {}
+        for stream_id, attempt_id, answers in submissions:
+            attempt = attempts.get(attempt_id)
+            if attempt is None or attempt.is_completed:
+                continue
+            if stream_position(stream_id) <= stream_position(attempt.applied_stream_id):
+                continue
+            grade_answers(
+                attempt_id, answer_model, answers, answer_key_for(attempt),
+                graded.setdefault(attempt_id, {}),
+            )
+            attempt.applied_stream_id = stream_id
+            applied[attempt_id] = attempt
+
+        _upsert_answers(
+            answer_model,
+            [answer for answers in graded.values() for answer in answers.values()],
+        )
+        attempt_model.objects.bulk_update(applied.values(), ["applied_stream_id"])
+
+        counts = (
+            answer_model.objects
+            .filter(attempt_id__in=graded)
+            .values("attempt_id")
+            .annotate(answered=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+        )
+        for row in counts:
+            attempt = attempts[row["attempt_id"]]
+            if _apply_score(attempt, row["answered"], row["correct"]):
+                record_attempt_completion(attempt)
+
+    return len(graded)
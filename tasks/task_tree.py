@@ -0,0 +1,126 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from tasks.models import (
+    ListeningActivity, ReadingActivity, WritingActivity, SpeakingActivity
+)
+from tasks.serializers.nested_tasks_Serializers import (
+    IELTSTaskSerializer,
+    IELTSListeningActivitySerializer,
+    IELTSReadingActivitySerializer,
+    IELTSWritingActivitySerializer,
+    IELTSSpeakingActivitySerializer,
+)
+
+
+# ==============================
+# LOADER
+# One query per level of the tree, whatever the number of
+# activities, parts, questions or samples.
+# ==============================
+
+def listening_activities(task):
+    return ListeningActivity.objects.filter(task=task).prefetch_related(
+        "listeningactivitypart_set__listeningactivityquestion_set"
+    )
+
+
+def reading_activities(task):
+    return ReadingActivity.objects.filter(task=task).prefetch_related(
+        "readingacitivityquestion_set"
+    )
+
+
+def writing_activities(task):
+    return WritingActivity.objects.filter(task=task)
+
+
+def speaking_activities(task):
+    return SpeakingActivity.objects.filter(task=task).prefetch_related(
+        "speakingactivityquestion_set",
+        "speakingactivitysample_set",
+    )
+
+
+MODULES = {
+    "listening": (listening_activities, IELTSListeningActivitySerializer),
+    "reading": (reading_activities, IELTSReadingActivitySerializer),
+    "writing": (writing_activities, IELTSWritingActivitySerializer),
+    "speaking": (speaking_activities, IELTSSpeakingActivitySerializer),
+}
+
+
+def serialize_module(task, module_type, request):
+    loader, serializer_class = MODULES[module_type]
+    return serializer_class(loader(task), context={"request": request}, many=True).data
+
+
+def serialize_task_tree(task, module_type, request):
+    if module_type != "all":
+        return serialize_module(task, module_type, request)
+
+    data = {"task": IELTSTaskSerializer(task, context={"request": request}).data}
+    for name in MODULES:
+        data[name] = serialize_module(task, name, request)
+    return data
+
+
+# ==============================
+# CACHE
+# Rendered JSON per (task, module, host). Every change to the task or
+# anything below it bumps the task's version (see tasks.signals), which
+# moves readers to a fresh key; old payloads simply expire.
+# ==============================
+
+TASK_TREE_TIMEOUT = 60 * 60
+
+
+def _version_key(task_id):
+    return f"task_tree_version:{task_id}"
+
+
+def get_task_tree_version(task_id):
+    key = _version_key(task_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_task_tree_version(task_id):
+    key = _version_key(task_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_task_tree(*task_ids):
+    for task_id in set(task_ids):
+        if task_id:
+            transaction.on_commit(lambda task_id=task_id: bump_task_tree_version(task_id))
+
+
+def _payload_key(task_id, module_type, request):
+    # File fields render as absolute URLs, so keep hosts apart
+    host = f"{request.scheme}://{request.get_host()}"
+    return f"task_tree:{task_id}:{get_task_tree_version(task_id)}:{module_type}:{host}"
+
+
+def get_cached_task_tree(task_id, module_type, request):
+    return cache.get(_payload_key(task_id, module_type, request))
+
+
+def render_task_tree(task, module_type, request):
+    """
+    Serializes the task tree for ``module_type`` and caches the rendered
+    JSON bytes under the task's current version.
+    """
+    key = _payload_key(task.id, module_type, request)
+    payload = JSONRenderer().render(serialize_task_tree(task, module_type, request))
+    cache.set(key, payload, TASK_TREE_TIMEOUT)
+    return payload
@@ -0,0 +1,16 @@
+from tasks.answer_queue import drain_answer_stream
+from tasks.regrade import run_regrade
+
+
+def drain_answer_submissions():
+    """
+    Scheduled django-q task: writes every queued submit-answer payload
+    (see tasks.answer_queue) to the answer tables. Runs even with
+    ANSWER_WRITE_BEHIND off, so switching it off never strands entries.
+    """
+    return drain_answer_stream()
+
+
+def run_regrade_job(job_id):
+    """django-q task: regrades stored answers for a RegradeJob (see tasks.regrade)."""
+    run_regrade(job_id)
@@ -18,6 +18,7 @@ from tasks.viewsets.listening_activity_question_views import ListeningActivityQu
 from tasks.viewsets.writing_activity_views import WritingActivityViewSet
 from tasks.viewsets.speaking_activity_views import SpeakingActivityDropdownViewSet
 from tasks.viewsets.listening_activity_views import ListeningActivityDropdownViewSet
+from tasks.viewsets.regrade_job_views import RegradeJobViewSet
 # Create the router
 router = DefaultRouter()
 
@@ -36,6 +37,7 @@ router.register(r'nested-tasks', IELTSTaskViewSet, basename='nested-tasks')
 router.register(r'speaking-activity-dropdown', SpeakingActivityDropdownViewSet, basename='speaking-activity-dropdown')
 router.register(r'reading-activity-dropdown',ReadingActivityDropdownViewSet,basename='reading-activity-dropdown')
 router.register(r'listening-activity-dropdown',ListeningActivityDropdownViewSet,basename='listening-activity-dropdown')
+router.register(r'regrade-jobs', RegradeJobViewSet, basename='regrade-jobs')
 
 #================student attempt viewsets========================
 
@@ -11,6 +11,8 @@ from tasks.serializers.listening_activity_question_serializers import (
 )
 from utils.paginator import CustomPageNumberPagination
 from utils.decorators import has_permission
+from tasks.answer_keys import invalidate_listening_answer_key
+from tasks.regrade import answer_changed, queue_regrade
 from rest_framework.decorators import action
 from rest_framework import status
 from django.db import transaction
@@ -19,6 +21,11 @@ import uuid
 
 LISTENING_CHOICES = ['part1', 'form_question']
 
+
+def _listening_activity_id(question):
+    part = question.listening_activity_part
+    return part.listening_activity_id if part else None
+
 class ListeningActivityQuestionViewSet(viewsets.ViewSet):
 
     # Helper to choose serializer depending on action
@@ -68,6 +75,7 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
         serializer = serializer_class(data=request.data, context={'request': request})
         if serializer.is_valid():
             instance = serializer.save()
+            invalidate_listening_answer_key(_listening_activity_id(instance))
             response_serializer = ListeningActivityQuestionListSerializer(instance, context={'request': request})
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -85,12 +93,20 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
     )
     def update(self, request, pk=None):
         question = get_object_or_404(ListeningActivityQuestion, pk=pk)
+        previous_answer = question.is_correct_answer
+        previous_activity_id = _listening_activity_id(question)
         serializer_class = self.get_serializer_class('update')
         serializer = serializer_class(question, data=request.data, context={'request': request})
         if serializer.is_valid():
             instance = serializer.save()
+            # The question may have moved to another part's activity
+            invalidate_listening_answer_key(previous_activity_id, _listening_activity_id(instance))
             response_serializer = ListeningActivityQuestionListSerializer(instance, context={'request': request})
-            return Response(response_serializer.data)
+            data = dict(response_serializer.data)
+            # Stored answers are re-marked in the background
+            if answer_changed(previous_answer, instance.is_correct_answer):
+                data["regrade_job_id"] = queue_regrade("listening", [instance.id], request.user).id
+            return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # ---------------- PARTIAL UPDATE (PATCH) ----------------
@@ -106,12 +122,20 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
     )
     def partial_update(self, request, pk=None):
         question = get_object_or_404(ListeningActivityQuestion, pk=pk)
+        previous_answer = question.is_correct_answer
+        previous_activity_id = _listening_activity_id(question)
         serializer_class = self.get_serializer_class('partial_update')
         serializer = serializer_class(question, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             instance = serializer.save()
+            # The question may have moved to another part's activity
+            invalidate_listening_answer_key(previous_activity_id, _listening_activity_id(instance))
             response_serializer = ListeningActivityQuestionListSerializer(instance, context={'request': request})
-            return Response(response_serializer.data)
+            data = dict(response_serializer.data)
+            # Stored answers are re-marked in the background
+            if answer_changed(previous_answer, instance.is_correct_answer):
+                data["regrade_job_id"] = queue_regrade("listening", [instance.id], request.user).id
+            return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # ---------------- DELETE ----------------
@@ -122,7 +146,9 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
     )
     def destroy(self, request, pk=None):
         question = get_object_or_404(ListeningActivityQuestion, pk=pk)
+        activity_id = _listening_activity_id(question)
         question.delete()
+        invalidate_listening_answer_key(activity_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 
@@ -133,7 +159,8 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
         request_body=ListeningActivityQuestionCreateSerializer(many=True),
         responses={201: ListeningActivityQuestionListSerializer(many=True)}
     )
-    @action(detail=False, methods=['post'], url_path=r'(?P<question_type>\w+)')
+    # Never a bare id, so PUT/PATCH/DELETE on /<id>/ still reach the detail routes
+    @action(detail=False, methods=['post'], url_path=r'(?P<question_type>(?!\d+/)\w+)')
     def create_by_type(self, request, question_type=None):
         """
         Bulk create questions by type.
@@ -160,7 +187,8 @@ class ListeningActivityQuestionViewSet(viewsets.ViewSet):
                     data=item, context={'request': request}
                 )
                 serializer.is_valid(raise_exception=True)
-                serializer.save()
+                question = serializer.save()
+                invalidate_listening_answer_key(_listening_activity_id(question))
                 created_questions.append(serializer.data)
 
         return Response({
@@ -10,6 +10,13 @@ from tasks.serializers.listening_activity_question_serializers import (
 )
 from tasks.serializers.listening_activity_serializers import ListeningActivityPartSerializer
 from utils.decorators import has_permission
+from tasks.answer_keys import invalidate_listening_answer_key
+from tasks.task_tree import invalidate_task_tree
+
+
+def _task_id(part):
+    activity = part.listening_activity
+    return activity.task_id if activity else None
 
 
 class ListeningActivityPartViewSet(viewsets.ViewSet):
@@ -82,6 +89,9 @@ class ListeningActivityPartViewSet(viewsets.ViewSet):
         serializer = ListeningActivityPartCreateSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             part = serializer.save()
+            invalidate_listening_answer_key(part.listening_activity_id)
+            # Nested questions are bulk written, which skips model signals
+            invalidate_task_tree(_task_id(part))
             output_serializer = ListeningActivityPartSerializer(part, context={'request': request})
             return Response(output_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -97,9 +107,12 @@ class ListeningActivityPartViewSet(viewsets.ViewSet):
     )
     def update(self, request, pk=None):
         part = get_object_or_404(ListeningActivityPart, pk=pk)
+        previous_activity_id = part.listening_activity_id
         serializer = ListeningActivityPartCreateSerializer(part, data=request.data, context={'request': request})
         if serializer.is_valid():
             part = serializer.save()  # Nested questions replaced automatically
+            invalidate_listening_answer_key(previous_activity_id, part.listening_activity_id)
+            invalidate_task_tree(_task_id(part))
             output_serializer = ListeningActivityPartSerializer(part, context={'request': request})
             return Response(output_serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -115,9 +128,12 @@ class ListeningActivityPartViewSet(viewsets.ViewSet):
     )
     def partial_update(self, request, pk=None):
         part = get_object_or_404(ListeningActivityPart, pk=pk)
+        previous_activity_id = part.listening_activity_id
         serializer = ListeningActivityPartCreateSerializer(part, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             part = serializer.save()
+            invalidate_listening_answer_key(previous_activity_id, part.listening_activity_id)
+            invalidate_task_tree(_task_id(part))
             output_serializer = ListeningActivityPartSerializer(part, context={'request': request})
             return Response(output_serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -133,4 +149,5 @@ class ListeningActivityPartViewSet(viewsets.ViewSet):
     def destroy(self, request, pk=None):
         part = get_object_or_404(ListeningActivityPart, pk=pk)
         part.delete()
+        invalidate_listening_answer_key(part.listening_activity_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,18 +1,11 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
+from django.http import HttpResponse
 
-from tasks.models import (
-    Task, ListeningActivity, ReadingActivity, WritingActivity, SpeakingActivity
-)
-from tasks.serializers.nested_tasks_Serializers import (
-    IELTSTaskSerializer,
-    IELTSListeningActivitySerializer,
-    IELTSReadingActivitySerializer,
-    IELTSWritingActivitySerializer,
-    IELTSSpeakingActivitySerializer,
-)
+from tasks.models import Task
+from tasks.serializers.nested_tasks_Serializers import IELTSTaskSerializer
+from tasks.task_tree import MODULES, get_cached_task_tree, render_task_tree
 
 from utils.decorators import has_permission
 class IELTSTaskViewSet(viewsets.ReadOnlyModelViewSet):
@@ -27,50 +20,20 @@ class IELTSTaskViewSet(viewsets.ReadOnlyModelViewSet):
                 "type": "This query param is required. e.g. ?type=listening"
             })
 
-        task = self.get_object()
         module_type = module_type.lower()
+        if module_type != "all" and module_type not in MODULES:
+            raise ValidationError({
+                "type": "Invalid type. Use: listening, reading, writing, speaking, all"
+            })
 
-        if module_type == "listening":
-            qs = ListeningActivity.objects.filter(task=task)
-            return Response(
-                IELTSListeningActivitySerializer(qs, context={"request": request}, many=True).data
-            )
-
-        if module_type == "reading":
-            qs = ReadingActivity.objects.filter(task=task)
-            return Response(
-                IELTSReadingActivitySerializer(qs, context={"request": request}, many=True).data
-            )
-
-        if module_type == "writing":
-            qs = WritingActivity.objects.filter(task=task)
-            return Response(
-                IELTSWritingActivitySerializer(qs, context={"request": request}, many=True).data
-            )
-
-        if module_type == "speaking":
-            qs = SpeakingActivity.objects.filter(task=task)
-            return Response(
-                IELTSSpeakingActivitySerializer(qs, context={"request": request}, many=True).data
-            )
+        # Serve the rendered tree straight from cache when it is current
+        try:
+            payload = get_cached_task_tree(int(pk), module_type, request)
+        except (TypeError, ValueError):
+            payload = None
 
-        if module_type == "all":
-            return Response({
-                "task": IELTSTaskSerializer(task, context={"request": request}).data,
-                "listening": IELTSListeningActivitySerializer(
-                    ListeningActivity.objects.filter(task=task), context={"request": request}, many=True
-                ).data,
-                "reading": IELTSReadingActivitySerializer(
-                    ReadingActivity.objects.filter(task=task), context={"request": request}, many=True
-                ).data,
-                "writing": IELTSWritingActivitySerializer(
-                    WritingActivity.objects.filter(task=task), context={"request": request}, many=True
-                ).data,
-                "speaking": IELTSSpeakingActivitySerializer(
-                    SpeakingActivity.objects.filter(task=task), context={"request": request}, many=True
-                ).data,
-            })
+        if payload is None:
+            task = self.get_object()
+            payload = render_task_tree(task, module_type, request)
 
-        raise ValidationError({
-            "type": "Invalid type. Use: listening, reading, writing, speaking, all"
-        })
+        return HttpResponse(payload, content_type="application/json")
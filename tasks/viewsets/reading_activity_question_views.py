@@ -12,6 +12,8 @@ from utils.paginator import CustomPageNumberPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from utils.decorators import has_permission
+from tasks.answer_keys import invalidate_reading_answer_key
+from tasks.regrade import answer_changed, queue_regrade
 from rest_framework.decorators import action
 from rest_framework.response import Response
 import uuid
@@ -84,7 +86,8 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
         serializer_class = self.get_serializer_class('create')
         serializer = serializer_class(data=request.data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            question = serializer.save()
+            invalidate_reading_answer_key(question.reading_activity_id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -101,11 +104,18 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
     )
     def update(self, request, pk=None):
         question = get_object_or_404(ReadingAcitivityQuestion, pk=pk)
+        previous_activity_id = question.reading_activity_id
+        previous_answer = question.is_correct_answer
         serializer_class = self.get_serializer_class('update')
         serializer = serializer_class(question, data=request.data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
+            question = serializer.save()
+            invalidate_reading_answer_key(previous_activity_id, question.reading_activity_id)
+            data = dict(serializer.data)
+            # Stored answers are re-marked in the background
+            if answer_changed(previous_answer, question.is_correct_answer):
+                data["regrade_job_id"] = queue_regrade("reading", [question.id], request.user).id
+            return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @has_permission("can_update_readingactivityquestion")
@@ -120,11 +130,18 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
     )
     def partial_update(self, request, pk=None):
         question = get_object_or_404(ReadingAcitivityQuestion, pk=pk)
+        previous_activity_id = question.reading_activity_id
+        previous_answer = question.is_correct_answer
         serializer_class = self.get_serializer_class('partial_update')
         serializer = serializer_class(question, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
+            question = serializer.save()
+            invalidate_reading_answer_key(previous_activity_id, question.reading_activity_id)
+            data = dict(serializer.data)
+            # Stored answers are re-marked in the background
+            if answer_changed(previous_answer, question.is_correct_answer):
+                data["regrade_job_id"] = queue_regrade("reading", [question.id], request.user).id
+            return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # Delete a question
@@ -136,6 +153,7 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
     def destroy(self, request, pk=None):
         question = get_object_or_404(ReadingAcitivityQuestion, pk=pk)
         question.delete()
+        invalidate_reading_answer_key(question.reading_activity_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @has_permission("can_write_readingactivityquestion")
@@ -145,7 +163,8 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
         request_body=ReadingActivityQuestionCreateSerializer(many=True),
         responses={201: ReadingActivityQuestionListSerializer(many=True)}
     )
-    @action(detail=False, methods=['post'], url_path=r'(?P<question_type>\w+)')
+    # Never a bare id, so PUT/PATCH/DELETE on /<id>/ still reach the detail routes
+    @action(detail=False, methods=['post'], url_path=r'(?P<question_type>(?!\d+/)\w+)')
     def create_by_type(self, request, question_type=None):
         """
         Bulk create questions by type.
@@ -173,7 +192,8 @@ class ReadingActivityQuestionViewSet(viewsets.ViewSet):
                 item['bundle_id'] = bundle_id  # attach bundle_id
                 serializer = ReadingActivityQuestionCreateSerializer(data=item, context={'request': request})
                 serializer.is_valid(raise_exception=True)
-                serializer.save()
+                question = serializer.save()
+                invalidate_reading_answer_key(question.reading_activity_id)
                 created_questions.append(serializer.data)
 
         return Response({
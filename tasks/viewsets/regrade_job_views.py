@@ -0,0 +1,38 @@
+# tasks/viewsets/regrade_job_views.py
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from drf_yasg.utils import swagger_auto_schema
+
+from tasks.models import RegradeJob
+from tasks.serializers.regrade_job_serializers import RegradeJobSerializer
+from utils.paginator import CustomPageNumberPagination
+from utils.permissions import IsAdminUserType
+
+
+class RegradeJobViewSet(viewsets.ViewSet):
+    """
+    Progress of the background regrades started when a reading/listening
+    question's correct answer is edited.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUserType]
+
+    @swagger_auto_schema(
+        operation_description="List regrade jobs, newest first",
+        responses={200: RegradeJobSerializer(many=True)}
+    )
+    def list(self, request):
+        jobs = RegradeJob.objects.all()
+        paginator = CustomPageNumberPagination()
+        page = paginator.paginate_queryset(jobs, request)
+        serializer = RegradeJobSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Status and progress of one regrade job",
+        responses={200: RegradeJobSerializer(), 404: "Not Found"}
+    )
+    def retrieve(self, request, pk=None):
+        job = get_object_or_404(RegradeJob, pk=pk)
+        return Response(RegradeJobSerializer(job).data)
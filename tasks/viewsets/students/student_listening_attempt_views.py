@@ -2,6 +2,7 @@
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from django.http import HttpResponse
 from rest_framework.response import Response
 from django.utils import timezone
 from django.db import transaction
@@ -15,6 +16,13 @@ from tasks.models import (
     StudentListeningAnswer,
     StudentSpeakingAttempt
 )
+from tasks.answer_keys import get_listening_answer_key
+from tasks.submissions import answer_items_error, save_objective_answers
+from tasks.answer_queue import write_behind_enabled, enqueue_answers, flush_attempt_answers
+from tasks.progress import record_attempt_completion
+from tasks.results import get_result_payload, store_result_snapshot
+from master_settings.exam_pause import exam_pause_response
+from school.entitlements import subscription_gate_response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 class StudentListeningAttemptViewSet(viewsets.ViewSet):
@@ -61,6 +69,10 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=['post'])
     def start(self, request):
+        blocked = exam_pause_response(request.user) or subscription_gate_response(request.user)
+        if blocked:
+            return blocked
+
         listening_activity_id = request.data.get("listening_activity_id")
 
         if not listening_activity_id:
@@ -133,6 +145,11 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Checked before anything is queued: the drain can't answer back
+        answers_error = answer_items_error(answers)
+        if answers_error:
+            return Response({"detail": answers_error}, status=status.HTTP_400_BAD_REQUEST)
+
         attempt = StudentListeningAttempt.objects.filter(
             id=attempt_id,
             student=request.user
@@ -149,55 +166,29 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
             return Response({"detail": "No valid question_id provided"}, status=400)
 
         # -----------------------------
-        # 2️⃣ Fetch all questions in ONE query
+        # 2️⃣ Resolve questions from the cached answer key
         # -----------------------------
-        questions = ListeningActivityQuestion.objects.filter(id__in=question_ids)
-        question_map = {q.id: q for q in questions}
+        answer_key = get_listening_answer_key(attempt.listening_activity_id)
 
-        if len(question_map) != len(set(question_ids)):
+        if any(question_id not in answer_key for question_id in set(question_ids)):
             return Response({"detail": "One or more questions not found"}, status=404)
 
         # -----------------------------
-        # 3️⃣ Process answers
-        # -----------------------------
-        for item in answers:
-            question_id = item.get("question_id")
-            selected_answer = item.get("selected_answer")
-            if not question_id or not selected_answer:
-                continue
-
-            question = question_map.get(question_id)
-            is_correct = question.is_correct_answer.strip().lower() == selected_answer.strip().lower()
-
-            StudentListeningAnswer.objects.update_or_create(
-                attempt=attempt,
-                question=question,
-                defaults={
-                    "selected_answer": selected_answer,
-                    "is_correct": is_correct
-                }
-            )
-
-        # -----------------------------
-        # 4️⃣ Recalculate Score
+        # 3️⃣ Queue for the write-behind drain, or upsert answers +
+        #    recalculate score in one transaction
         # -----------------------------
-        correct_count = StudentListeningAnswer.objects.filter(
-            attempt=attempt,
-            is_correct=True
-        ).count()
-
-        attempt.correct_answers = correct_count
-        attempt.score = (correct_count / attempt.total_questions * 100) if attempt.total_questions > 0 else 0
+        if write_behind_enabled():
+            enqueue_answers("listening", attempt.id, answers)
+            return Response({
+                "total_questions": attempt.total_questions,
+                "queued": True
+            }, status=status.HTTP_202_ACCEPTED)
 
-        # Optional: Auto-complete attempt when all answered
-        if StudentListeningAnswer.objects.filter(attempt=attempt).count() == attempt.total_questions:
-            attempt.is_completed = True
-
-        attempt.save()
+        save_objective_answers(attempt, StudentListeningAnswer, answers, answer_key)
 
         return Response({
             "total_questions": attempt.total_questions,
-            "correct_answers": correct_count,
+            "correct_answers": attempt.correct_answers,
             "current_score": attempt.score,
             "is_completed": attempt.is_completed
         })
@@ -232,7 +223,6 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
         }
     )
     @action(detail=False, methods=['post'])
-    @transaction.atomic
     def complete(self, request):
         attempt_id = request.data.get("attempt_id")
 
@@ -244,6 +234,15 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
         if not attempt:
             return Response({"error": "Attempt not found"}, status=404)
 
+        # Queued answers must be in the database before scoring
+        if write_behind_enabled():
+            if not flush_attempt_answers("listening", attempt.id):
+                return Response(
+                    {"detail": "Your answers are still being saved, please try again."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            attempt.refresh_from_db()
+
         if attempt.is_completed:
             return Response({"message": "Already completed"})
 
@@ -264,7 +263,10 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
         attempt.score = score
         attempt.is_completed = True
         attempt.completed_at = timezone.now()
-        attempt.save()
+        with transaction.atomic():
+            attempt.save()
+            record_attempt_completion(attempt)
+        store_result_snapshot(attempt, request)
 
         return Response({
             "message": "Attempt completed",
@@ -305,78 +307,9 @@ class StudentListeningAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['get'])
     def result(self, request, pk=None):
-        # Fetch attempt
-        attempt = StudentListeningAttempt.objects.filter(
-            id=pk,
-            student=request.user
-        ).select_related("listening_activity") \
-        .prefetch_related("answers__question__listening_activity_part") \
-        .first()
-
-        if not attempt:
+        # Completed attempts are served from their stored snapshot
+        payload = get_result_payload("listening", pk, request)
+        if payload is None:
             return Response({"error": "Attempt not found"}, status=404)
 
-        answers = attempt.answers.all()
-
-        # Calculate duration
-        duration = None
-        if attempt.completed_at:
-            duration = int((attempt.completed_at - attempt.started_at).total_seconds())
-
-        activity = attempt.listening_activity
-
-        activity_detail = {
-            "id": activity.id,
-            "title": activity.title,
-            "duration": activity.duration,
-            "instruction": activity.instruction,
-            "audio_file": request.build_absolute_uri(activity.audio_file.url)
-            if activity.audio_file else request.build_absolute_uri("/media/default_audio.mp3")
-        }
-
-        answer_list = []
-        for answer in answers:
-            q = answer.question
-            part = None
-            part_audio = None
-            if q.listening_activity_part:
-                part = q.listening_activity_part.part
-                if q.listening_activity_part.audio_file:
-                    part_audio = request.build_absolute_uri(q.listening_activity_part.audio_file.url)
-
-            # Include all options and correct answer for all question types
-            options = {
-                "answer_1": q.answer_1,
-                "answer_2": q.answer_2,
-                "answer_3": q.answer_3,
-                "answer_4": q.answer_4,
-            }
-
-            correct_answer = q.is_correct_answer
-
-            answer_list.append({
-                "question_id": q.id,
-                "bundle_id": str(q.bundle_id),
-                "question": q.question,
-                "question_type": q.question_type,
-                "selected_answer": answer.selected_answer,
-                "is_correct": answer.is_correct,
-                "part": part,
-                "part_audio": part_audio,
-                "options": options,
-                "correct_answer": correct_answer,
-                # "created_at": answer.created_at if answer.created_at else None,  # ✅ use answer's created_at
-
-            })
-
-        return Response({
-            "attempt_id": attempt.id,
-            "activity": activity.title,
-            "activity_detail": activity_detail,
-            "total_questions": attempt.total_questions,
-            "correct_answers": attempt.correct_answers,
-            "score": attempt.score,
-            "is_completed": attempt.is_completed,
-            "duration_seconds": duration,
-            "answers": answer_list
-        })
\ No newline at end of file
+        return HttpResponse(payload, content_type="application/json")
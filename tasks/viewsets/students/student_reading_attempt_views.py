@@ -2,6 +2,7 @@
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from django.http import HttpResponse
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -11,10 +12,16 @@ from drf_yasg import openapi
 
 from tasks.models import (
     ReadingActivity,
-    ReadingAcitivityQuestion,
     StudentReadingAttempt,
     StudentReadingAnswer
 )
+from tasks.answer_keys import get_reading_answer_key
+from tasks.submissions import answer_items_error, save_objective_answers
+from tasks.answer_queue import write_behind_enabled, enqueue_answers, flush_attempt_answers
+from tasks.progress import record_attempt_completion
+from tasks.results import get_result_payload, store_result_snapshot
+from master_settings.exam_pause import exam_pause_response
+from school.entitlements import subscription_gate_response
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 
 class StudentReadingAttemptViewSet(viewsets.ViewSet):
@@ -63,6 +70,10 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=["post"], url_path="start")
     def start_attempt(self, request):
+        blocked = exam_pause_response(request.user) or subscription_gate_response(request.user)
+        if blocked:
+            return blocked
+
         reading_activity_id = request.data.get("reading_activity_id")
 
         if not reading_activity_id:
@@ -128,6 +139,11 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Checked before anything is queued: the drain can't answer back
+        answers_error = answer_items_error(answers)
+        if answers_error:
+            return Response({"detail": answers_error}, status=status.HTTP_400_BAD_REQUEST)
+
         attempt = get_object_or_404(
             StudentReadingAttempt,
             id=attempt_id,
@@ -156,70 +172,33 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
             )
 
         # -----------------------------
-        # 2️⃣ Fetch all questions in ONE query
+        # 2️⃣ Resolve questions from the cached answer key
         # -----------------------------
-        questions = ReadingAcitivityQuestion.objects.filter(
-            id__in=question_ids
-        )
-
-        question_map = {q.id: q for q in questions}
+        answer_key = get_reading_answer_key(attempt.reading_activity_id)
 
         # Validate missing questions
-        if len(question_map) != len(set(question_ids)):
+        if any(question_id not in answer_key for question_id in set(question_ids)):
             return Response(
                 {"detail": "One or more questions not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
         # -----------------------------
-        # 3️⃣ Process answers
-        # -----------------------------
-        for item in answers:
-            question_id = item.get("question_id")
-            selected_answer = item.get("selected_answer")
-
-            if not question_id or not selected_answer:
-                continue
-
-            question = question_map.get(question_id)
-
-            is_correct = (
-                selected_answer.strip().lower()
-                == question.is_correct_answer.strip().lower()
-            )
-
-            StudentReadingAnswer.objects.update_or_create(
-                attempt=attempt,
-                question=question,
-                defaults={
-                    "selected_answer": selected_answer,
-                    "is_correct": is_correct
-                }
-            )
-
-        # -----------------------------
-        # 4️⃣ Recalculate Score
+        # 3️⃣ Queue for the write-behind drain, or upsert answers +
+        #    recalculate score in one transaction
         # -----------------------------
-        correct_count = StudentReadingAnswer.objects.filter(
-            attempt=attempt,
-            is_correct=True
-        ).count()
-
-        attempt.correct_answers = correct_count
-        attempt.score = (
-            (correct_count / attempt.total_questions) * 100
-            if attempt.total_questions > 0 else 0
-        )
+        if write_behind_enabled():
+            enqueue_answers("reading", attempt.id, answers)
+            return Response({
+                "total_questions": attempt.total_questions,
+                "queued": True
+            }, status=status.HTTP_202_ACCEPTED)
 
-        # Optional: Auto-complete when all answered
-        if StudentReadingAnswer.objects.filter(attempt=attempt).count() == attempt.total_questions:
-            attempt.is_completed = True
-
-        attempt.save()
+        save_objective_answers(attempt, StudentReadingAnswer, answers, answer_key)
 
         return Response({
             "total_questions": attempt.total_questions,
-            "correct_answers": correct_count,
+            "correct_answers": attempt.correct_answers,
             "current_score": attempt.score,
             "is_completed": attempt.is_completed
         })
@@ -264,6 +243,15 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
             student=request.user
         )
 
+        # Queued answers must be in the database before scoring
+        if write_behind_enabled():
+            if not flush_attempt_answers("reading", attempt.id):
+                return Response(
+                    {"detail": "Your answers are still being saved, please try again."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            attempt.refresh_from_db()
+
         answered_count = attempt.answers.count()
 
         if answered_count < attempt.total_questions:
@@ -279,6 +267,8 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
         attempt.is_completed = True
         attempt.completed_at = timezone.now()
         attempt.save()
+        record_attempt_completion(attempt)
+        store_result_snapshot(attempt, request)
 
         return Response({
             "message": "Reading attempt completed successfully.",
@@ -322,75 +312,9 @@ class StudentReadingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['get'])
     def result(self, request, pk=None):
-        attempt = StudentReadingAttempt.objects.filter(
-            id=pk,
-            student=request.user
-        ).select_related("reading_activity").prefetch_related("answers__question").first()
-
-        if not attempt:
+        # Completed attempts are served from their stored snapshot
+        payload = get_result_payload("reading", pk, request)
+        if payload is None:
             return Response({"error": "Attempt not found"}, status=404)
 
-        answers = attempt.answers.all()
-
-        duration = None
-        if attempt.completed_at:
-            duration_delta = attempt.completed_at - attempt.started_at
-            duration = int(duration_delta.total_seconds())
-        def question_details(q):
-            qtype = getattr(q, "type", None)
-            base = {
-                "id": q.id,
-                "question": q.question,
-                "type": qtype,
-                "instruction": getattr(q, "instruction", None)
-            }
-
-            if qtype == "mcq":
-                options = [
-                    getattr(q, "answer_1", None),
-                    getattr(q, "answer_2", None),
-                    getattr(q, "answer_3", None),
-                    getattr(q, "answer_4", None),
-                ]
-                # filter out empty/None options
-                base["options"] = [o for o in options if o]
-            else:
-                # for other types just include the main question text (already present)
-                base["text"] = q.question
-
-            return base
-
-        # include detailed activity info for the frontend
-        activity = attempt.reading_activity
-        activity_detail = {
-            "id": getattr(activity, "id", None),
-            "title": getattr(activity, "title", None),
-            "passage": getattr(activity, "passage", None),
-            "instruction": getattr(activity, "instruction", None),
-            "duration": getattr(activity, "duration", None),
-            "file": request.build_absolute_uri(getattr(getattr(activity, "file", None), "url", None)),
-            "task": {
-                "id": getattr(getattr(activity, "task", None), "id", None),
-                "name": getattr(getattr(activity, "task", None), "name", None)
-            }
-        }
-
-        return Response({
-            "attempt_id": attempt.id,
-            "activity": attempt.reading_activity.title,
-            "activity_detail": activity_detail,
-            "total_questions": attempt.total_questions,
-            "correct_answers": attempt.correct_answers,
-            "score": attempt.score,
-            "is_completed": attempt.is_completed,
-            "duration_seconds": duration,
-            "answers": [
-                {
-                    "question": question_details(answer.question),
-                    "selected_answer": answer.selected_answer,
-                    "correct_answer": answer.question.is_correct_answer,
-                    "is_correct": answer.is_correct
-                }
-                for answer in answers
-            ]
-        })
\ No newline at end of file
+        return HttpResponse(payload, content_type="application/json")
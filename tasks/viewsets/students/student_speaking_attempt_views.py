@@ -2,6 +2,7 @@
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
@@ -15,6 +16,10 @@ from tasks.models import (
     StudentSpeakingAttempt,
     StudentSpeakingAnswer
 )
+from tasks.progress import record_attempt_completion
+from tasks.results import get_result_payload, store_result_snapshot
+from master_settings.exam_pause import exam_pause_response
+from school.entitlements import subscription_gate_response
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 
 class StudentSpeakingAttemptViewSet(viewsets.ViewSet):
@@ -60,6 +65,10 @@ class StudentSpeakingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=["post"], url_path="start")
     def start_attempt(self, request):
+        blocked = exam_pause_response(request.user) or subscription_gate_response(request.user)
+        if blocked:
+            return blocked
+
         speaking_activity_id = request.data.get("speaking_activity_id")
         if not speaking_activity_id:
             return Response(
@@ -185,6 +194,8 @@ class StudentSpeakingAttemptViewSet(viewsets.ViewSet):
         attempt.is_completed = True
         attempt.completed_at = timezone.now()
         attempt.save()
+        record_attempt_completion(attempt)
+        store_result_snapshot(attempt, request)
 
         return Response({
             "message": "Speaking attempt completed successfully",
@@ -226,23 +237,9 @@ class StudentSpeakingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['get'])
     def result(self, request, pk=None):
-        attempt = StudentSpeakingAttempt.objects.filter(id=pk, student=request.user).first()
-        if not attempt:
+        # Completed attempts are served from their stored snapshot
+        payload = get_result_payload("speaking", pk, request)
+        if payload is None:
             return Response({"error": "Attempt not found"}, status=404)
 
-        answers = attempt.answers.all()
-        return Response({
-            "attempt_id": attempt.id,
-            "activity": attempt.speaking_activity.title,
-            "is_completed": attempt.is_completed,
-            "score": attempt.score,
-            "feedback": attempt.feedback,
-            "answers": [
-                {
-                    "question": answer.question.text_question or answer.question.instruction,
-                    "audio_file": request.build_absolute_uri(answer.audio_file.url),
-                    "transcript": answer.transcript
-                }
-                for answer in answers
-            ]
-        })
\ No newline at end of file
+        return HttpResponse(payload, content_type="application/json")
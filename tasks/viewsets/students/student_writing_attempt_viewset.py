@@ -2,6 +2,7 @@
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from django.http import HttpResponse
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -14,6 +15,10 @@ from tasks.models import (
     StudentWritingAttempt,
     StudentWritingAnswer
 )
+from tasks.progress import record_attempt_completion
+from tasks.results import get_result_payload, store_result_snapshot
+from master_settings.exam_pause import exam_pause_response
+from school.entitlements import subscription_gate_response
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 
 class StudentWritingAttemptViewSet(viewsets.ViewSet):
@@ -58,6 +63,10 @@ class StudentWritingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=False, methods=["post"], url_path="start")
     def start_attempt(self, request):
+        blocked = exam_pause_response(request.user) or subscription_gate_response(request.user)
+        if blocked:
+            return blocked
+
         writing_activity_id = request.data.get("writing_activity_id")
         if not writing_activity_id:
             return Response({"detail": "writing_activity_id is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -163,6 +172,8 @@ class StudentWritingAttemptViewSet(viewsets.ViewSet):
         attempt.is_completed = True
         attempt.completed_at = timezone.now()
         attempt.save()
+        record_attempt_completion(attempt)
+        store_result_snapshot(attempt, request)
 
         return Response({
             "message": "Writing attempt completed successfully.",
@@ -201,23 +212,9 @@ class StudentWritingAttemptViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['get'])
     def result(self, request, pk=None):
-        attempt = StudentWritingAttempt.objects.filter(id=pk, student=request.user).first()
-        if not attempt:
+        # Completed attempts are served from their stored snapshot
+        payload = get_result_payload("writing", pk, request)
+        if payload is None:
             return Response({"error": "Attempt not found"}, status=404)
 
-        submissions = attempt.submissions.all()
-        return Response({
-            "attempt_id": attempt.id,
-            "activity": attempt.writing_activity.title,
-            "is_completed": attempt.is_completed,
-            "score": attempt.score,
-            "feedback": attempt.feedback,
-            "submissions": [
-                {
-                    "submission_text": s.submission_text,
-                    "file": request.build_absolute_uri(s.file.url) if s.file else None,
-                    "created_at": s.created_at
-                }
-                for s in submissions
-            ]
-        })
\ No newline at end of file
+        return HttpResponse(payload, content_type="application/json")
@@ -2,7 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from tasks.models import Task, SpeakingActivity, speakingActivitySample, UserTaskProgress, ListeningActivity, ReadingActivity, WritingActivity
+from tasks.models import Task, SpeakingActivity, speakingActivitySample, StudentNextTask, ListeningActivity, ReadingActivity, WritingActivity
+from tasks.progress import refresh_next_task
 from tasks.serializers.task_serializers import TaskSerializer
 from tasks.serializers.speaking_activity_serializers import SpeakingActivityDropdownSerializer
 from tasks.serializers.listening_activity_serializers import ListeningActivityDropdownSerializer
@@ -15,6 +16,7 @@ from django.utils.dateparse import parse_date
 
 from utils.paginator import CustomPageNumberPagination, TeNPageNumberPagination
 from utils.decorators import has_permission
+from utils.search import search_queryset
 # ------------------------------
 # Task ViewSet
 # ------------------------------
@@ -40,7 +42,7 @@ class TaskViewSet(viewsets.ViewSet):
 
         # ---- Filtering ----
         if search:
-            tasks = tasks.filter(name__icontains=search)
+            tasks = search_queryset(tasks, search, ["name"])
 
         if grade:
             tasks = tasks.filter(grade=grade)
@@ -140,68 +142,39 @@ class TaskViewSet(viewsets.ViewSet):
 
         grade = user.userprofile.grade
 
-        # Check if the user has an incomplete task (not all activities done)
-        incomplete_progress = (
-            UserTaskProgress.objects
-            .filter(user_id=user.id, task__grade=grade)
-            .exclude(
-                did_completed_speaking_activity=True,
-                did_completed_reading_activity=True,
-                did_completed_listening_activity=True,
-                did_completed_writing_activity=True,
-            )
-            .order_by('-task__id')
+        # Stored pointer, maintained on every attempt completion (tasks.progress)
+        pointer = (
+            StudentNextTask.objects
+            .select_related('task', 'progress')
+            .filter(user=user)
             .first()
         )
+        if pointer is None or pointer.grade != grade:
+            pointer = refresh_next_task(user.id, grade)
 
-        if incomplete_progress:
-            # User still has an in-progress task — return it with progress data
-            serializer = TaskSerializer(incomplete_progress.task, context={'request': request})
-            return Response({
-                **serializer.data,
-                "progress": {
-                    "id": incomplete_progress.id,
-                    "did_completed_speaking_activity": incomplete_progress.did_completed_speaking_activity,
-                    "did_completed_reading_activity": incomplete_progress.did_completed_reading_activity,
-                    "did_completed_listening_activity": incomplete_progress.did_completed_listening_activity,
-                    "did_completed_writing_activity": incomplete_progress.did_completed_writing_activity,
-                    "last_updated": incomplete_progress.last_updated,
-                },
-            })
-
-        # All previous tasks are fully completed — find the last one
-        last_progress = (
-            UserTaskProgress.objects
-            .filter(user_id=user.id, task__grade=grade)
-            .order_by('-task__id')
-            .first()
-        )
-
-        if last_progress:
-            # Get the next task after the last completed one
-            next_task = (
-                Task.objects
-                .filter(grade=grade, id__gt=last_progress.task_id)
-                .order_by('id')
-                .first()
-            )
-        else:
-            # No progress yet — return the first task for this grade
-            next_task = (
-                Task.objects
-                .filter(grade=grade)
-                .order_by('id')
-                .first()
-            )
-
-        if not next_task:
+        if not pointer.task:
             return Response(
                 {"detail": "No more tasks available for this grade"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = TaskSerializer(next_task, context={'request': request})
-        return Response(serializer.data)
+        serializer = TaskSerializer(pointer.task, context={'request': request})
+        progress = pointer.progress
+        if not progress:
+            return Response(serializer.data)
+
+        # User still has an in-progress task — return it with progress data
+        return Response({
+            **serializer.data,
+            "progress": {
+                "id": progress.id,
+                "did_completed_speaking_activity": progress.did_completed_speaking_activity,
+                "did_completed_reading_activity": progress.did_completed_reading_activity,
+                "did_completed_listening_activity": progress.did_completed_listening_activity,
+                "did_completed_writing_activity": progress.did_completed_writing_activity,
+                "last_updated": progress.last_updated,
+            },
+        })
 
 
     # Get task activity details by type
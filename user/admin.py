@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, UserProfile, ResetPassword,FocalPerson,SchoolStudentParent,School
+from .models import User, UserProfile, ResetPassword,FocalPerson,SchoolStudentParent,School,ProvisioningJob
 
 # -------------------------
 # Custom User Admin
@@ -175,6 +175,15 @@ class SchoolStudentParentAdmin(admin.ModelAdmin):
     list_filter = ('school',)
 
 # Register the models
+@admin.register(ProvisioningJob)
+class ProvisioningJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'created_count', 'failed_count', 'total_rows', 'created_at', 'finished_at']
+    list_filter = ['status']
+    # rows can still hold passwords of a job in progress
+    exclude = ['rows']
+    readonly_fields = [field.name for field in ProvisioningJob._meta.fields if field.name != 'rows']
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(UserProfile, UserProfileAdmin)
 admin.site.register(ResetPassword, ResetPasswordAdmin)
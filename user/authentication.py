@@ -0,0 +1,84 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from django.db.models import OuterRef, Subquery
+
+from user.models import School, SchoolStudentParent
+
+
+class UserContextJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads the user and its UserProfile in one
+    query, so permission classes and views read ``request.user.userprofile``
+    without fetching it again. The same query brings the school a student
+    is enrolled in (see get_student_school_id).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = (
+                self.user_model.objects
+                .select_related("userprofile")
+                .annotate(_student_school_id=Subquery(
+                    SchoolStudentParent.objects
+                    .filter(student=OuterRef("pk"))
+                    .order_by("id")
+                    .values("school_id")[:1]
+                ))
+                .get(**{api_settings.USER_ID_FIELD: user_id})
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+def get_user_profile(user):
+    """The user's UserProfile, or None if it has none."""
+    return getattr(user, "userprofile", None)
+
+
+def get_user_school(user):
+    """
+    The School owned by ``user`` (School.user), or None. Loaded on first
+    use and kept on the user object for the rest of the request.
+    """
+    if not hasattr(user, "_owned_school"):
+        user._owned_school = School.objects.filter(user=user).first()
+    return user._owned_school
+
+
+def get_student_school_id(user):
+    """
+    Id of the school ``user`` is enrolled in as a student, or None.
+    Comes with the user from UserContextJWTAuthentication; otherwise
+    loaded on first use and kept on the user object.
+    """
+    if not hasattr(user, "_student_school_id"):
+        user._student_school_id = (
+            SchoolStudentParent.objects
+            .filter(student=user)
+            .order_by("id")
+            .values_list("school_id", flat=True)
+            .first()
+        )
+    return user._student_school_id
@@ -0,0 +1,170 @@
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt
+
+
+# -----------------------------
+# Google ID-token verification
+# Tokens are verified locally against Google's signing certificates.
+# The certificates are kept in process and in the shared cache for as
+# long as Google's Cache-Control allows, so a login normally costs no
+# outbound request; they are fetched again when they expire or when a
+# token names a key id we don't have yet (Google rotated its keys).
+# -----------------------------
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+CERTS_CACHE_KEY = "google_oauth2_certs"
+# Used when the response has no usable max-age
+DEFAULT_CERTS_MAX_AGE = 60 * 60
+# Unknown key ids refetch at most this often, so forged kids can't
+# turn every login into a request to Google
+MIN_REFRESH_INTERVAL = 60
+FETCH_TIMEOUT = 5
+CLOCK_SKEW = 10
+
+
+class GoogleTokenError(ValueError):
+    """The token is malformed, expired, not for us, or not signed by Google."""
+
+
+# -----------------------------
+# Key sources
+# -----------------------------
+
+class HttpKeySource:
+    """Google's published certificates, with the max-age they may be kept."""
+
+    def __init__(self, url=GOOGLE_CERTS_URL):
+        self.url = url
+
+    def fetch(self):
+        response = requests.get(self.url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json(), self._max_age(response.headers)
+
+    @staticmethod
+    def _max_age(headers):
+        match = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+        if not match:
+            return DEFAULT_CERTS_MAX_AGE
+        try:
+            age = int(headers.get("Age", 0))
+        except ValueError:
+            age = 0
+        return max(int(match.group(1)) - age, 0)
+
+
+class StaticKeySource:
+    """A fixed set of {key id: PEM certificate}, for tests and offline use."""
+
+    def __init__(self, certs, max_age=DEFAULT_CERTS_MAX_AGE):
+        self.certs = dict(certs)
+        self.max_age = max_age
+
+    def fetch(self):
+        return dict(self.certs), self.max_age
+
+
+# -----------------------------
+# Certificate store
+# -----------------------------
+
+class CertificateStore:
+    """
+    Certificates from ``source``, cached in process and under
+    ``cache_key`` in the shared cache until their max-age runs out.
+    """
+
+    def __init__(self, source, cache_key=CERTS_CACHE_KEY):
+        self.source = source
+        self.cache_key = cache_key
+        self._certs = {}
+        self._expires_at = 0
+        self._refreshed_at = 0
+        self._lock = threading.Lock()
+
+    def get(self, key_id=None):
+        if time.time() >= self._expires_at:
+            self._load()
+        if key_id and key_id not in self._certs:
+            self._refresh()
+        return self._certs
+
+    def _load(self):
+        cached = cache.get(self.cache_key)
+        if cached is not None and cached["expires_at"] > time.time():
+            self._certs, self._expires_at = cached["certs"], cached["expires_at"]
+        else:
+            self._refresh()
+
+    def _refresh(self):
+        with self._lock:
+            now = time.time()
+            if now - self._refreshed_at < MIN_REFRESH_INTERVAL and self._certs:
+                return
+            certs, max_age = self.source.fetch()
+            self._certs, self._expires_at = certs, now + max_age
+            self._refreshed_at = now
+            if max_age:
+                cache.set(self.cache_key, {"certs": certs, "expires_at": self._expires_at}, max_age)
+
+
+# -----------------------------
+# Verifier
+# -----------------------------
+
+class GoogleIdTokenVerifier:
+
+    def __init__(self, audience, store):
+        self.audience = list(audience)
+        self.store = store
+
+    def verify(self, token):
+        """Returns the token's claims, or raises GoogleTokenError."""
+        if not self.audience:
+            raise GoogleTokenError("Google sign-in is not configured.")
+
+        try:
+            header = jwt.decode_header(token)
+            certs = self.store.get(header.get("kid"))
+            claims = jwt.decode(
+                token,
+                certs=certs,
+                audience=self.audience,
+                clock_skew_in_seconds=CLOCK_SKEW,
+            )
+        except (ValueError, google_exceptions.GoogleAuthError) as exc:
+            raise GoogleTokenError(str(exc)) from exc
+        except requests.RequestException as exc:
+            raise GoogleTokenError("Could not load Google's signing keys.") from exc
+
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise GoogleTokenError("Wrong issuer.")
+        if not claims.get("email") or not claims.get("email_verified"):
+            raise GoogleTokenError("Google account email is not verified.")
+        return claims
+
+
+_default_store = None
+
+
+def get_google_verifier():
+    """
+    The verifier for settings.GOOGLE_CLIENT_IDS. Keys come from
+    settings.GOOGLE_CERTS_SOURCE (dotted path to a key source factory)
+    when set, else from Google.
+    """
+    global _default_store
+    if _default_store is None:
+        source_path = getattr(settings, "GOOGLE_CERTS_SOURCE", None)
+        source = import_string(source_path)() if source_path else HttpKeySource()
+        _default_store = CertificateStore(source)
+    return GoogleIdTokenVerifier(getattr(settings, "GOOGLE_CLIENT_IDS", []), _default_store)
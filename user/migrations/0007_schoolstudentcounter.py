@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    School = apps.get_model('user', 'School')
+    SchoolStudentParent = apps.get_model('user', 'SchoolStudentParent')
+    SchoolStudentCounter = apps.get_model('user', 'SchoolStudentCounter')
+
+    counts = {
+        row['school_id']: row
+        for row in SchoolStudentParent.objects.values('school_id').annotate(
+            student_count=models.Count('student', distinct=True),
+            parent_count=models.Count('parent', distinct=True),
+            relation_count=models.Count('id'),
+        )
+    }
+    SchoolStudentCounter.objects.bulk_create([
+        SchoolStudentCounter(
+            school_id=school_id,
+            student_count=counts.get(school_id, {}).get('student_count', 0),
+            parent_count=counts.get(school_id, {}).get('parent_count', 0),
+            relation_count=counts.get(school_id, {}).get('relation_count', 0),
+        )
+        for school_id in School.objects.values_list('id', flat=True)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_school_is_deleted_school_is_disabled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolStudentCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('parent_count', models.PositiveIntegerField(default=0)),
+                ('relation_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('school', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='student_counter', to='user.school')),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_schoolstudentcounter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schoolstudentparent',
+            name='parent',
+            field=models.ForeignKey(blank=True, limit_choices_to={'userprofile__user_type': 'parent'}, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='parent_school_relations', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='schoolstudentparent',
+            constraint=models.UniqueConstraint(condition=models.Q(('parent__isnull', True)), fields=('student', 'school'), name='unique_student_school_without_parent'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+# GIN trigram indexes on UPPER(column), the expression icontains compiles
+# to on PostgreSQL (see utils.search). Built concurrently so the tables
+# stay writable; other databases skip them.
+TRIGRAM_INDEXES = {
+    "User": ["email", "username", "name", "first_name", "last_name"],
+    "School": ["name", "email", "code", "city", "address"],
+}
+
+
+def search_indexes():
+    for model_name, fields in TRIGRAM_INDEXES.items():
+        for field in fields:
+            yield model_name, GinIndex(
+                OpClass(Upper(field), name="gin_trgm_ops"),
+                name=f"{model_name.lower()}_{field}_trgm",
+            )
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in search_indexes():
+        schema_editor.add_index(apps.get_model("user", model_name), index, concurrently=True)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in search_indexes():
+        schema_editor.remove_index(apps.get_model("user", model_name), index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('user', '0008_schoolstudentparent_optional_parent'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -157,18 +157,58 @@ class SchoolStudentParent(models.Model):
         limit_choices_to={'userprofile__user_type': 'student'}
     )
     school = models.ForeignKey(School, on_delete=models.CASCADE)
+    # Empty until a registered parent is linked; students are enrolled
+    # by their school without one
     parent = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='parent_school_relations', 
-        limit_choices_to={'userprofile__user_type': 'parent'}
+        limit_choices_to={'userprofile__user_type': 'parent'},
+        null=True,
+        blank=True
     )
 
     class Meta:
         unique_together = ('student', 'school', 'parent')
+        constraints = [
+            # NULLs are distinct to unique_together: one parentless row per enrolment
+            models.UniqueConstraint(
+                fields=['student', 'school'],
+                condition=models.Q(parent__isnull=True),
+                name='unique_student_school_without_parent',
+            ),
+        ]
+
+    def __str__(self):
+        parent_email = self.parent.email if self.parent else None
+        return f"{self.student.email} - {parent_email} @ {self.school.name}"
+
+
+class SchoolStudentCounter(models.Model):
+    """
+    Denormalized SchoolStudentParent counts per school, kept current by
+    user.signals so school listings don't aggregate the junction table.
+    """
+    school = models.OneToOneField(School, on_delete=models.CASCADE, related_name='student_counter')
+    student_count = models.PositiveIntegerField(default=0)
+    parent_count = models.PositiveIntegerField(default=0)
+    relation_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.student.email} - {self.parent.email} @ {self.school.name}"
+        return f"{self.school.name}: {self.student_count} students / {self.parent_count} parents"
+
+    @classmethod
+    def refresh(cls, school_id):
+        """Recounts one school's relations and stores the result."""
+        counts = SchoolStudentParent.objects.filter(school_id=school_id).aggregate(
+            student_count=models.Count('student', distinct=True),
+            parent_count=models.Count('parent', distinct=True),
+            relation_count=models.Count('id'),
+        )
+        updated = cls.objects.filter(school_id=school_id).update(**counts)
+        if not updated and School.objects.filter(id=school_id).exists():
+            cls.objects.get_or_create(school_id=school_id, defaults=counts)
 
 
 class FocalPerson(models.Model):
@@ -198,4 +238,40 @@ class CustomPermissionClass(models.Model):
     role = models.ForeignKey(CustomRole, on_delete=models.CASCADE, related_name='permissions')
     
     def __str__(self):
-        return f"Permission: {self.name or 'Unnamed'} (Role: {self.role})"
\ No newline at end of file
+        return f"Permission: {self.name or 'Unnamed'} (Role: {self.role})"
+
+class ProvisioningJob(models.Model):
+    """
+    Bulk creation of organization users (see user.org_provisioning). Runs
+    on django-q a chunk of rows at a time; ``row_cursor`` lets a run that
+    hits its time budget resume where it stopped, and ``report`` holds a
+    result per processed row. Passwords are removed from ``rows`` once
+    their chunk is done.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    rows = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+
+    total_rows = models.PositiveIntegerField(default=0)
+    row_cursor = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    report = models.JSONField(default=list)
+
+    error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Provisioning job #{self.pk} ({self.status})"
@@ -0,0 +1,280 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from school.signals import schedule_dashboard_refresh
+from user.models import User, UserProfile, School, CustomRole, ProvisioningJob
+from user.serializers.organization_user_serializers import OrganizationUserRowSerializer
+from utils.permission_cache import invalidate_permissions
+
+
+# Users accepted per provisioning request
+MAX_PROVISION_ROWS = 2000
+
+# -----------------------------
+# A password hash costs around half a second of CPU by design, so users
+# are created by a ProvisioningJob on django-q, PROVISION_CHUNK_SIZE rows
+# per transaction. A run stops after PROVISION_TIME_BUDGET seconds (its
+# last chunk included, it stays below Q_CLUSTER's timeout) and queues
+# itself again to carry on from the job's cursor. A chunk's passwords
+# are hashed on HASH_WORKERS threads: hashlib releases the GIL while it
+# hashes, and threads don't fork the worker the way a process pool does.
+# -----------------------------
+PROVISION_CHUNK_SIZE = 25
+PROVISION_TIME_BUDGET = 30
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+# An email or school can be taken between validating a chunk and
+# inserting it; the chunk is then validated again, this often.
+INSERT_ATTEMPTS = 3
+
+
+# -----------------------------
+# Validation
+# -----------------------------
+
+def _error(number, errors):
+    return {"row": number, "status": "error", "errors": errors}
+
+
+def validate_rows(rows, start=1):
+    """
+    Validates every row in memory, numbering them from ``start``.
+    Returns (valid, roles, schools, report):
+    ``valid`` is a list of (row_number, validated_data), ``roles`` and
+    ``schools`` the referenced rows by id, and ``report`` an error entry
+    per rejected row. Emails, roles and schools are each checked with a
+    single query.
+    """
+    valid, report = [], {}
+    for number, row in enumerate(rows, start=start):
+        serializer = OrganizationUserRowSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data["email"] = User.objects.normalize_email(data["email"])
+            valid.append((number, data))
+        else:
+            report[number] = _error(number, serializer.errors)
+
+    existing = set(
+        User.objects
+        .filter(email__in=[data["email"] for _, data in valid])
+        .values_list("email", flat=True)
+    )
+    roles = (
+        CustomRole.objects
+        .select_related("group")
+        .filter(is_active=True)
+        .in_bulk({data["role_id"] for _, data in valid})
+    )
+    schools = School.objects.in_bulk({
+        data["school_id"] for _, data in valid
+        if data.get("user_type") == "school" and data.get("school_id")
+    })
+
+    seen = set()
+    claimed = set()
+    accepted = []
+    for number, data in valid:
+        email = data["email"]
+        school = schools.get(data.get("school_id")) if data.get("user_type") == "school" else None
+        if email in existing:
+            report[number] = _error(number, {"email": ["User already exists"]})
+        elif email in seen:
+            report[number] = _error(number, {"email": ["Duplicate email in this request."]})
+        elif data["role_id"] not in roles:
+            report[number] = _error(number, {"role_id": ["Invalid role"]})
+        elif school is not None and school.user_id:
+            report[number] = _error(number, {"school_id": ["School already has a user"]})
+        elif school is not None and school.id in claimed:
+            report[number] = _error(number, {"school_id": ["Another user in this request claims this school."]})
+        else:
+            seen.add(email)
+            if school is not None:
+                claimed.add(school.id)
+            accepted.append((number, data))
+    return accepted, roles, schools, report
+
+
+# -----------------------------
+# Provisioning
+# -----------------------------
+
+def _insert(valid, roles, schools, hashes):
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                username=User.normalize_username(data["email"]),
+                email=data["email"],
+                password=password_hash,
+                name=data.get("name"),
+            )
+            for (_, data), password_hash in zip(valid, hashes)
+        ])
+
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(
+                user=user,
+                bio=data.get("bio", ""),
+                display_name=data.get("display_name"),
+                phone_number=data.get("phone_number"),
+                address=data.get("address"),
+                user_type=data.get("user_type"),
+                is_verified=data["is_verified"],
+                is_disabled=data["is_disabled"],
+                is_deleted=data["is_deleted"],
+                is_active=data["is_active"],
+                grade=data.get("grade"),
+                section=data.get("section"),
+                dateofbirth=data.get("dateofbirth"),
+                student_parent_name=data.get("student_parent_name"),
+                student_parent_email=data.get("student_parent_email"),
+                student_parent_phone_number=data.get("student_parent_phone_number"),
+            )
+            for user, (_, data) in zip(users, valid)
+        ])
+
+        CustomRole.user.through.objects.bulk_create([
+            CustomRole.user.through(customrole_id=data["role_id"], user_id=user.id)
+            for user, (_, data) in zip(users, valid)
+        ])
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.id, group_id=roles[data["role_id"]].group_id)
+            for user, (_, data) in zip(users, valid)
+            if roles[data["role_id"]].group_id
+        ])
+
+        # Only schools without a user; validate_rows rejected the rest.
+        # The filter on user=None keeps a school claimed meanwhile.
+        for user, (_, data) in zip(users, valid):
+            if data.get("user_type") == "school" and data.get("school_id") in schools:
+                School.objects.filter(pk=data["school_id"], user__isnull=True).update(user=user)
+
+        # bulk_create skips the signals that keep these current
+        invalidate_permissions()
+        if any(profile.user_type == "student" for profile in profiles):
+            schedule_dashboard_refresh(timezone.localdate())
+
+    return users, profiles
+
+
+def hash_passwords(passwords):
+    """make_password for each of ``passwords``, in order."""
+    if HASH_WORKERS < 2 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        return list(pool.map(make_password, passwords))
+
+
+def queue_provisioning(rows, user=None):
+    """
+    Records a ProvisioningJob for ``rows`` and starts it once the current
+    transaction commits. Returns the job.
+    """
+    job = ProvisioningJob.objects.create(
+        rows=rows,
+        total_rows=len(rows),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: async_task("user.tasks.run_provisioning_job", job.pk))
+    return job
+
+
+def _record_chunk(job, start, rows, report):
+    entries = [report[number] for number in sorted(report)]
+    created = sum(1 for entry in entries if entry["status"] == "created")
+    for row in rows:
+        row.pop("password", None)
+
+    job.report.extend(entries)
+    job.created_count += created
+    job.failed_count += len(entries) - created
+    job.row_cursor = start + len(rows)
+    job.save(update_fields=["rows", "report", "created_count", "failed_count", "row_cursor"])
+
+
+def _provision_chunk(job, start, rows):
+    """
+    Creates the valid users among ``rows``, job.rows[start:], and records
+    their results on the job in the same transaction.
+    """
+    valid, roles, schools, report = validate_rows(rows, start=start + 1)
+    # Hashed before the transaction opens, and kept across retries
+    hashes = dict(zip(
+        [number for number, _ in valid],
+        hash_passwords([data["password"] for _, data in valid]),
+    ))
+
+    for _ in range(INSERT_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                # A retried run of the same job may have done this chunk
+                cursor = ProvisioningJob.objects.select_for_update().values_list("row_cursor", flat=True).get(pk=job.pk)
+                if cursor != start:
+                    job.refresh_from_db()
+                    return
+
+                if valid:
+                    users, profiles = _insert(valid, roles, schools, [hashes[number] for number, _ in valid])
+                    for (number, data), user, profile in zip(valid, users, profiles):
+                        report[number] = {
+                            "row": number,
+                            "status": "created",
+                            "user_id": user.id,
+                            "email": user.email,
+                            "role": roles[data["role_id"]].role,
+                            "profile_id": profile.id,
+                        }
+                _record_chunk(job, start, rows, report)
+            return
+        except IntegrityError:
+            valid, roles, schools, report = validate_rows(rows, start=start + 1)
+
+    for number, _ in valid:
+        report[number] = _error(number, {"non_field_errors": [
+            "Could not be saved while other users were being created; send this row again."
+        ]})
+    with transaction.atomic():
+        _record_chunk(job, start, rows, report)
+
+
+def run_provisioning(job_id):
+    """
+    Works through the job's rows until they are done or the time budget
+    runs out, in which case the rest is queued as a new run. Each chunk
+    is created in one transaction; invalid rows are reported and skipped.
+    """
+    job = ProvisioningJob.objects.filter(pk=job_id, status__in=["pending", "running"]).first()
+    if job is None:
+        return
+
+    if job.status == "pending":
+        job.status = "running"
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+
+    deadline = time.monotonic() + PROVISION_TIME_BUDGET
+    try:
+        while job.row_cursor < job.total_rows:
+            if time.monotonic() >= deadline:
+                async_task("user.tasks.run_provisioning_job", job.pk)
+                return
+            start = job.row_cursor
+            _provision_chunk(job, start, job.rows[start:start + PROVISION_CHUNK_SIZE])
+    except Exception as exc:
+        # The passwords of rows never reached aren't kept either
+        for row in job.rows:
+            row.pop("password", None)
+        job.status = "failed"
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["rows", "status", "error", "finished_at"])
+        raise
+
+    job.status = "completed"
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at"])
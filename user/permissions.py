@@ -2,7 +2,7 @@ from rest_framework.permissions import BasePermission
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import PermissionDenied
 from utils.permissions import permission_checking
-from user.models import UserProfile
+from user.authentication import get_user_profile
 
 from rest_framework.permissions import BasePermission
 
@@ -55,11 +55,10 @@ class IsAdminOrSuperAdmin(BasePermission):
             return False
         user_type = request.auth.get('user_type') if request.auth else None
         if not user_type:
-            try:
-                profile = UserProfile.objects.get(user=request.user)
-                user_type = profile.user_type
-            except UserProfile.DoesNotExist:
+            profile = get_user_profile(request.user)
+            if profile is None:
                 return False
+            user_type = profile.user_type
         return user_type in ['admin', 'superadmin']
 
 class IsAdminOrSuperAdminAllMethods(BasePermission):
@@ -71,11 +70,10 @@ class IsAdminOrSuperAdminAllMethods(BasePermission):
             return False
         user_type = request.auth.get('user_type') if request.auth else None
         if not user_type:
-            try:
-                profile = UserProfile.objects.get(user=request.user)
-                user_type = profile.user_type
-            except UserProfile.DoesNotExist:
+            profile = get_user_profile(request.user)
+            if profile is None:
                 return False
+            user_type = profile.user_type
         return user_type in ['admin', 'superadmin']
 
 class IsAdminOrSuperAdminForPostPatchDelete(BasePermission):
@@ -89,11 +87,10 @@ class IsAdminOrSuperAdminForPostPatchDelete(BasePermission):
         if request.method in ['POST', 'PATCH', 'DELETE']:
             user_type = request.auth.get('user_type') if request.auth else None
             if not user_type:
-                try:
-                    profile = UserProfile.objects.get(user=request.user)
-                    user_type = profile.user_type
-                except UserProfile.DoesNotExist:
+                profile = get_user_profile(request.user)
+                if profile is None:
                     return False
+                user_type = profile.user_type
             return user_type in ['admin', 'superadmin']
         return True  # Allow GET (list, retrieve) for all authenticated users
 
@@ -104,11 +101,10 @@ class IsOwnerOrSuperAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         user_type = request.auth.get('user_type') if request.auth else None
         if not user_type:
-            try:
-                profile = UserProfile.objects.get(user=request.user)
-                user_type = profile.user_type
-            except UserProfile.DoesNotExist:
+            profile = get_user_profile(request.user)
+            if profile is None:
                 return False
+            user_type = profile.user_type
         return user_type == 'superadmin' or obj.user == request.user
     
 class IsAdminOrSuperAdminForPatchDelete(BasePermission):
@@ -122,11 +118,10 @@ class IsAdminOrSuperAdminForPatchDelete(BasePermission):
         if request.method in ['POST', 'PATCH', 'DELETE']:
             user_type = request.auth.get('user_type') if request.auth else None
             if not user_type:
-                try:
-                    profile = UserProfile.objects.get(user=request.user)
-                    user_type = profile.user_type
-                except UserProfile.DoesNotExist:
+                profile = get_user_profile(request.user)
+                if profile is None:
                     return False
+                user_type = profile.user_type
             return user_type in ['admin', 'superadmin']
         return True 
     
@@ -0,0 +1,73 @@
+from rest_framework import serializers
+
+from user.models import USER_TYPE_CHOICES, ProvisioningJob
+
+
+# ===============================
+# ORGANIZATION USER ROW SERIALIZER
+# One user of a bulk provisioning request; same fields as
+# CreateOrganizationUserAPIView takes.
+# ===============================
+
+class OrganizationUserRowSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    password = serializers.CharField(trim_whitespace=False)
+    role_id = serializers.IntegerField()
+
+    name = serializers.CharField(required=False, max_length=255)
+    user_type = serializers.ChoiceField(choices=USER_TYPE_CHOICES, required=False)
+
+    bio = serializers.CharField(required=False)
+    display_name = serializers.CharField(required=False, max_length=100)
+    phone_number = serializers.CharField(required=False, max_length=15)
+    address = serializers.CharField(required=False, max_length=255)
+    dateofbirth = serializers.DateField(required=False)
+
+    is_verified = serializers.BooleanField(default=False)
+    is_disabled = serializers.BooleanField(default=False)
+    is_deleted = serializers.BooleanField(default=False)
+    is_active = serializers.BooleanField(default=True)
+
+    grade = serializers.CharField(required=False, max_length=255)
+    section = serializers.CharField(required=False, max_length=255)
+    student_parent_name = serializers.CharField(required=False, max_length=255)
+    student_parent_email = serializers.EmailField(required=False)
+    student_parent_phone_number = serializers.CharField(required=False)
+
+    school_id = serializers.IntegerField(required=False)
+
+    def validate_user_type(self, value):
+        # Super admins are never created through provisioning
+        if value == "superadmin":
+            raise serializers.ValidationError("Super admin users cannot be created here.")
+        return value
+
+
+# ===============================
+# PROVISIONING JOB SERIALIZERS
+# ===============================
+
+class ProvisioningJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProvisioningJob
+        fields = [
+            'id', 'status', 'progress', 'total_rows', 'created_count', 'failed_count',
+            'error', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def get_progress(self, obj):
+        # Percentage of rows processed
+        if obj.status == "completed":
+            return 100
+        if not obj.total_rows:
+            return 0
+        return round(obj.row_cursor * 100 / obj.total_rows)
+
+
+class ProvisioningJobDetailSerializer(ProvisioningJobSerializer):
+    """With the result of every processed row, in row order."""
+
+    class Meta(ProvisioningJobSerializer.Meta):
+        fields = ProvisioningJobSerializer.Meta.fields + ['report']
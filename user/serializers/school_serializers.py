@@ -5,7 +5,7 @@ from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
-from user.models import User, UserProfile, School, Country, Province, District, FocalPerson, SchoolStudentParent
+from user.models import User, UserProfile, School, Country, Province, District, FocalPerson, SchoolStudentCounter
 from school.models import Subscription  # updated import
 from utils.urlsfixer import build_https_url
 from user.serializers.address_serializers import ProvinceSerializer, CountrySerializer, DistrictSerializer
@@ -234,6 +234,30 @@ def resolve_subscription_status(subscription):
     return "inactive"
 
 
+# ─────────────────────────────────────────
+# Shared helpers — prefetched relations
+# SchoolViewSet loads focal person, subscription and the
+# SchoolStudentCounter with the page, so these don't query per row.
+# ─────────────────────────────────────────
+
+def get_school_subscription(school):
+    try:
+        return school.subscription
+    except Subscription.DoesNotExist:
+        return None
+
+
+def get_school_focal_person(school):
+    return next(iter(school.focalperson_set.all()), None)
+
+
+def get_school_counter(school):
+    try:
+        return school.student_counter
+    except SchoolStudentCounter.DoesNotExist:
+        return None
+
+
 # ─────────────────────────────────────────
 # Get (detail view)
 # ─────────────────────────────────────────
@@ -263,15 +287,7 @@ class SchoolGetSerializer(serializers.ModelSerializer):
         )
 
     def _get_subscription(self, obj):
-        """Cache subscription on the object to avoid repeated DB hits."""
-        if not hasattr(obj, '_cached_subscription'):
-            obj._cached_subscription = (
-                Subscription.objects
-                .filter(school=obj)
-                .prefetch_related("logs")
-                .first()
-            )
-        return obj._cached_subscription
+        return get_school_subscription(obj)
 
     def get_logo_url(self, obj):
         request = self.context.get("request")
@@ -290,9 +306,7 @@ class SchoolGetSerializer(serializers.ModelSerializer):
         return resolve_subscription_status(self._get_subscription(obj))
 
     def get_focal_person(self, obj):
-        focal = getattr(obj, "prefetched_focal_person", None)
-        if focal is None:
-            focal = FocalPerson.objects.filter(school=obj).first()
+        focal = get_school_focal_person(obj)
         if not focal:
             return None
         return FocalPersonGetSerializer(focal, context=self.context).data
@@ -305,13 +319,16 @@ class SchoolGetSerializer(serializers.ModelSerializer):
         return SubscriptionHistoryListSerializer(sub, context=self.context).data
 
     def get_student_count(self, obj):
-        return SchoolStudentParent.objects.filter(school=obj).values("student").distinct().count()
+        counter = get_school_counter(obj)
+        return counter.student_count if counter else 0
 
     def get_parent_count(self, obj):
-        return SchoolStudentParent.objects.filter(school=obj).values("parent").distinct().count()
+        counter = get_school_counter(obj)
+        return counter.parent_count if counter else 0
 
     def get_relation_count(self, obj):
-        return SchoolStudentParent.objects.filter(school=obj).count()
+        counter = get_school_counter(obj)
+        return counter.relation_count if counter else 0
 
 
 # ─────────────────────────────────────────
@@ -324,6 +341,9 @@ class SchoolListSerializer(serializers.ModelSerializer):
     subscription_expiry_date = serializers.SerializerMethodField()
     subscription_status = serializers.SerializerMethodField()
     subscription_id = serializers.SerializerMethodField()
+    student_count = serializers.SerializerMethodField()
+    parent_count = serializers.SerializerMethodField()
+    relation_count = serializers.SerializerMethodField()
 
     class Meta:
         model = School
@@ -332,24 +352,18 @@ class SchoolListSerializer(serializers.ModelSerializer):
             "logo_url", "focal_person",
             "subscription_expiry_date", "subscription_status",
             "subscription_id",
+            "student_count", "parent_count", "relation_count",
         )
 
     def _get_subscription(self, obj):
-        if not hasattr(obj, '_cached_subscription'):
-            obj._cached_subscription = (
-                Subscription.objects
-                .filter(school=obj)
-                .only("end_date", "status", "on_trial")
-                .first()
-            )
-        return obj._cached_subscription
+        return get_school_subscription(obj)
 
     def get_logo_url(self, obj):
         request = self.context.get("request")
         return build_https_url(request, obj.logo.url) if obj.logo else None
 
     def get_focal_person(self, obj):
-        focal = FocalPerson.objects.filter(school=obj).first()
+        focal = get_school_focal_person(obj)
         if not focal:
             return None
         return {'name': focal.name, 'email': focal.email, 'phone': focal.phone, 'designation': focal.designation}
@@ -363,4 +377,16 @@ class SchoolListSerializer(serializers.ModelSerializer):
         return sub.id if sub else None
 
     def get_subscription_status(self, obj):
-        return resolve_subscription_status(self._get_subscription(obj))
\ No newline at end of file
+        return resolve_subscription_status(self._get_subscription(obj))
+
+    def get_student_count(self, obj):
+        counter = get_school_counter(obj)
+        return counter.student_count if counter else 0
+
+    def get_parent_count(self, obj):
+        counter = get_school_counter(obj)
+        return counter.parent_count if counter else 0
+
+    def get_relation_count(self, obj):
+        counter = get_school_counter(obj)
+        return counter.relation_count if counter else 0
@@ -7,6 +7,87 @@ import string
 
 User = get_user_model()
 
+CODE_CHARS = string.ascii_uppercase + string.digits
+LOGIN_CODE_LENGTH = 6
+PARENT_CODE_LENGTH = 8
+
+
+def generate_code(length):
+    return ''.join(random.choices(CODE_CHARS, k=length))
+
+
+def name_slug(name):
+    return name.replace(" ", "").lower()
+
+
+# Rounds of redrawing before giving up; candidates grow longer each round
+ALLOCATION_ROUNDS = 5
+
+
+def allocate_unique(model, field, make_candidate, seeds, reserved=()):
+    """
+    Draws one value of ``model.field`` per seed with
+    ``make_candidate(seed, round)``, unique among themselves, against
+    ``reserved`` and against existing rows. Each round checks every
+    pending candidate with a single ``__in`` query and redraws only the
+    ones that collided. Returns the values in seed order.
+    """
+    values = [None] * len(seeds)
+    used = set(reserved)
+    pending = list(range(len(seeds)))
+
+    for round_number in range(ALLOCATION_ROUNDS):
+        candidates = {i: make_candidate(seeds[i], round_number) for i in pending}
+        taken = set(
+            model.objects
+            .filter(**{f"{field}__in": set(candidates.values())})
+            .values_list(field, flat=True)
+        )
+
+        pending = []
+        for i, value in candidates.items():
+            if value in taken or value in used:
+                pending.append(i)
+            else:
+                used.add(value)
+                values[i] = value
+
+        if not pending:
+            return values
+
+    raise serializers.ValidationError(f"Could not allocate unique {field} values, please retry.")
+
+
+def _name_suffix(round_number):
+    # 4 digits as before, widened when a name keeps colliding
+    digits = 4 + round_number
+    return random.randint(10 ** (digits - 1), 10 ** digits - 1)
+
+
+def allocate_login_codes(count):
+    return allocate_unique(User, "login_code", lambda _, __: generate_code(LOGIN_CODE_LENGTH), [None] * count)
+
+
+def allocate_parent_codes(count):
+    return allocate_unique(Parent, "code", lambda _, __: generate_code(PARENT_CODE_LENGTH), [None] * count)
+
+
+def allocate_usernames(names):
+    return allocate_unique(
+        User, "username",
+        lambda name, round_number: f"{name_slug(name)}{_name_suffix(round_number)}",
+        names,
+    )
+
+
+def allocate_student_emails(names, reserved=()):
+    return allocate_unique(
+        User, "email",
+        lambda name, round_number: f"{name_slug(name)}{_name_suffix(round_number)}@students.local",
+        names,
+        reserved,
+    )
+
 
 # ===============================
 # STUDENT REGISTER SERIALIZER
@@ -48,19 +129,19 @@ class StudentRegisterSerializer(serializers.ModelSerializer):
         parent_phone = validated_data.pop("student_parent_phone_number", None)
 
         # Generate login code
-        login_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        login_code = allocate_login_codes(1)[0]
 
         # Auto-generate email if not provided
         email = validated_data.get("email")
         if not email:
-            email = f"{validated_data['name'].replace(' ', '').lower()}{random.randint(1000,9999)}@students.local"
+            email = allocate_student_emails([validated_data["name"]])[0]
 
         # Create student user
         student_user = User.objects.create(
             name=validated_data["name"],
             email=email,
             login_code=login_code,
-            username=validated_data["name"].replace(" ", "").lower() + str(random.randint(1000, 9999)),
+            username=allocate_usernames([validated_data["name"]])[0],
         )
 
         # Create UserProfile
@@ -83,7 +164,7 @@ class StudentRegisterSerializer(serializers.ModelSerializer):
                 name=parent_name,
                 email=parent_email,
                 phone_number=parent_phone,
-                code=''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+                code=allocate_parent_codes(1)[0]
             )
 
         # Link student to school
@@ -97,6 +178,25 @@ class StudentRegisterSerializer(serializers.ModelSerializer):
         return student_user
 
 
+# ===============================
+# STUDENT IMPORT ROW SERIALIZER
+# One row of a bulk roster import (see user.student_import)
+# ===============================
+
+class StudentImportRowSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    email = serializers.EmailField(required=False)
+    phone_number = serializers.CharField(required=False, max_length=15)
+    address = serializers.CharField(required=False, max_length=255)
+    grade = serializers.CharField(required=False, max_length=255)
+    section = serializers.CharField(required=False, max_length=255)
+    dateofbirth = serializers.DateField(required=False)
+
+    student_parent_name = serializers.CharField(required=False, max_length=255)
+    student_parent_phone_number = serializers.CharField(required=False, max_length=20)
+    student_parent_email = serializers.EmailField(required=False)
+
+
 # ===============================
 # STUDENT LOGIN SERIALIZER
 # ===============================
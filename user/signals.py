@@ -0,0 +1,91 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+
+from user.models import (
+    SchoolStudentParent, SchoolStudentCounter, CustomRole, CustomPermissionClass,
+    Country, Province, District,
+)
+from utils.permission_cache import invalidate_permissions
+from utils.reference_cache import invalidate_reference
+from utils.transactions import defer_on_commit
+
+
+# ------------------------------
+# SchoolStudentCounter maintenance
+# Schools touched inside a transaction are recounted once, on commit,
+# so a cascade delete costs one aggregate per school.
+# ------------------------------
+
+def _refresh_counters(school_ids):
+    for school_id in school_ids:
+        SchoolStudentCounter.refresh(school_id)
+
+
+def schedule_school_counter_refresh(*school_ids):
+    defer_on_commit("school_counters", school_ids, _refresh_counters)
+
+
+def relation_pre_save(sender, instance, raw=False, **kwargs):
+    # A relation moved to another school changes the old school's counts too
+    if raw or instance.pk is None:
+        return
+    previous = (
+        SchoolStudentParent.objects
+        .filter(pk=instance.pk)
+        .values_list("school_id", flat=True)
+        .first()
+    )
+    if previous and previous != instance.school_id:
+        schedule_school_counter_refresh(previous)
+
+
+def relation_post_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_school_counter_refresh(instance.school_id)
+
+
+def relation_post_delete(sender, instance, **kwargs):
+    schedule_school_counter_refresh(instance.school_id)
+
+
+pre_save.connect(relation_pre_save, sender=SchoolStudentParent)
+post_save.connect(relation_post_save, sender=SchoolStudentParent)
+post_delete.connect(relation_post_delete, sender=SchoolStudentParent)
+
+
+# ------------------------------
+# Cached permission sets
+# Roles, their permissions and their members all feed
+# utils.permission_cache; any change moves everyone to a fresh version.
+# ------------------------------
+
+def role_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_permissions()
+
+
+def role_members_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_permissions()
+
+
+for model in (CustomRole, CustomPermissionClass):
+    post_save.connect(role_changed, sender=model)
+    post_delete.connect(role_changed, sender=model)
+m2m_changed.connect(role_members_changed, sender=CustomRole.user.through)
+
+
+# ------------------------------
+# Cached geography
+# Countries, provinces and districts are served from
+# utils.reference_cache as one group; provinces and districts embed
+# their parent's name, so any change drops all three.
+# ------------------------------
+
+def geography_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_reference("geography")
+
+
+for model in (Country, Province, District):
+    post_save.connect(geography_changed, sender=model)
+    post_delete.connect(geography_changed, sender=model)
@@ -0,0 +1,213 @@
+import csv
+import io
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from school.signals import schedule_dashboard_refresh
+from user.models import User, UserProfile, Parent, SchoolStudentParent
+from user.serializers.student_serializers import (
+    StudentImportRowSerializer,
+    allocate_login_codes,
+    allocate_parent_codes,
+    allocate_student_emails,
+    allocate_usernames,
+)
+from user.signals import schedule_school_counter_refresh
+
+
+# Rows accepted per import request
+MAX_IMPORT_ROWS = 5000
+# A concurrent registration can take a value we allocated between the
+# check and the insert. Rows whose supplied email was taken are then
+# reported, and the rest retried this often before they are reported too.
+INSERT_ATTEMPTS = 3
+
+
+class StudentImportError(Exception):
+    """The upload itself is unusable (bad file, too many rows)."""
+
+
+def read_rows(request):
+    """
+    Import rows from the request: a CSV upload in ``file`` (header row
+    with the StudentImportRowSerializer field names), or a JSON list,
+    either as the body or under ``students``.
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        try:
+            text = upload.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise StudentImportError("The file must be UTF-8 encoded CSV.")
+        rows = list(csv.DictReader(io.StringIO(text)))
+    else:
+        rows = request.data if isinstance(request.data, list) else request.data.get("students")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise StudentImportError("Send a CSV file as `file` or a JSON array of students.")
+
+    if not rows:
+        raise StudentImportError("No students to import.")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise StudentImportError(f"At most {MAX_IMPORT_ROWS} students per import.")
+    return rows
+
+
+def _clean(row):
+    # Empty CSV cells mean "not given"
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key and value not in (None, "")
+    }
+
+
+def _error(number, errors):
+    return {"row": number, "status": "error", "errors": errors}
+
+
+def validate_rows(rows):
+    """
+    Validates every row in memory. Returns (valid, report): ``valid`` is
+    a list of (row_number, validated_data); ``report`` has an error entry
+    per rejected row, keyed by row number. Supplied emails are checked
+    against each other and against existing users with one query.
+    """
+    valid, report = [], {}
+    for number, row in enumerate(rows, start=1):
+        serializer = StudentImportRowSerializer(data=_clean(row))
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            report[number] = _error(number, serializer.errors)
+
+    emails = [data["email"] for _, data in valid if data.get("email")]
+    existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    seen = set()
+    accepted = []
+    for number, data in valid:
+        email = data.get("email")
+        if email in existing:
+            report[number] = _error(number, {"email": ["A user with this email already exists."]})
+        elif email and email in seen:
+            report[number] = _error(number, {"email": ["Duplicate email in this import."]})
+        else:
+            seen.add(email)
+            accepted.append((number, data))
+    return accepted, report
+
+
+def _drop_taken_emails(valid, report):
+    """``valid`` without the rows whose supplied email now belongs to a user."""
+    taken = set(
+        User.objects
+        .filter(email__in=[data["email"] for _, data in valid if data.get("email")])
+        .values_list("email", flat=True)
+    )
+    kept = []
+    for number, data in valid:
+        if data.get("email") in taken:
+            report[number] = _error(number, {"email": ["A user with this email already exists."]})
+        else:
+            kept.append((number, data))
+    return kept
+
+
+def _insert(school, valid):
+    names = [data["name"] for _, data in valid]
+    supplied = {data["email"] for _, data in valid if data.get("email")}
+
+    login_codes = allocate_login_codes(len(valid))
+    usernames = allocate_usernames(names)
+    generated = iter(allocate_student_emails(
+        [data["name"] for _, data in valid if not data.get("email")], reserved=supplied
+    ))
+    with_parent = [data for _, data in valid if data.get("student_parent_name") or data.get("student_parent_email")]
+    parent_codes = iter(allocate_parent_codes(len(with_parent)))
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                name=data["name"],
+                email=data.get("email") or next(generated),
+                login_code=login_code,
+                username=username,
+            )
+            for (_, data), login_code, username in zip(valid, login_codes, usernames)
+        ])
+
+        UserProfile.objects.bulk_create([
+            UserProfile(
+                user=user,
+                display_name=data["name"],
+                phone_number=data.get("phone_number"),
+                address=data.get("address"),
+                grade=data.get("grade"),
+                section=data.get("section"),
+                dateofbirth=data.get("dateofbirth"),
+                user_type="student",
+            )
+            for user, (_, data) in zip(users, valid)
+        ])
+
+        Parent.objects.bulk_create([
+            Parent(
+                student=user,
+                name=data.get("student_parent_name"),
+                email=data.get("student_parent_email"),
+                phone_number=data.get("student_parent_phone_number"),
+                code=next(parent_codes),
+            )
+            for user, (_, data) in zip(users, valid)
+            if data.get("student_parent_name") or data.get("student_parent_email")
+        ])
+
+        SchoolStudentParent.objects.bulk_create([
+            SchoolStudentParent(student=user, school=school)
+            for user in users
+        ])
+
+        # bulk_create skips the signals that keep these current
+        schedule_school_counter_refresh(school.id)
+        schedule_dashboard_refresh(timezone.localdate())
+
+    return users
+
+
+def import_students(school, rows):
+    """
+    Validates ``rows`` and creates every valid student for ``school`` in
+    one transaction. Returns the per-row report, in row order.
+    """
+    valid, report = validate_rows(rows)
+
+    users = []
+    if valid:
+        for _ in range(INSERT_ATTEMPTS):
+            try:
+                users = _insert(school, valid)
+                break
+            except IntegrityError:
+                # Either a supplied email was taken meanwhile (those rows
+                # are reported) or a generated value was (allocated again)
+                valid = _drop_taken_emails(valid, report)
+                if not valid:
+                    break
+        else:
+            for number, _ in valid:
+                report[number] = _error(number, {"non_field_errors": [
+                    "Could not be saved while other students were being registered; import this row again."
+                ]})
+            valid = []
+
+        for (number, _), user in zip(valid, users):
+            report[number] = {
+                "row": number,
+                "status": "created",
+                "id": user.id,
+                "name": user.name,
+                "email": user.email,
+                "login_code": user.login_code,
+            }
+
+    return [report[number] for number in sorted(report)]
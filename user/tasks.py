@@ -2,6 +2,8 @@ from django.core.mail import EmailMessage
 from django.contrib.auth import get_user_model
 from django.template.loader import render_to_string
 
+from user.org_provisioning import run_provisioning
+
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -67,4 +69,8 @@ def send_password_reset_email(user_email, username, reset_token):
 
     except Exception as e:
        
-        print(f"Failed to send password reset email to {user_email}: {e}")
\ No newline at end of file
+        print(f"Failed to send password reset email to {user_email}: {e}")
+
+def run_provisioning_job(job_id):
+    """django-q task: creates the users of a ProvisioningJob (see user.org_provisioning)."""
+    run_provisioning(job_id)
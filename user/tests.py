@@ -1,3 +1,94 @@
+import time
+
+import rsa
+from django.core.cache import cache
 from django.test import TestCase
+from google.auth import crypt, jwt
+
+from user import google_auth
+from user.google_auth import (
+    CertificateStore, GoogleIdTokenVerifier, GoogleTokenError, StaticKeySource,
+)
+
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+class CountingKeySource(StaticKeySource):
+
+    def __init__(self, certs):
+        super().__init__(certs)
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return super().fetch()
+
+
+class GoogleIdTokenVerifierTests(TestCase):
+    """Tokens signed by a local key, verified offline through StaticKeySource."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Key size isn't checked, and a small key is quick to generate
+        public_key, private_key = rsa.newkeys(1024)
+        cls.public_pem = public_key.save_pkcs1()
+        cls.private_pem = private_key.save_pkcs1()
+
+    def setUp(self):
+        cache.clear()
+        self.source = CountingKeySource({"key-1": self.public_pem})
+        self.verifier = GoogleIdTokenVerifier([CLIENT_ID], CertificateStore(self.source))
+
+    def token(self, key_id="key-1", **claims):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "reader@example.com",
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+        }
+        payload.update(claims)
+        return jwt.encode(crypt.RSASigner.from_string(self.private_pem, key_id), payload).decode()
+
+    def test_valid_token(self):
+        claims = self.verifier.verify(self.token())
+        self.assertEqual(claims["email"], "reader@example.com")
+        self.assertEqual(claims["sub"], "1234567890")
+
+    def test_wrong_audience(self):
+        with self.assertRaises(GoogleTokenError):
+            self.verifier.verify(self.token(aud="someone-else.apps.googleusercontent.com"))
+
+    def test_wrong_issuer(self):
+        with self.assertRaisesMessage(GoogleTokenError, "Wrong issuer."):
+            self.verifier.verify(self.token(iss="https://evil.example.com"))
+
+    def test_unverified_email(self):
+        with self.assertRaisesMessage(GoogleTokenError, "Google account email is not verified."):
+            self.verifier.verify(self.token(email_verified=False))
+
+    def test_expired_token(self):
+        issued = int(time.time()) - 7200
+        with self.assertRaises(GoogleTokenError):
+            self.verifier.verify(self.token(iat=issued, exp=issued + 3600))
+
+    def test_unknown_key_id_refetches_once(self):
+        self.verifier.verify(self.token())
+        self.assertEqual(self.source.fetches, 1)
+
+        # Google rotates its keys; the last fetch is long enough ago
+        self.source.certs["key-2"] = self.public_pem
+        self.verifier.store._refreshed_at -= google_auth.MIN_REFRESH_INTERVAL
+        self.verifier.verify(self.token(key_id="key-2"))
+        self.assertEqual(self.source.fetches, 2)
 
-# Create your tests here.
+        # Another unknown kid right after: no new fetch, and rejected
+        self.source.certs["key-3"] = self.public_pem
+        with self.assertRaises(GoogleTokenError):
+            self.verifier.verify(self.token(key_id="key-3"))
+        self.assertEqual(self.source.fetches, 2)
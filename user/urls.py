@@ -10,7 +10,11 @@ from rest_framework_simplejwt.views import (
 # =========================
 # ViewSets
 # =========================
-from user.viewsets.create_user_spec_org_views import CreateOrganizationUserAPIView
+from user.viewsets.create_user_spec_org_views import (
+    CreateOrganizationUserAPIView,
+    BulkCreateOrganizationUsersAPIView,
+    ProvisioningJobViewSet,
+)
 from user.viewsets.user_management_views import UserDropdownAPIView, UserViewSet
 from user.viewsets.address_views import (
     CountryViewSet,
@@ -43,9 +47,12 @@ from user.viewsets.student_views import (
     StudentRegisterView,
     StudentLoginView,
     StudentEditView,
+    StudentRosterExportView,
+    StudentImportView,
 )
 from user.viewsets.school_views import SchoolDropdownViewSet
 from user.viewsets.role_permissions_view import RolePermissionViewSet
+from user.viewsets.admin_search_views import AdminSearchAPIView
 # =========================
 # Routers
 # =========================
@@ -55,6 +62,7 @@ router.register(r'provinces', ProvinceViewSet, basename='provinces')
 router.register(r'districts', DistrictViewSet, basename='districts')
 router.register(r'schools', SchoolViewSet, basename='schools')
 router.register(r'user-management', UserViewSet, basename='user-management')
+router.register(r'provisioning-jobs', ProvisioningJobViewSet, basename='provisioning-jobs')
 
 router.register(
     r"schools-dropdown",
@@ -105,6 +113,8 @@ urlpatterns = [
 
     # -------- Student Edit --------
     path('school-student-edit/', StudentEditView.as_view(), name='student-edit'),
+    path('school-student-edit/export/', StudentRosterExportView.as_view(), name='student-roster-export'),
+    path('school-student-edit/import/', StudentImportView.as_view(), name='student-import'),
     path('school-student-edit/<int:student_id>/', StudentEditView.as_view(), name='student-edit'),
 
     #----------- User Management ----------
@@ -122,6 +132,14 @@ urlpatterns = [
         CreateOrganizationUserAPIView.as_view(),
         name="create-organization-user"
     ),
+    path(
+        "users/bulk-create/",
+        BulkCreateOrganizationUsersAPIView.as_view(),
+        name="bulk-create-organization-users"
+    ),
+
+    # -------- Admin search --------
+    path('admin-search/', AdminSearchAPIView.as_view(), name='admin-search'),
 
 
 
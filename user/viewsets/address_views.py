@@ -1,25 +1,58 @@
 # user/viewsets/location_views.py
 
+from django.http import Http404
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated,AllowAny
 from user.models import Country, Province, District
 from user.serializers.address_serializers import CountrySerializer, ProvinceSerializer, DistrictSerializer
+from utils.reference_cache import get_reference
+
+# Cache group of the three tables; user.signals invalidates it on any change
+GEOGRAPHY = "geography"
+
+
+class CachedReferenceMixin:
+    """
+    Serves list and retrieve from the reference-data cache instead of
+    the database. Writes go through ModelViewSet as before.
+    """
+    reference_key = None
+
+    def get_reference_rows(self):
+        return get_reference(
+            GEOGRAPHY,
+            self.reference_key,
+            lambda: [dict(row) for row in self.get_serializer(self.get_queryset(), many=True).data]
+        )
+
+    def list(self, request, *args, **kwargs):
+        return Response(self.get_reference_rows())
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = str(kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+        for row in self.get_reference_rows():
+            if str(row["id"]) == pk:
+                return Response(row)
+        raise Http404
 
 # ----------------- COUNTRY -----------------
-class CountryViewSet(viewsets.ModelViewSet):
+class CountryViewSet(CachedReferenceMixin, viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = [AllowAny]  # you can change as needed
+    reference_key = "countries"
 
 # ----------------- PROVINCE -----------------
-class ProvinceViewSet(viewsets.ModelViewSet):
-    queryset = Province.objects.all()
+class ProvinceViewSet(CachedReferenceMixin, viewsets.ModelViewSet):
+    queryset = Province.objects.select_related("country")
     serializer_class = ProvinceSerializer
     permission_classes = [AllowAny]
+    reference_key = "provinces"
 
 # ----------------- DISTRICT -----------------
-class DistrictViewSet(viewsets.ModelViewSet):
-    queryset = District.objects.all()
+class DistrictViewSet(CachedReferenceMixin, viewsets.ModelViewSet):
+    queryset = District.objects.select_related("province")
     serializer_class = DistrictSerializer
     permission_classes = [AllowAny]
+    reference_key = "districts"
@@ -0,0 +1,86 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from cms.models import Blog
+from cms.viewsets.blog_views import BlogViewSet
+from tasks.models import Task
+from user.models import User, School
+from utils.permissions import IsAdminUserType
+from utils.search import search_queryset
+
+DEFAULT_RESULTS_PER_GROUP = 5
+MAX_RESULTS_PER_GROUP = 20
+
+
+class AdminSearchAPIView(APIView):
+    """
+    One search box for the admin panel: best matches among students,
+    schools, tasks and blogs.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUserType]
+
+    @swagger_auto_schema(
+        operation_summary="Search students, schools, tasks and blogs",
+        operation_description=(
+            "Returns the best matches for `q` in each group, best first. "
+            "Students, schools and tasks match on substrings of their names "
+            "and emails/codes; blogs also match on their full text."
+        ),
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter(
+                'limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description=f"Results per group (default {DEFAULT_RESULTS_PER_GROUP}, max {MAX_RESULTS_PER_GROUP})"
+            ),
+        ],
+        tags=["admin.search"],
+    )
+    def get(self, request):
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_RESULTS_PER_GROUP))
+        except ValueError:
+            limit = DEFAULT_RESULTS_PER_GROUP
+        limit = min(max(limit, 1), MAX_RESULTS_PER_GROUP)
+
+        students = search_queryset(
+            User.objects.filter(userprofile__user_type="student").select_related("userprofile"),
+            term, ["name", "email", "username"]
+        )[:limit]
+        schools = search_queryset(School.objects.all(), term, ["name", "email", "code", "city"])[:limit]
+        tasks = search_queryset(Task.objects.all(), term, ["name"])[:limit]
+        blogs = search_queryset(
+            Blog.objects.all(), term, BlogViewSet.search_fields, BlogViewSet.search_vector_fields
+        )[:limit]
+
+        return Response({
+            "query": term,
+            "students": [
+                {
+                    "id": user.id,
+                    "name": user.name,
+                    "email": user.email,
+                    "grade": user.userprofile.grade,
+                }
+                for user in students
+            ],
+            "schools": [
+                {"id": school.id, "name": school.name, "code": school.code, "city": school.city}
+                for school in schools
+            ],
+            "tasks": [
+                {"id": task.id, "name": task.name, "grade": task.grade}
+                for task in tasks
+            ],
+            "blogs": [
+                {"id": blog.id, "title": blog.title, "slug": blog.slug, "is_active": blog.is_active}
+                for blog in blogs
+            ],
+        }, status=status.HTTP_200_OK)
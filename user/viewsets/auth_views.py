@@ -20,7 +20,6 @@ from rest_framework.decorators import action
 import requests
 import string
 from django.db import transaction
-from django.db.models import Q
 from rest_framework.permissions import IsAuthenticated
 from django.core.mail import send_mail
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -47,6 +46,7 @@ from rest_framework import viewsets
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.conf import settings
 from utils.paginator import CustomPageNumberPagination
+from utils.search import search_queryset
 
 from rest_framework_simplejwt.tokens import AccessToken, TokenError
 from django.shortcuts import redirect
@@ -729,11 +729,9 @@ class AdminUserAPIView(APIView):
             users = User.objects.filter(userprofile__user_type='admin').order_by('id')
 
             if search_query:
-                users = users.filter(
-                    Q(first_name__icontains=search_query) |
-                    Q(last_name__icontains=search_query) |
-                    Q(userprofile__address__icontains=search_query) |
-                    Q(email__icontains=search_query)
+                users = search_queryset(
+                    users, search_query,
+                    ["first_name", "last_name", "userprofile__address", "email"]
                 )
 
             paginator = CustomPageNumberPagination()
@@ -846,7 +844,7 @@ class DisableAccountAPIView(APIView):
 
     def post(self, request):
         try:
-            profile = UserProfile.objects.get(user=request.user)
+            profile = request.user.userprofile
 
             if profile.is_disabled:
                 return Response({"detail": "Account is already disabled."}, status=status.HTTP_400_BAD_REQUEST)
@@ -865,7 +863,7 @@ class DeleteAccountAPIView(APIView):
 
     def post(self, request):
         try:
-            profile = UserProfile.objects.get(user=request.user)
+            profile = request.user.userprofile
 
             if profile.is_deleted:
                 return Response({"detail": "Account is already deleted."}, status=status.HTTP_400_BAD_REQUEST)
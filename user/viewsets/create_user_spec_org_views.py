@@ -1,13 +1,22 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.shortcuts import get_object_or_404
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from user.models import UserProfile, School, CustomRole
+from user.models import UserProfile, School, CustomRole, ProvisioningJob
+from user.org_provisioning import MAX_PROVISION_ROWS, queue_provisioning
+from user.serializers.organization_user_serializers import (
+    ProvisioningJobSerializer,
+    ProvisioningJobDetailSerializer,
+)
+from utils.paginator import CustomPageNumberPagination
+from utils.permissions import IsAdminUserType
 
 User = get_user_model()
 
@@ -297,4 +306,90 @@ class CreateOrganizationUserAPIView(APIView):
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+
+# -------------------------
+# Bulk provisioning
+# -------------------------
+bulk_create_org_users_request_body = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=["users"],
+    properties={
+        "users": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=create_org_user_request_body,
+            description=f"Users to create, at most {MAX_PROVISION_ROWS}; same fields as users/create/"
+        ),
+    },
+)
+
+
+class BulkCreateOrganizationUsersAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserType]
+
+    @swagger_auto_schema(
+        operation_id="bulk_create_organization_users",
+        operation_summary="Create Organization Users in bulk",
+        operation_description=(
+            "Creates many users at once, each with a profile, role and optional "
+            "school assignment, like `users/create/`. Send the users as a JSON array, "
+            "either as the body or under `users`.\n\n"
+            "**Notes:**\n"
+            "- The users are created in the background. The response is the "
+            "provisioning job; poll `provisioning-jobs/{id}/` for its progress and "
+            "the result of every row.\n"
+            "- Invalid rows are reported and skipped.\n"
+            "- Profile pictures are not accepted here.\n"
+            f"- At most {MAX_PROVISION_ROWS} users per request.\n"
+            "- `superadmin` users cannot be created, and a school that already "
+            "has a user is not reassigned."
+        ),
+        tags=["Organization Users"],
+        request_body=bulk_create_org_users_request_body,
+        responses={202: ProvisioningJobSerializer(), 400: create_org_user_400_response},
+    )
+    def post(self, request):
+        rows = request.data if isinstance(request.data, list) else request.data.get("users")
+        if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+            return Response(
+                {"error": "Send a non-empty JSON array of users"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > MAX_PROVISION_ROWS:
+            return Response(
+                {"error": f"At most {MAX_PROVISION_ROWS} users per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        job = queue_provisioning(rows, request.user)
+        return Response(ProvisioningJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ProvisioningJobViewSet(viewsets.ViewSet):
+    """
+    Progress and per-row results of the bulk user creations started
+    through users/bulk-create/.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUserType]
+
+    @swagger_auto_schema(
+        operation_description="List provisioning jobs, newest first",
+        responses={200: ProvisioningJobSerializer(many=True)},
+        tags=["Organization Users"],
+    )
+    def list(self, request):
+        jobs = ProvisioningJob.objects.all()
+        paginator = CustomPageNumberPagination()
+        page = paginator.paginate_queryset(jobs, request)
+        serializer = ProvisioningJobSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Status of one provisioning job, with the result of every processed row",
+        responses={200: ProvisioningJobDetailSerializer(), 404: "Not Found"},
+        tags=["Organization Users"],
+    )
+    def retrieve(self, request, pk=None):
+        job = get_object_or_404(ProvisioningJob, pk=pk)
+        return Response(ProvisioningJobDetailSerializer(job).data)
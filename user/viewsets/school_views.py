@@ -5,7 +5,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 import requests
-from django.db.models import Prefetch, Q
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import timedelta, date
@@ -16,6 +16,8 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from user.models import User, UserProfile, School, FocalPerson
+from user.authentication import get_user_school
+from user.google_auth import GoogleTokenError, get_google_verifier
 from school.models import Subscription                          # updated
 
 from user.serializers.auth_serializers import UserSerializer
@@ -27,6 +29,7 @@ from user.serializers.school_serializers import (
     SchoolDropdownSerializer,
 )
 from utils.paginator import CustomPageNumberPagination
+from utils.search import search_queryset
 
 
 # ─────────────────────────────────────────
@@ -46,7 +49,7 @@ def _validate_school_status(self):
         return None
 
     # For school or any other user_type
-    school = School.objects.filter(user=self.request.user).first()
+    school = get_user_school(self.request.user)
 
     if not school:
         return Response(
@@ -71,19 +74,33 @@ def _validate_school_status(self):
 
 class SchoolGoogleLoginView(APIView):
     def post(self, request):
+        # Prefer an ID token: verified locally against cached Google keys.
+        # An access token still works but costs a call to Google per login.
+        token = request.data.get("id_token")
         access_token = request.data.get("access_token")
-        if not access_token:
+        if token:
+            try:
+                claims = get_google_verifier().verify(token)
+            except GoogleTokenError:
+                return Response({"error": "Invalid token"}, status=status.HTTP_400_BAD_REQUEST)
+            userinfo = {
+                "email": claims["email"],
+                "name": claims.get("name", ""),
+                "picture": claims.get("picture", ""),
+                "id": claims["sub"],
+            }
+        elif access_token:
+            response = requests.get(
+                "https://www.googleapis.com/oauth2/v1/userinfo",
+                params={"alt": "json"},
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            if response.status_code != 200:
+                return Response({"error": "Invalid token"}, status=status.HTTP_400_BAD_REQUEST)
+            userinfo = response.json()
+        else:
             return Response({"error": "No token provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        response = requests.get(
-            "https://www.googleapis.com/oauth2/v1/userinfo",
-            params={"alt": "json"},
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-        if response.status_code != 200:
-            return Response({"error": "Invalid token"}, status=status.HTTP_400_BAD_REQUEST)
-
-        userinfo = response.json()
         email = userinfo.get("email")
         name = userinfo.get("name", "")
         picture = userinfo.get("picture", "")
@@ -174,9 +191,9 @@ class SchoolViewSet(viewsets.ModelViewSet):
 
         qs = (
             School.objects
-            .select_related("country", "province", "district", "user")
+            .select_related("country", "province", "district", "user", "student_counter")
             .prefetch_related(
-                Prefetch("focalperson_set", queryset=FocalPerson.objects.all()),
+                Prefetch("focalperson_set", queryset=FocalPerson.objects.order_by("id")),
                 # OneToOneField reverse — prefetch as single related object with its logs
                 Prefetch(
                     "subscription",
@@ -203,11 +220,8 @@ class SchoolViewSet(viewsets.ModelViewSet):
         # Search
         search = params.get("search")
         if search:
-            s = search.strip()
-            qs = qs.filter(
-                Q(name__icontains=s) | Q(email__icontains=s) |
-                Q(city__icontains=s) | Q(address__icontains=s) | Q(code__icontains=s)
-            )
+            # Listing keeps its own ordering below
+            qs = search_queryset(qs, search, ["name", "email", "city", "address", "code"], rank=False)
 
         # has_subscription — OneToOne so use isnull on the reverse accessor
         has_sub = params.get("has_subscription")
@@ -257,27 +271,26 @@ class SchoolViewSet(viewsets.ModelViewSet):
     # ---- Counts ----
     def get_counts(self):
         today = date.today()
-        # Base unfiltered queryset for accurate global counts
-        qs = School.objects.all()
-
-        return {
-            "total": qs.count(),
-            "new": qs.filter(subscription__isnull=True).count(),
-            "deactivated": qs.filter(subscription__status="deactivated").count(),
-            "inactive": qs.filter(subscription__status="inactive").count(),
-            "pending": qs.filter(subscription__status="pending").count(),
-            "paid": qs.filter(subscription__status="paid").count(),
-            "active": qs.filter(
+        # Base unfiltered queryset for accurate global counts,
+        # all buckets computed in a single aggregate query
+        return School.objects.aggregate(
+            total=Count("id"),
+            new=Count("id", filter=Q(subscription__isnull=True)),
+            deactivated=Count("id", filter=Q(subscription__status="deactivated")),
+            inactive=Count("id", filter=Q(subscription__status="inactive")),
+            pending=Count("id", filter=Q(subscription__status="pending")),
+            paid=Count("id", filter=Q(subscription__status="paid")),
+            active=Count("id", filter=Q(
                 subscription__status="paid",
                 subscription__end_date__gte=today
-            ).count(),
-            "expired": qs.filter(subscription__end_date__lt=today).count(),
-            "expiring_soon": qs.filter(
+            )),
+            expired=Count("id", filter=Q(subscription__end_date__lt=today)),
+            expiring_soon=Count("id", filter=Q(
                 subscription__end_date__gte=today,
                 subscription__end_date__lte=today + timedelta(days=7)
-            ).count(),
-            "on_trial": qs.filter(subscription__on_trial=True).count(),
-        }
+            )),
+            on_trial=Count("id", filter=Q(subscription__on_trial=True)),
+        )
 
     # ---- Serializer routing ----
     def get_serializer_class(self):
@@ -297,7 +310,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
         tags=["School"],
     )
     def create(self, request, *args, **kwargs):
-        if School.objects.filter(user=request.user).exists():
+        if get_user_school(request.user) is not None:
             return Response({"detail": "You can only create one school."}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = self.get_serializer(data=request.data, context={"request": request})
@@ -5,8 +5,12 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 
-from user.models import User, UserProfile, SchoolStudentParent
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from user.models import User, UserProfile, SchoolStudentParent, Parent
 from user.serializers.student_serializers import (
     StudentRegisterSerializer,
     StudentLoginSerializer,
@@ -16,6 +20,9 @@ from user.serializers.student_serializers import (
 )
 from user.serializers.auth_serializers import UserSerializer
 from utils.paginator import CustomPageNumberPagination
+from user.authentication import get_user_school
+from user.student_import import MAX_IMPORT_ROWS, StudentImportError, read_rows, import_students
+from utils.csv_export import EXPORT_CHUNK_SIZE, iter_chunks, streaming_csv_response
 
 
 # =====================================================
@@ -46,6 +53,81 @@ class StudentRegisterView(APIView):
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
+# =====================================================
+# STUDENT BULK IMPORT (CSV / JSON)
+# =====================================================
+
+student_import_request_body = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=["students"],
+    properties={
+        "students": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=["name"],
+                properties={
+                    "name": openapi.Schema(type=openapi.TYPE_STRING),
+                    "email": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_EMAIL),
+                    "phone_number": openapi.Schema(type=openapi.TYPE_STRING),
+                    "address": openapi.Schema(type=openapi.TYPE_STRING),
+                    "grade": openapi.Schema(type=openapi.TYPE_STRING),
+                    "section": openapi.Schema(type=openapi.TYPE_STRING),
+                    "dateofbirth": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+                    "student_parent_name": openapi.Schema(type=openapi.TYPE_STRING),
+                    "student_parent_phone_number": openapi.Schema(type=openapi.TYPE_STRING),
+                    "student_parent_email": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_EMAIL),
+                },
+            ),
+            description=f"Students to import, at most {MAX_IMPORT_ROWS}"
+        ),
+    },
+)
+
+
+class StudentImportView(APIView):
+    permission_classes = [IsAuthenticated]  # School imports its roster
+    parser_classes = [JSONParser, FormParser, MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_summary="Import students",
+        operation_description=(
+            "Enrols many students in the requesting school at once. Send a CSV "
+            "upload as `file` (header row with the field names below), or the "
+            "students as a JSON array, either as the body or under `students`.\n\n"
+            "**Notes:**\n"
+            "- Invalid rows are reported and skipped; all valid rows are created "
+            "in one transaction.\n"
+            "- Login codes, usernames and missing emails are generated."
+        ),
+        request_body=student_import_request_body,
+        # The CSV upload is described above; a form body can't be a schema
+        consumes=["application/json"],
+        tags=["Student"],
+    )
+    def post(self, request):
+        school = get_user_school(request.user)
+        if school is None:
+            return Response(
+                {"error": "Only school accounts can import students"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            rows = read_rows(request)
+        except StudentImportError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_students(school, rows)
+        created = sum(1 for row in report if row["status"] == "created")
+
+        return Response({
+            "created": created,
+            "failed": len(report) - created,
+            "rows": report,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+
 # =====================================================
 # STUDENT LOGIN (Login Code Based)
 # =====================================================
@@ -107,6 +189,17 @@ class StudentLoginView(APIView):
 # STUDENT EDIT / LIST / RETRIEVE / DELETE
 # =====================================================
 
+def school_students(school_user):
+    """Students linked to any school owned by ``school_user``."""
+    return (
+        User.objects
+        .filter(student_school_relations__school__user=school_user)
+        .select_related("userprofile")
+        .distinct()
+        .order_by("id")
+    )
+
+
 class StudentEditView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -141,9 +234,7 @@ class StudentEditView(APIView):
             )
 
         # 🔹 List Students (Optimized Query)
-        students = User.objects.filter(
-            schoolstudentparent__school__user=school_user
-        ).select_related("userprofile").distinct()
+        students = school_students(school_user)
 
         paginator = CustomPageNumberPagination()
         page = paginator.paginate_queryset(students, request)
@@ -225,4 +316,63 @@ class StudentEditView(APIView):
         return Response(
             {"message": "Student deleted successfully"},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+# =====================================================
+# STUDENT ROSTER EXPORT (CSV)
+# =====================================================
+
+ROSTER_HEADER = [
+    "id", "name", "email", "login_code", "phone_number", "address",
+    "grade", "section", "dateofbirth",
+    "student_parent_name", "student_parent_phone_number", "student_parent_email",
+]
+
+
+def roster_rows(students, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    One row per student, read through a server-side cursor; parents are
+    fetched once per chunk instead of once per field per student.
+    """
+    for chunk in iter_chunks(students.iterator(chunk_size=chunk_size), chunk_size):
+        parents = {}
+        for parent in Parent.objects.filter(
+            student_id__in=[s.id for s in chunk]
+        ).order_by("id"):
+            parents.setdefault(parent.student_id, parent)
+
+        for student in chunk:
+            profile = getattr(student, "userprofile", None)
+            parent = parents.get(student.id)
+            yield [
+                student.id, student.name, student.email, student.login_code,
+                profile.phone_number if profile else None,
+                profile.address if profile else None,
+                profile.grade if profile else None,
+                profile.section if profile else None,
+                profile.dateofbirth if profile else None,
+                parent.name if parent else None,
+                parent.phone_number if parent else None,
+                parent.email if parent else None,
+            ]
+
+
+class StudentRosterExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_id="export_student_roster",
+        operation_summary="Export Students (CSV)",
+        operation_description=(
+            "Streams the requesting school's students as a CSV file, one row per "
+            "student with their profile and parent details."
+        ),
+        tags=["Student"],
+        responses={200: "text/csv"},
+    )
+    def get(self, request):
+        return streaming_csv_response(
+            "students.csv",
+            ROSTER_HEADER,
+            roster_rows(school_students(request.user)),
+        )
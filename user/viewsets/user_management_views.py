@@ -44,7 +44,6 @@ class UserDropdownAPIView(APIView):
         return Response(data)
 
 
-from django.db.models import Q
 from django.contrib.auth import get_user_model
 from rest_framework import viewsets, status
 from rest_framework.response import Response
@@ -55,6 +54,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from utils.paginator import CustomPageNumberPagination
+from utils.search import search_queryset
 from user.serializers.auth_serializers import UserSerializer, UserUpsertSerializer   # your READ serializer
 
 User = get_user_model()
@@ -110,8 +110,7 @@ class UserViewSet(viewsets.ViewSet):
 
         search = qp.get("search")
         if search:
-            s = search.strip()
-            qs = qs.filter(Q(email__icontains=s) | Q(username__icontains=s))
+            qs = search_queryset(qs, search, ["email", "username"])
 
         return qs
 
@@ -2,6 +2,8 @@ from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
 
+from utils.permission_cache import get_request_permissions
+
 def has_permission(permission_name):
     def decorator(view_func):
         @wraps(view_func)
@@ -26,13 +28,7 @@ def has_permission(permission_name):
                 return view_func(self, request, *args, **kwargs)
 
             # ---- Normal permission check ----
-            permissions = (
-                user.roles
-                .filter(is_active=True)
-                .values_list("permissions__name", flat=True)
-            )
-
-            if permission_name not in permissions:
+            if permission_name not in get_request_permissions(request):
                 return Response(
                     {"detail": "Permission denied"},
                     status=status.HTTP_403_FORBIDDEN
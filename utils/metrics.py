@@ -0,0 +1,310 @@
+import contextvars
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django_redis import get_redis_connection
+from django_redis.cache import RedisCache
+
+
+# -----------------------------
+# Request metrics
+# MetricsMiddleware times every request and counts its queries, query
+# time, cache hits/misses and response size, labelled by the DRF view
+# and action that served it (e.g. "SchoolStudentExamDataAPIView.get").
+# Each worker adds to in-process totals and pushes the increments to a
+# Redis hash at most every FLUSH_INTERVAL seconds, so /metrics (served
+# by any worker) shows all gunicorn workers together, in Prometheus text
+# format. With a non-Redis cache it shows this process only. /metrics
+# needs METRICS_TOKEN as a bearer token; without one it is a 404 unless
+# DEBUG is on.
+#
+# Streaming responses are timed until the response object is returned,
+# not until the body has been sent.
+# -----------------------------
+METRICS_PATH = "/metrics"
+METRICS_KEY = "metrics:samples"
+FLUSH_INTERVAL = 5
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+METRICS = {
+    "http_requests_total": ("counter", "Requests handled, by view, method and status."),
+    "http_request_duration_seconds": ("histogram", "Time to build the response, by view."),
+    "http_response_size_bytes": ("histogram", "Response body size, by view."),
+    "db_queries_per_request": ("histogram", "Database queries run while handling one request, by view."),
+    "db_query_duration_seconds_total": ("counter", "Time spent in database queries, by view."),
+    "cache_requests_total": ("counter", "Cache reads, by view and result (hit or miss)."),
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        # sample -> increment not yet pushed to Redis
+        self._pending = defaultdict(float)
+        # sample -> total in this process
+        self._local = defaultdict(float)
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        self.shared = True
+
+    def _add(self, sample, value):
+        self._pending[sample] += value
+        self._local[sample] += value
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self._add(f"{name}{{{labels}}}", value)
+
+    def observe(self, name, labels, value, buckets):
+        with self._lock:
+            # Every bucket is written, even with 0, so each series has them all
+            for bound in buckets:
+                self._add(f'{name}_bucket{{{labels},le="{bound}"}}', 1 if value <= bound else 0)
+            self._add(f'{name}_bucket{{{labels},le="+Inf"}}', 1)
+            self._add(f"{name}_sum{{{labels}}}", value)
+            self._add(f"{name}_count{{{labels}}}", 1)
+
+    def flush(self, force=False):
+        """Pushes the increments since the last flush to Redis."""
+        if not self.shared:
+            return
+        if not force and time.monotonic() - self._flushed_at < FLUSH_INTERVAL:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        try:
+            pipeline = get_redis_connection("default").pipeline(transaction=False)
+            for sample, value in pending.items():
+                pipeline.hincrbyfloat(METRICS_KEY, sample, value)
+            pipeline.execute()
+        except NotImplementedError:
+            self.shared = False
+        except Exception:
+            # Redis unavailable: keep the increments for the next flush
+            with self._lock:
+                for sample, value in pending.items():
+                    self._pending[sample] += value
+
+    def samples(self):
+        if self.shared:
+            self.flush(force=True)
+            try:
+                return {
+                    sample.decode(): float(value)
+                    for sample, value in get_redis_connection("default").hgetall(METRICS_KEY).items()
+                }
+            except NotImplementedError:
+                self.shared = False
+            except Exception:
+                pass
+        with self._lock:
+            return dict(self._local)
+
+
+registry = MetricsRegistry()
+
+
+# -----------------------------
+# Exposition
+# -----------------------------
+
+_SUFFIXES = ("_bucket", "_sum", "_count")
+_LE = re.compile(r',?le="([^"]+)"')
+
+
+def _family(name):
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+def _sort_key(sample):
+    # Series together, buckets in ascending order before _sum and _count
+    name, _, labels = sample.partition("{")
+    suffix = name[len(_family(name)):]
+    le = _LE.search(labels)
+    return (
+        _LE.sub("", labels),
+        _SUFFIXES.index(suffix) if suffix else 0,
+        float(le.group(1)) if le else 0,
+    )
+
+
+def _format(value):
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def render(samples):
+    families = defaultdict(list)
+    for sample, value in samples.items():
+        families[_family(sample.partition("{")[0])].append(sample)
+
+    lines = []
+    for family in sorted(families):
+        kind, help_text = METRICS.get(family, ("untyped", family))
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for sample in sorted(families[family], key=_sort_key):
+            lines.append(f"{sample} {_format(samples[sample])}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        # Not configured: hidden, except on a DEBUG (development) server
+        if not settings.DEBUG:
+            raise Http404
+    elif not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        render(registry.samples()),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+# -----------------------------
+# Collection
+# -----------------------------
+
+class RequestStats:
+
+    def __init__(self):
+        self.view = "unmatched"
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+_current_request = contextvars.ContextVar("metrics_request", default=None)
+
+
+def view_label(request, view_func):
+    """ViewClass.action for DRF views, module.function otherwise."""
+    cls = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if cls is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    method = request.method.lower()
+    actions = getattr(view_func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(method, method)}"
+
+
+def _response_size(response):
+    if getattr(response, "streaming", False):
+        length = response.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+def record_cache_read(hits, misses):
+    stats = _current_request.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+        return
+    # Outside a request (django-q workers, shell)
+    if hits:
+        registry.inc("cache_requests_total", _labels(view="background", result="hit"), hits)
+    if misses:
+        registry.inc("cache_requests_total", _labels(view="background", result="miss"), misses)
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == METRICS_PATH:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        request._metrics = stats
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        duration = time.perf_counter() - start
+
+        self.record(request, response, stats, duration)
+        registry.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = getattr(request, "_metrics", None)
+        if stats is not None:
+            stats.view = view_label(request, view_func)
+
+    @staticmethod
+    def record(request, response, stats, duration):
+        view = _labels(view=stats.view)
+        registry.inc(
+            "http_requests_total",
+            _labels(view=stats.view, method=request.method, status=response.status_code)
+        )
+        registry.observe("http_request_duration_seconds", view, duration, DURATION_BUCKETS)
+        registry.observe("db_queries_per_request", view, stats.queries, QUERY_COUNT_BUCKETS)
+        registry.inc("db_query_duration_seconds_total", view, stats.db_time)
+        if stats.cache_hits:
+            registry.inc("cache_requests_total", _labels(view=stats.view, result="hit"), stats.cache_hits)
+        if stats.cache_misses:
+            registry.inc("cache_requests_total", _labels(view=stats.view, result="miss"), stats.cache_misses)
+
+        size = _response_size(response)
+        if size is not None:
+            registry.observe("http_response_size_bytes", view, size, SIZE_BUCKETS)
+
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """django-redis cache that reports hits and misses to the metrics."""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, _MISSING, version=version, client=client)
+        hit = value is not _MISSING
+        record_cache_read(int(hit), int(not hit))
+        return value if hit else default
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version, client=client)
+        record_cache_read(len(found), len(keys) - len(found))
+        return found
@@ -1,8 +1,16 @@
-from decimal import Decimal
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.response import Response
-from rest_framework.response import Response
+import base64
+import json
 from urllib.parse import urlparse, urlunparse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
 def _force_https(url):
         if not url:
             return None
@@ -10,53 +18,209 @@ def _force_https(url):
         # Replace the scheme with https
         new_url = urlunparse(('https',) + parsed[1:])
         return new_url
-class CustomPageNumberPagination(PageNumberPagination): 
+
+
+# -------------------------
+# Totals
+# -------------------------
+
+def estimate_count(queryset):
+    """
+    Row count of ``queryset`` from PostgreSQL's planner statistics: the
+    table's reltuples when unfiltered, else the plan's row estimate.
+    None on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    if not queryset.query.where and not queryset.query.distinct:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1 until the table has been analyzed
+        if row and row[0] >= 0:
+            return row[0]
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# -------------------------
+# Keyset (cursor) pagination
+# -------------------------
+
+class KeysetPagination(BasePagination):
+    """
+    Pages by position instead of OFFSET: each page continues from the last
+    row of the previous one with a WHERE on the ordering columns, so a
+    deep page costs the same as the first. No COUNT(*) either; a total is
+    only computed on request (``count=estimate`` from PostgreSQL's
+    statistics, ``count=exact``).
+
+    Rows are ordered by the view's ``keyset_ordering`` if it has one, else
+    by the queryset's own ordering when it is on plain non-null columns,
+    else by ``-created_at`` (when the model has a non-null one) and ``-id``.
+    The primary key is always added last as a tie-breaker.
+    """
     page_size = 16
     page_size_query_param = 'page_size'
     max_page_size = 100
-    def _force_https(self, url):
-        if not url:
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    # Total reported when the request doesn't ask: None, "estimate" or "exact"
+    count_mode = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.count = self.get_count(queryset, request)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    # ---- ordering ----
+    def get_ordering(self, queryset, view):
+        model = queryset.model
+        ordering = getattr(view, "keyset_ordering", None)
+        if not ordering:
+            current = queryset.query.order_by or model._meta.ordering
+            ordering = [
+                field for field in current
+                if isinstance(field, str) and self._is_keyset_field(model, field)
+            ]
+            if len(ordering) != len(current):
+                ordering = []
+        if not ordering:
+            ordering = ["-created_at"] if self._is_keyset_field(model, "created_at") else []
+
+        ordering = [self._resolve_pk(model, field) for field in ordering]
+        pk_name = model._meta.pk.attname
+        if not any(field.lstrip("-") == pk_name for field in ordering):
+            descending = ordering[-1].startswith("-") if ordering else True
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    @staticmethod
+    def _is_keyset_field(model, field):
+        name = field.lstrip("-")
+        if name == "pk":
+            return True
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return model_field.concrete and not model_field.null and not model_field.is_relation
+
+    @staticmethod
+    def _resolve_pk(model, field):
+        if field.lstrip("-") == "pk":
+            return field.replace("pk", model._meta.pk.attname)
+        return field
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering, position):
+        # (a, b, c) past (x, y, z): a>x OR (a=x AND b>y) OR (a=x AND b=y AND c>z)
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    # ---- cursors ----
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if len(data["p"]) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, data["p"])
+            ]
+            return position, bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, ValidationError, UnicodeDecodeError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, row, reverse):
+        position = []
+        for field in self.ordering:
+            value = getattr(row, field.lstrip("-"))
+            # Full precision: a rounded timestamp would skip or repeat rows
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif not isinstance(value, (int, float, str)):
+                value = str(value)
+            position.append(value)
+        encoded = base64.urlsafe_b64encode(
+            json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":")).encode()
+        ).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
             return None
-        parsed = urlparse(url)
-        # Replace the scheme with https
-        new_url = urlunparse(('https',) + parsed[1:])
-        return new_url
-    
-    def get_paginated_response(self, data):
-        return Response({
-            'links': {
-                'next': self._force_https(self.get_next_link()),
-                'previous': self._force_https(self.get_previous_link())
-            },
-            'count': len(data), 
-            'page_size': self.get_page_size(self.request), 
-            'total_pages': self.page.paginator.num_pages,  
-            'current_page': self.page.number,  
-            'results': data  
-        })
-    
-class FIVEPageNumberPagination(PageNumberPagination): 
-    page_size = 5
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-    
-    def get_paginated_response(self, data):
-        return Response({
-            'links': {
-                'next': _force_https(self.get_next_link()),
-                'previous': _force_https(self.get_previous_link())
-            },
-            'count': len(data), 
-            'page_size': self.get_page_size(self.request), 
-            'total_pages': self.page.paginator.num_pages,  
-            'current_page': self.page.number,  
-            'results': data  
-        })
-    
-class RolePageNumberPagination(PageNumberPagination):
-    page_size = 8
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    # ---- totals ----
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, self.count_mode)
+        self.count_is_estimate = mode == "estimate"
+        if mode == "exact":
+            return queryset.count()
+        if mode == "estimate":
+            estimate = estimate_count(queryset)
+            if estimate is None:
+                self.count_is_estimate = False
+                return queryset.count()
+            return estimate
+        return None
 
     def get_paginated_response(self, data):
         return Response({
@@ -64,28 +228,87 @@ class RolePageNumberPagination(PageNumberPagination):
                 'next': _force_https(self.get_next_link()),
                 'previous': _force_https(self.get_previous_link())
             },
-            'count': len(data), 
-            'page_size': self.get_page_size(self.request), 
-            'total_pages': self.page.paginator.num_pages,  
-            'current_page': self.page.number,  
+            'count': self.count,
+            'count_is_estimate': self.count_is_estimate,
+            'page_size': self.page_size,
             'results': data
         })
-    
 
-class TeNPageNumberPagination(PageNumberPagination):
-    page_size = 10
+
+# -------------------------
+# Page-number pagination
+# Any of these switches to KeysetPagination (same page size) when the
+# request asks for it with ?pagination=cursor or carries a cursor, unless
+# the view sets allow_cursor_pagination = False because it reads
+# page numbers itself.
+# -------------------------
+
+class _PageNumberPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
+    mode_query_param = 'pagination'
+
+    keyset = None
+
+    def _force_https(self, url):
+        return _force_https(url)
+
+    def _wants_keyset(self, queryset, request, view):
+        return (
+            isinstance(queryset, QuerySet)
+            and getattr(view, "allow_cursor_pagination", True)
+            and (
+                request.query_params.get(self.mode_query_param) == "cursor"
+                or KeysetPagination.cursor_query_param in request.query_params
+            )
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._wants_keyset(queryset, request, view):
+            self.request = request
+            self.keyset = KeysetPagination()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'links': {
                 'next': _force_https(self.get_next_link()),
                 'previous': _force_https(self.get_previous_link())
             },
-            'count': len(data), 
-            'page_size': self.get_page_size(self.request), 
-            'total_pages': self.page.paginator.num_pages,  
-            'current_page': self.page.number,  
+            'count': self.page.paginator.count,
+            'page_size': self.get_page_size(self.request),
+            'total_pages': self.page.paginator.num_pages,
+            'current_page': self.page.number,
             'results': data
-        })
\ No newline at end of file
+        })
+
+
+class CustomPageNumberPagination(_PageNumberPagination):
+    page_size = 16
+
+
+class FIVEPageNumberPagination(_PageNumberPagination):
+    page_size = 5
+
+
+class RolePageNumberPagination(_PageNumberPagination):
+    page_size = 8
+
+
+class TeNPageNumberPagination(_PageNumberPagination):
+    page_size = 10
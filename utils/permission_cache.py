@@ -0,0 +1,66 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from user.models import CustomPermissionClass
+
+
+# -----------------------------
+# Effective permission names per user
+# Cached under a global role version; any change to roles, their
+# permissions or their members bumps the version (see user.signals),
+# so every user's set is reloaded on next use.
+# -----------------------------
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+ROLE_VERSION_KEY = "role_permissions_version"
+
+
+def get_role_version():
+    version = cache.get(ROLE_VERSION_KEY)
+    if version is None:
+        cache.add(ROLE_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(ROLE_VERSION_KEY)
+    return version
+
+
+def bump_role_version():
+    try:
+        cache.incr(ROLE_VERSION_KEY)
+    except ValueError:
+        cache.set(ROLE_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_permissions():
+    transaction.on_commit(bump_role_version)
+
+
+def _load_permissions(user_id):
+    return frozenset(
+        CustomPermissionClass.objects
+        .filter(role__user__id=user_id, role__is_active=True, name__isnull=False)
+        .values_list("name", flat=True)
+    )
+
+
+def get_user_permissions(user):
+    """Permission names granted to ``user`` through active roles."""
+    key = f"user_permissions:{user.pk}:{get_role_version()}"
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = _load_permissions(user.pk)
+        cache.set(key, permissions, PERMISSION_CACHE_TIMEOUT)
+    return permissions
+
+
+def get_request_permissions(request):
+    """
+    get_user_permissions for the request's user, memoised on the
+    underlying HttpRequest so repeated checks in one request are free.
+    """
+    http_request = getattr(request, "_request", request)
+    permissions = getattr(http_request, "_permission_names", None)
+    if permissions is None:
+        permissions = get_user_permissions(request.user)
+        http_request._permission_names = permissions
+    return permissions
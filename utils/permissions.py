@@ -20,7 +20,8 @@ class IsAdminUserType(BasePermission):
 from rest_framework.exceptions import PermissionDenied
 from django.contrib.auth.models import AnonymousUser
 import user
-from user.models import CustomPermissionClass, UserProfile
+from user.models import UserProfile
+from utils.permission_cache import get_request_permissions
 from rest_framework.permissions import BasePermission
 
 class IsSuperAdmin(BasePermission):
@@ -32,13 +33,9 @@ class IsSuperAdmin(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        try:
-            # Get the related UserProfile
-            profile = UserProfile.objects.get(user=request.user)
-            # Check if user_type is 'superadmin'
-            return profile.user_type == 'superadmin'
-        except UserProfile.DoesNotExist:
-            return False
+        # UserProfile comes preloaded with the user (user.authentication)
+        profile = getattr(request.user, 'userprofile', None)
+        return bool(profile and profile.user_type == 'superadmin')
 
 def is_swagger_request(request):
     """
@@ -60,62 +57,34 @@ def permission_checking(request, permission_name):
     Returns True if the user has it, otherwise False.
     """
     try:
-        print("Checking if request is from Swagger UI...")
         # Allow Swagger without permission check
         if is_swagger_request(request):
-            print("Request is from Swagger UI. Permission granted.")
             return True
 
-        print("Getting user from request...")
         user = request.user
-        print(f"User: {user}")
         if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
-            print("User is not authenticated or is anonymous.")
             raise PermissionDenied("Authentication credentials were not provided or invalid.")
 
         try:
-            user_profile = UserProfile.objects.get(user=user)
-            print(f"user is {user_profile.user_type}")
+            user_profile = user.userprofile
         except UserProfile.DoesNotExist:
-            print("User profile does not exist.")
-            
             raise PermissionCheckingError("User profile does not exist.")
 
-        print("Checking if user is super admin...")
-        if user_profile.user_type == "superadmin":
-            print("User is super admin. Permission granted.")
-            return True
-        
-        if user_profile.user_type == "user":
-            print("User is user. Permission granted.")
+        if user_profile.user_type in ("superadmin", "user"):
             return True
 
-        print("Checking if user profile has a role...")
-        roles = user.roles.all()
-        if not roles:
-            print("User profile has no associated role.")
-            raise PermissionCheckingError("User profile has no associated role.")
+        permissions = get_request_permissions(request)
+        if permission_name in permissions:
+            return True
 
-        roles = user.roles.all()
-        if not roles.exists():
-            print("User profile has no associated role.")
+        if not permissions and not user.roles.exists():
             raise PermissionCheckingError("User profile has no associated role.")
 
-        role_ids = roles.values_list('id', flat=True)
-        permissions = CustomPermissionClass.objects.filter(role_id__in=role_ids, name=permission_name)
-
-        has_permission = permissions.exists()
-        print(f"User has permission '{permission_name}': {has_permission}")
-
-        return has_permission
-
+        return False
 
     except PermissionDenied:
-        print("PermissionDenied exception raised.")
         raise
     except PermissionCheckingError as e:
-        print(f"PermissionCheckingError: {str(e)}")
         raise PermissionCheckingError(f"Permission checking failed: {str(e)}")
     except Exception as e:
-        print(f"Unexpected error during permission check: {str(e)}")
         raise PermissionCheckingError(f"Unexpected error during permission check: {str(e)}")
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.transactions import defer_on_commit
+
+
+# -----------------------------
+# Reference data cache
+# Small, rarely edited tables (geography, the instruction template) are
+# kept in two tiers: an LRU in each worker process and the shared Redis
+# cache behind it. Entries belong to a group whose version lives in the
+# shared cache; a change to the group's models (see the app signals)
+# bumps the version on commit and announces the group on a Redis pub/sub
+# channel, and every worker's listener drops its local copies at once.
+# If the listener is down, a worker still notices the new version within
+# LOCAL_CHECK_INTERVAL seconds.
+#
+# Values are shared between requests in a process: treat them as
+# read-only.
+# -----------------------------
+REFERENCE_CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_MAX_ENTRIES = 256
+LOCAL_CHECK_INTERVAL = 30
+INVALIDATION_CHANNEL = "reference_data_invalidated"
+RECONNECT_DELAY = 5
+
+
+def _version_key(group):
+    return f"reference_version:{group}"
+
+
+def _shared_version(group):
+    version = cache.get(_version_key(group))
+    if version is None:
+        cache.add(_version_key(group), time.time_ns(), None)
+        version = cache.get(_version_key(group))
+    return version
+
+
+def _bump_version(group):
+    try:
+        cache.incr(_version_key(group))
+    except ValueError:
+        cache.set(_version_key(group), time.time_ns(), None)
+
+
+class ReferenceCache:
+
+    def __init__(self, max_entries=LOCAL_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # group -> (version, checked_at)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._listener_pid = None
+
+    def get(self, group, key, loader):
+        """
+        The value cached for ``key`` in ``group``, from this process,
+        else from the shared cache, else from ``loader()``.
+        """
+        self._ensure_listener()
+        version = self._version(group)
+
+        with self._lock:
+            entry = self._entries.get((group, key))
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end((group, key))
+                return entry[1]
+
+        shared_key = f"reference:{group}:{version}:{key}"
+        value = cache.get(shared_key)
+        if value is None:
+            value = loader()
+            cache.set(shared_key, value, REFERENCE_CACHE_TIMEOUT)
+
+        with self._lock:
+            self._entries[(group, key)] = (version, value)
+            self._entries.move_to_end((group, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _version(self, group):
+        known = self._versions.get(group)
+        if known is not None and time.monotonic() - known[1] < LOCAL_CHECK_INTERVAL:
+            return known[0]
+        version = _shared_version(group)
+        self._versions[group] = (version, time.monotonic())
+        return version
+
+    def drop(self, group=None):
+        """Forgets this process's copies of ``group`` (or of everything)."""
+        with self._lock:
+            if group is None:
+                self._versions.clear()
+                self._entries.clear()
+                return
+            self._versions.pop(group, None)
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == group]:
+                del self._entries[entry_key]
+
+    # ---- cross-process invalidation ----
+    def _ensure_listener(self):
+        # One listener per process, started after gunicorn forks
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, name="reference-cache-listener", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything announced while we weren't subscribed was missed
+                self.drop()
+                for message in pubsub.listen():
+                    data = message["data"]
+                    self.drop(data.decode() if isinstance(data, bytes) else data)
+            except NotImplementedError:
+                # Cache backend isn't Redis: rely on the version checks
+                return
+            except Exception:
+                time.sleep(RECONNECT_DELAY)
+
+
+reference_data = ReferenceCache()
+
+
+def get_reference(group, key, loader):
+    return reference_data.get(group, key, loader)
+
+
+def _publish(group):
+    try:
+        get_redis_connection("default").publish(INVALIDATION_CHANNEL, group)
+    except Exception:
+        # Other workers catch up through the version check
+        pass
+
+
+def _invalidate_groups(groups):
+    for group in groups:
+        _bump_version(group)
+        reference_data.drop(group)
+        _publish(group)
+
+
+def invalidate_reference(group):
+    """Drops ``group`` everywhere once the current transaction commits."""
+    # Collected per transaction, so a cascade delete announces once
+    defer_on_commit("reference_groups", [group], _invalidate_groups)
@@ -0,0 +1,95 @@
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework.filters import SearchFilter
+
+
+# -------------------------
+# Search
+# Substring search stays icontains, which PostgreSQL serves from the
+# GIN trigram indexes on UPPER(column) added in the user, tasks and cms
+# migrations instead of scanning the table. Long text (blog bodies)
+# is matched with full-text search against an indexed tsvector.
+# Matches are ranked by trigram word similarity / ts_rank. Other
+# databases get the plain icontains filter, unranked.
+# -------------------------
+SEARCH_CONFIG = "english"
+# Shorter terms have no trigrams to rank by
+MIN_RANK_LENGTH = 3
+
+
+def is_postgres(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_vector(*fields):
+    # Must stay in step with the tsvector indexes in the migrations
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def _substring_condition(term, fields):
+    # Every word has to appear in one of the fields, like SearchFilter
+    condition = Q()
+    for word in term.split():
+        any_field = Q()
+        for field in fields:
+            any_field |= Q(**{f"{field}__icontains": word})
+        condition &= any_field
+    return condition
+
+
+def search_queryset(queryset, term, fields=(), vector_fields=(), rank=True):
+    """
+    Rows of ``queryset`` where every word of ``term`` is in one of
+    ``fields``, or whose ``vector_fields`` match it as a full-text
+    query. With ``rank`` on PostgreSQL the best matches come first
+    (annotated as ``search_rank``), ahead of the queryset's own ordering.
+    """
+    term = (term or "").strip()
+    if not term or not (fields or vector_fields):
+        return queryset
+
+    if not is_postgres(queryset):
+        return queryset.filter(_substring_condition(term, list(fields) + list(vector_fields)))
+
+    condition = _substring_condition(term, fields) if fields else Q(pk__in=[])
+    ranks = []
+    if vector_fields:
+        query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+        queryset = queryset.alias(search_document=search_vector(*vector_fields))
+        condition |= Q(search_document=query)
+        ranks.append(SearchRank(F("search_document"), query))
+    queryset = queryset.filter(condition)
+
+    if not rank:
+        return queryset
+    if len(term) >= MIN_RANK_LENGTH:
+        ranks += [TrigramWordSimilarity(term, field) for field in fields]
+    if not ranks:
+        return queryset
+
+    score = ranks[0] if len(ranks) == 1 else Greatest(*ranks)
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return (
+        queryset
+        .annotate(search_rank=Coalesce(score, Value(0.0), output_field=FloatField()))
+        .order_by(F("search_rank").desc(), *ordering)
+    )
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    SearchFilter on top of search_queryset: the view's search_fields are
+    substring-matched (index-backed on PostgreSQL) and its optional
+    search_vector_fields full-text matched, best matches first. An
+    explicit ?ordering from OrderingFilter still wins.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        fields = self.get_search_fields(view, request) or ()
+        vector_fields = getattr(view, "search_vector_fields", ())
+        term = " ".join(self.get_search_terms(request))
+        return search_queryset(queryset, term, fields, vector_fields)
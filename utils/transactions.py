@@ -0,0 +1,29 @@
+from django.db import transaction
+
+
+# -----------------------------
+# Deferred on-commit work
+# Signal handlers collect ids into a named set on the current
+# connection; the set is handed to its callback once, when the
+# transaction commits, however many rows were touched (a cascade
+# delete schedules one refresh per id, not one per row). Outside a
+# transaction the callback runs at once, as with on_commit.
+# -----------------------------
+
+def defer_on_commit(bucket, items, callback):
+    """
+    Adds ``items`` (falsy ones skipped) to the set named ``bucket`` and
+    has ``callback(items)`` called with the whole set on commit.
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_deferred_on_commit", None)
+    if pending is None:
+        pending = connection._deferred_on_commit = {}
+    pending.setdefault(bucket, set()).update(item for item in items if item)
+
+    def drain():
+        # The first callback takes the whole set; later ones find it gone
+        collected = pending.pop(bucket, None)
+        if collected:
+            callback(collected)
+    transaction.on_commit(drain)